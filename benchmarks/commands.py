@@ -0,0 +1,263 @@
+#!/usr/bin/python3
+"""End-to-end benchmark of the cli commands against benchmarks/stub.py.
+
+Every command runs in a fresh interpreter, with empty cache and data
+directories, against a stub board of each size. Wall time, number of
+requests and peak memory are reported, and compared with the last saved
+run of the same settings; a regression makes the script fail.
+
+Usage:
+    python benchmarks/commands.py [--sizes 10,1000] [--only "task list"] [--save]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from urllib.request import urlopen
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+RESULTS = os.path.join(BENCHMARKS, "results.jsonl")
+
+SIZES = (10, 1000, 10000, 100000)
+
+# name, arguments, answers to the prompts
+SCENARIOS: List[Tuple[str, List[str], str]] = [
+    ("project list", ["project", "list"], ""),
+    ("project view", ["project", "view", "board"], ""),
+    ("project create", ["project", "create", "bench project"], ""),
+    ("project update", ["project", "update", "board"], "\n\n"),
+    ("task list", ["task", "list", "--all", "board"], ""),
+    ("task list ndjson", ["task", "list", "--all", "--format", "ndjson", "board"], ""),
+    ("task create", ["task", "create", "bench task", "board"], "0\n"),
+    ("task update", ["task", "update", "task 000000", "board"], "renamed\n\n"),
+    ("task move", ["task", "move", "task 000000", "done", "board"], ""),
+    ("sync", ["sync"], ""),
+    ("search", ["search", "task 000001"], ""),
+]
+
+# slower runs within this many seconds are noise, not regressions
+NOISE = 0.05
+
+# seconds before a command is killed, e.g. when it waits for a prompt
+TIMEOUT = 300
+
+
+class StubProcess:
+    """benchmarks/stub.py in its own process
+
+    Linux keeps the peak memory of a process across exec: commands forked
+    from a harness holding a 100k tasks board would all report its size.
+    """
+
+    def __init__(self, tasks: int, args):
+        self.process = subprocess.Popen(
+            [
+                sys.executable,
+                os.path.join(BENCHMARKS, "stub.py"),
+                "--port", "0",
+                "--tasks", str(tasks),
+                "--payload", str(args.payload),
+                "--latency", str(args.latency),
+            ],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        # export MEISTERTASK_API_URL=http://127.0.0.1:<port>/api
+        self.url: str = self.process.stdout.readline().strip().partition("=")[2]
+
+    @property
+    def requests(self) -> int:
+        with urlopen(f"{self.url}/_requests") as response:
+            return json.load(response)["requests"]
+
+    def __enter__(self) -> "StubProcess":
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.wait()
+        self.process.stdout.close()
+
+
+def run_command(stub: StubProcess, argv: List[str], answers: str, home: str, rate: float) -> Dict:
+    """Run the cli once, return its wall time, requests and peak memory"""
+    env = {
+        **os.environ,
+        "MEISTERTASK": "benchmark",
+        "MEISTERTASK_API_URL": stub.url,
+        "MEISTERTASK_NO_DAEMON": "1",
+        "MEISTERTASK_RATE_LIMIT": str(rate),
+        "XDG_CACHE_HOME": os.path.join(home, "cache"),
+        "XDG_DATA_HOME": os.path.join(home, "data"),
+        "XDG_RUNTIME_DIR": home,
+    }
+    requests_before: int = stub.requests
+
+    with tempfile.TemporaryFile() as errors:
+        start: float = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "src", *argv],
+            cwd=ROOT,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=errors,
+        )
+        process.stdin.write(answers.encode())
+        process.stdin.close()
+
+        timer = threading.Timer(TIMEOUT, process.kill)
+        timer.start()
+        # wait4 reports the peak memory of this child only
+        _, status, usage = os.wait4(process.pid, 0)
+        wall: float = time.perf_counter() - start
+        timer.cancel()
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+        errors.seek(0)
+        error: str = errors.read().decode(errors="replace")
+
+    return {
+        "wall": wall,
+        "requests": stub.requests - requests_before,
+        "rss_mb": usage.ru_maxrss / 1024,
+        "exit_code": process.returncode,
+        "error": error[-500:],
+    }
+
+
+def measure(size: int, argv: List[str], answers: str, args) -> Dict:
+    """Median of `repeat` runs, each on a new board and an empty cache"""
+    runs: List[Dict] = []
+    for _ in range(args.repeat):
+        with StubProcess(size, args) as stub, tempfile.TemporaryDirectory() as home:
+            if args.warm:
+                run_command(stub, argv, answers, home, args.rate)
+            runs.append(run_command(stub, argv, answers, home, args.rate))
+
+    failed: List[Dict] = [r for r in runs if r["exit_code"] != 0]
+    if failed:
+        return {"failed": failed[0]["error"]}
+    return {
+        "wall": round(statistics.median(r["wall"] for r in runs), 4),
+        "requests": runs[0]["requests"],
+        "rss_mb": round(statistics.median(r["rss_mb"] for r in runs), 1),
+    }
+
+
+def settings(args) -> Dict:
+    """Parameters a saved run must share to be compared with this one"""
+    return {
+        "latency": args.latency,
+        "payload": args.payload,
+        "rate": args.rate,
+        "warm": args.warm,
+    }
+
+
+def previous_results(args) -> Dict[str, Dict]:
+    try:
+        with open(RESULTS) as f:
+            runs: List[Dict] = [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return {}
+
+    for run in reversed(runs):
+        if run["settings"] == settings(args):
+            return run["results"]
+    return {}
+
+
+def regression(current: Dict, previous: Optional[Dict], threshold: float) -> str:
+    if "failed" in current:
+        return "failed"
+    if not previous or "failed" in previous:
+        return ""
+
+    problems: List[str] = []
+    if current["requests"] > previous["requests"]:
+        problems.append(f"requests {previous['requests']} -> {current['requests']}")
+    slower: float = current["wall"] - previous["wall"]
+    if slower > NOISE and current["wall"] > previous["wall"] * (1 + threshold):
+        problems.append(f"wall {previous['wall']:.3f}s -> {current['wall']:.3f}s")
+    if current["rss_mb"] > previous["rss_mb"] * (1 + threshold):
+        problems.append(f"memory {previous['rss_mb']}MB -> {current['rss_mb']}MB")
+    return ", ".join(problems)
+
+
+def git_revision() -> str:
+    result = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+    )
+    return result.stdout.strip() or "unknown"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", default=",".join(map(str, SIZES)), help="tasks of the board, comma separated"
+    )
+    parser.add_argument("--only", help="run the scenarios whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub seconds per response")
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=1000.0,
+        help="client requests per second (the API allows 20, the default measures the client)",
+    )
+    parser.add_argument("--payload", type=int, default=64, help="bytes of notes per task")
+    parser.add_argument("--warm", action="store_true", help="measure a second run, cache filled")
+    parser.add_argument("--threshold", type=float, default=0.25, help="tolerated slow down")
+    parser.add_argument("--save", action="store_true", help=f"append the results to {RESULTS}")
+    args = parser.parse_args()
+
+    sizes: List[int] = [int(size) for size in args.sizes.split(",")]
+    scenarios = [s for s in SCENARIOS if not args.only or args.only in s[0]]
+    previous: Dict[str, Dict] = previous_results(args)
+    results: Dict[str, Dict] = {}
+    failed: bool = False
+
+    print(f"{'scenario':18} {'tasks':>7} {'wall':>9} {'requests':>9} {'memory':>9}")
+    for size in sizes:
+        for name, argv, answers in scenarios:
+            key: str = f"{name}@{size}"
+            result: Dict = measure(size, argv, answers, args)
+            results[key] = result
+
+            problem: str = regression(result, previous.get(key), args.threshold)
+            failed = failed or bool(problem)
+            if "failed" in result:
+                print(f"{name:18} {size:7} {'FAILED':>9}\n{result['failed']}")
+                continue
+            print(
+                f"{name:18} {size:7} {result['wall']:8.3f}s {result['requests']:9}"
+                f" {result['rss_mb']:7.1f}MB  {problem}"
+            )
+
+    if args.save:
+        run = {
+            "revision": git_revision(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "settings": settings(args),
+            "results": results,
+        }
+        with open(RESULTS, "a") as f:
+            f.write(json.dumps(run) + "\n")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+"""Import-time budget of the meistertask entry point.
+
+Each scenario runs in a fresh interpreter with `python -X importtime`.
+Imports already done by a bare interpreter are ignored. The scenario fails
+when the remaining imports take longer than the budget or pull in a module
+reserved for commands that talk to the API.
+
+Usage:
+    python benchmarks/importtime.py [--budget-ms 30]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules that must not be imported before a command runs
+FORBIDDEN = ("requests", "urllib3", "asyncio", "sqlite3")
+
+SCENARIOS: List[Tuple[str, List[str]]] = [
+    ("import", []),
+    ("usage", ["meistertask"]),
+    ("help", ["meistertask", "--help"]),
+    ("project help", ["meistertask", "project", "--help"]),
+    ("task help", ["meistertask", "task", "--help"]),
+    ("complete", ["meistertask", "__complete", "task", "move", "name", ""]),
+]
+
+
+def importtime(code: str) -> Dict[str, int]:
+    """Self import time (us) of every module imported by running code"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        env={**os.environ, "MEISTERTASK": "budget"},
+    )
+
+    modules: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_time, _, name = line[len("import time:"):].split("|")
+        if self_time.strip().isdigit():
+            modules[name.strip()] = int(self_time)
+    return modules
+
+
+def scenario_code(argv: List[str]) -> str:
+    if not argv:
+        return "import src.__main__"
+    return (
+        f"import sys; sys.argv = {argv!r}\n"
+        "import src.__main__\n"
+        "try:\n"
+        "    src.__main__.main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=30.0, help="budget per scenario")
+    args = parser.parse_args()
+
+    baseline: Dict[str, int] = importtime("pass")
+    failed: bool = False
+
+    for name, argv in SCENARIOS:
+        modules = importtime(scenario_code(argv))
+        extra = {module: t for module, t in modules.items() if module not in baseline}
+        total_ms: float = sum(extra.values()) / 1000
+        forbidden = sorted(m for m in extra if m.split(".")[0] in FORBIDDEN)
+
+        ok: bool = total_ms <= args.budget_ms and not forbidden
+        failed = failed or not ok
+        status = "ok" if ok else "FAIL"
+        print(f"{status:4} {name:14} {total_ms:7.1f} ms  {len(extra):3} modules")
+        if forbidden:
+            print(f"     imports {', '.join(forbidden)}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
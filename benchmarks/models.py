@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""Memory and field access of tasks held as dicts and as src.models.Task.
+
+Tasks are decoded from json, the way pages of the API are, with the fields
+of a real API task (the stub serves the ones the cli uses only).
+
+Usage:
+    python benchmarks/models.py [--tasks 100000]
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import Task  # noqa: E402
+
+SECTIONS = ("Open", "In Progress", "Done")
+
+
+def api_task(n: int) -> Dict:
+    """A task with the fields returned by the API"""
+    return {
+        "id": 100000 + n,
+        "token": f"{n:08x}token",
+        "name": f"task {n:06d}",
+        "notes": "lorem ipsum " * 5,
+        "status": 1,
+        "status_updated_at": "2020-01-01T00:00:00.000Z",
+        "section_id": 1000 + n % 3,
+        "section_name": SECTIONS[n % 3],
+        "project_id": 1,
+        "sequence": float(n),
+        "assigned_to_id": None,
+        "tracked_time": 0,
+        "due": None,
+        "created_at": "2020-01-01T00:00:00.000Z",
+        "updated_at": "2020-01-01T00:00:00.000Z",
+    }
+
+
+def measure(build: Callable[[], List]) -> float:
+    """Bytes held by the result of build(), per item"""
+    gc.collect()
+    tracemalloc.start()
+    items: List = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / len(items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100000)
+    args = parser.parse_args()
+
+    # pages of 100 tasks, decoded one at a time
+    pages: List[str] = [
+        json.dumps([api_task(n) for n in range(start, min(start + 100, args.tasks))])
+        for start in range(0, args.tasks, 100)
+    ]
+
+    as_dicts = lambda: [task for page in pages for task in json.loads(page)]
+    as_models = lambda: [Task(task) for page in pages for task in json.loads(page)]
+    dict_size: float = measure(as_dicts)
+    model_size: float = measure(as_models)
+
+    dicts: List[Dict] = as_dicts()
+    models: List[Task] = as_models()
+    number: int = 10
+    dict_time: float = timeit.timeit(lambda: [t["section_name"] for t in dicts], number=number)
+    model_time: float = timeit.timeit(lambda: [t.section_name for t in models], number=number)
+    item_time: float = timeit.timeit(lambda: [t["section_name"] for t in models], number=number)
+
+    per_access = lambda seconds: seconds / number / args.tasks * 1e9
+    print(f"{args.tasks} tasks")
+    print(f"memory   dict {dict_size:7.0f} B/task   model {model_size:7.0f} B/task"
+          f"   {dict_size / model_size:.1f}x smaller")
+    print(f"access   dict {per_access(dict_time):7.1f} ns      model {per_access(model_time):7.1f} ns"
+          f"      model[key] {per_access(item_time):.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
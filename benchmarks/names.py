@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""Index build and lookup time of src.names.NameIndex on generated task names.
+
+Names are a few words drawn from a vocabulary where some words (fix, the,
+login ...) are frequent and most are rare, like real task names.
+
+Usage:
+    python benchmarks/names.py [--names 50000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.names import NameIndex  # noqa: E402
+
+COMMON = ("fix", "the", "add", "update", "login", "page", "api", "bug", "test", "docs")
+
+QUERIES = (
+    "fix login page redirect",  # exact
+    "fix login",  # frequent words
+    "the",  # a word of many names
+    "login redirect",  # words in any order
+    "redir",  # word prefix
+    "fix login page redirct",  # typo
+    "zzzz",  # nothing
+)
+
+
+def generate(count: int) -> List[Dict]:
+    random.seed(count)
+    rare: List[str] = [f"{random.choice('bcdfgklmprst')}{word:x}ing" for word in range(count // 10)]
+    items: List[Dict] = [
+        {
+            "id": n,
+            "name": " ".join(
+                random.choice(COMMON) if random.random() < 0.3 else random.choice(rare)
+                for _ in range(random.randint(2, 6))
+            ),
+        }
+        for n in range(count)
+    ]
+    items[count // 2]["name"] = "Fix login page redirect"
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--names", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    items: List[Dict] = generate(args.names)
+    start: float = time.perf_counter()
+    index: NameIndex = NameIndex(items)
+    print(f"{args.names} names, index built in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for query in QUERIES:
+        # the first lookup of a typo builds the vocabulary, once per index
+        timings: List[float] = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            matched: List[Dict] = index.resolve(query)
+            timings.append((time.perf_counter() - start) * 1000)
+        best: str = matched[0]["name"] if matched else "-"
+        print(f"{query!r:28} {min(timings):6.1f} ms  first {timings[0]:6.1f} ms"
+              f"  {len(matched):2} candidates, best: {best}")
+
+
+if __name__ == "__main__":
+    main()
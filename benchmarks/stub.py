@@ -0,0 +1,325 @@
+#!/usr/bin/python3
+"""Local stand-in for the Meistertask API.
+
+Serves the endpoints used by src/api (projects, sections, tasks) from
+memory, with a configurable latency, payload size and error rate. Point the
+cli at it with MEISTERTASK_API_URL:
+
+    python benchmarks/stub.py --tasks 10000 --latency 0.05
+    MEISTERTASK_API_URL=http://127.0.0.1:8000/api meistertask task list --all "board"
+
+The first project, "board", holds --tasks tasks, the others a few each.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+SECTIONS = ("Open", "In Progress", "Done")
+
+# project status codes of the API
+PROJECT_STATUS = {"active": 1, "deleted": 4, "archived": 5}
+
+# "/projects/12/tasks" -> "/projects/{id}/tasks", the request counter key
+ID_PATTERN = re.compile(r"/\d+")
+
+EPOCH = datetime(2020, 1, 1)
+
+
+def timestamp(n: int) -> str:
+    """Distinct, sortable updated_at of the n-th item"""
+    return (EPOCH + timedelta(seconds=n)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+class Board:
+    """Projects, sections and tasks served by the stub
+
+    Params:
+    tasks(int) number of tasks in the "board" project
+    projects(int) number of projects, the others hold `small` tasks
+    payload(int) size in bytes of the notes of each task
+    """
+
+    def __init__(self, tasks: int = 100, projects: int = 5, payload: int = 64, small: int = 10):
+        self.lock = threading.Lock()
+        self.projects: Dict[int, Dict] = {}
+        self.sections: Dict[int, Dict] = {}
+        self.tasks: Dict[int, Dict] = {}
+        self.tasks_by_project: Dict[int, List[Dict]] = {}
+        self.clock: int = 0
+        # listings of the current clock, a walk over 100k tasks sorts them once
+        self.listings: Dict[Tuple, List[Dict]] = {}
+        self.notes: str = ("lorem ipsum " * (payload // 12 + 1))[:payload]
+
+        for p in range(projects):
+            project = self.add_project("board" if p == 0 else f"project {p:03d}")
+            for name in SECTIONS:
+                self.add_section(project["id"], name)
+
+            sections = [s for s in self.sections.values() if s["project_id"] == project["id"]]
+            for t in range(tasks if p == 0 else small):
+                self.add_task(sections[t % len(sections)]["id"], f"task {t:06d}", self.notes)
+
+    def tick(self) -> str:
+        self.clock += 1
+        self.listings.clear()
+        return timestamp(self.clock)
+
+    def listing(self, key: Tuple, items, sort: str = None) -> List[Dict]:
+        """Items of an endpoint, sorted, computed once until the next change"""
+        if (key, sort) not in self.listings:
+            items = list(items)
+            if sort:
+                field: str = sort.lstrip("-")
+                items.sort(key=lambda item: item.get(field) or "", reverse=sort[0] == "-")
+            self.listings[(key, sort)] = items
+        return self.listings[(key, sort)]
+
+    def add_project(self, name: str, notes: str = "") -> Dict:
+        now: str = self.tick()
+        project = {
+            "id": len(self.projects) + 1,
+            "name": name,
+            "notes": notes,
+            "status": PROJECT_STATUS["active"],
+            "created_at": now,
+            "updated_at": now,
+        }
+        self.projects[project["id"]] = project
+        self.tasks_by_project[project["id"]] = []
+        return project
+
+    def add_section(self, project_id: int, name: str, sequence: float = None) -> Dict:
+        section = {
+            "id": 1000 + len(self.sections),
+            "name": name,
+            "project_id": project_id,
+            "sequence": len(self.sections) if sequence is None else float(sequence),
+        }
+        self.sections[section["id"]] = section
+        return section
+
+    def add_task(self, section_id: int, name: str, notes: str = "") -> Dict:
+        section: Dict = self.sections[section_id]
+        now: str = self.tick()
+        task = {
+            "id": 100000 + len(self.tasks),
+            "name": name,
+            "notes": notes,
+            "section_id": section_id,
+            "section_name": section["name"],
+            "project_id": section["project_id"],
+            "status": 1,
+            "created_at": now,
+            "updated_at": now,
+        }
+        self.tasks[task["id"]] = task
+        self.tasks_by_project[task["project_id"]].append(task)
+        return task
+
+    def update(self, item: Dict, data: Dict) -> Dict:
+        for key, value in data.items():
+            if key == "section_id":
+                section: Dict = self.sections[int(value)]
+                item["section_id"] = section["id"]
+                item["section_name"] = section["name"]
+            elif key == "status":
+                item["status"] = int(value)
+            else:
+                item[key] = value
+        item["updated_at"] = self.tick()
+        return item
+
+
+class Stub(ThreadingHTTPServer):
+    """HTTP server of a board
+
+    Params:
+    board: data served
+    latency(float) seconds added to every response
+    error_rate(float) share of requests answered with a 500 or a 429
+    seed(int) seed of the errors, runs with the same seed fail the same requests
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        board: Board,
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        super().__init__(("127.0.0.1", port), Handler)
+        self.board = board
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.counter: Counter = Counter()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/api"
+
+    @property
+    def requests(self) -> int:
+        return sum(self.counter.values())
+
+    def handle_error(self, request, client_address):
+        # a client stopping halfway through a listing closes its connection
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def start(self) -> "Stub":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are written apart, Nagle would hold the body back 40ms
+    disable_nagle_algorithm = True
+    server: Stub
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PUT(self):
+        self.dispatch("PUT")
+
+    def dispatch(self, method: str):
+        url = urlsplit(self.path)
+        path: str = url.path[len("/api"):] if url.path.startswith("/api") else url.path
+        if path == "/_requests":
+            # read by benchmarks/commands.py, not counted
+            return self.send(200, {"requests": self.server.requests})
+        query: Dict = dict(parse_qsl(url.query))
+        length = int(self.headers.get("Content-Length") or 0)
+        data: Dict = dict(parse_qsl(self.rfile.read(length).decode())) if length else {}
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        with self.server.board.lock:
+            self.server.counter[(method, ID_PATTERN.sub("/{id}", path))] += 1
+            failure: float = self.server.random.random()
+        if failure < self.server.error_rate / 2:
+            return self.send(429, {"errors": [{"message": "slow down"}]}, {"Retry-After": "0"})
+        if failure < self.server.error_rate:
+            return self.send(500, {"errors": [{"message": "stub failure"}]})
+
+        with self.server.board.lock:
+            status, body = route(self.server.board, method, path, query, data)
+        self.send(status, body)
+
+    def send(self, status: int, body, headers: Dict = None):
+        payload: bytes = json.dumps(body).encode()
+        etag: str = f'"{hashlib.md5(payload).hexdigest()}"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            status, payload = 304, b""
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        if status in (200, 304):
+            self.send_header("ETag", etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def page(board: Board, key: Tuple, items, query: Dict) -> List[Dict]:
+    items = board.listing(key, items, query.get("sort"))
+    if "items" in query:
+        size, number = int(query["items"]), int(query.get("page", 1))
+        items = items[(number - 1) * size : number * size]
+    return items
+
+
+def route(board: Board, method: str, path: str, query: Dict, data: Dict) -> Tuple[int, object]:
+    parts: List[str] = path.strip("/").split("/")
+    not_found = (404, {"errors": [{"message": "not found"}]})
+
+    if parts == ["projects"]:
+        if method == "POST":
+            return 200, board.add_project(data["name"], data.get("notes", ""))
+        status = query.get("status", "active")
+        projects = (
+            p for p in board.projects.values()
+            if status == "all" or p["status"] == PROJECT_STATUS.get(status)
+        )
+        return 200, page(board, ("projects", status), projects, query)
+
+    if len(parts) < 2 or not parts[1].isdigit():
+        return not_found
+    id = int(parts[1])
+
+    if parts[0] == "projects" and id in board.projects:
+        if len(parts) == 2:
+            if method == "PUT":
+                return 200, board.update(board.projects[id], data)
+            return 200, board.projects[id]
+        if parts[2] == "sections":
+            if method == "POST":
+                return 200, board.add_section(id, data["name"], data.get("sequence"))
+            sections = [s for s in board.sections.values() if s["project_id"] == id]
+            return 200, sorted(sections, key=lambda s: s["sequence"])
+        if parts[2] == "tasks":
+            return 200, page(board, ("project", id), board.tasks_by_project[id], query)
+
+    if parts[0] == "sections" and id in board.sections and parts[2:] == ["tasks"]:
+        if method == "POST":
+            return 200, board.add_task(id, data["name"], data.get("notes", ""))
+        tasks = (
+            t for t in board.tasks_by_project[board.sections[id]["project_id"]]
+            if t["section_id"] == id
+        )
+        return 200, page(board, ("section", id), tasks, query)
+
+    if parts[0] == "tasks" and id in board.tasks and len(parts) == 2:
+        if method == "PUT":
+            return 200, board.update(board.tasks[id], data)
+        return 200, board.tasks[id]
+
+    return not_found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8000, help="0 picks a free port")
+    parser.add_argument("--tasks", type=int, default=1000, help="tasks of the board project")
+    parser.add_argument("--projects", type=int, default=5)
+    parser.add_argument("--payload", type=int, default=64, help="bytes of notes per task")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of failed requests")
+    args = parser.parse_args()
+
+    board = Board(args.tasks, args.projects, args.payload)
+    stub = Stub(board, args.port, args.latency, args.error_rate)
+    print(f"export MEISTERTASK_API_URL={stub.url}", flush=True)
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
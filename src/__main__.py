@@ -1,52 +1,243 @@
-from .meistertask import Meistertask
-from typing import List, Dict, Set  
+import os
+import sys
+from typing import Dict, Iterator
 
-from typing import Dict, List
-from .parser import Parser
-from .api import *
-
-from .utils import CYAN, END
+from .usage import ROOT_USAGE
+from .utils import CYAN, SUCCESS, RED, END
 from .utils import (
     display_project,
     display_task,
-    filter_sections_by_name,
     get_auth_key,
-    filter_tasks_by_section,
-    filter_sections_by_name,
 )
 
+# Startup matters: the cli is called from git hooks and editors many times a day.
+# Only light modules are imported here, the HTTP stack (requests) is loaded
+# once a command actually talks to the API.
+
+
 def main():
-    token: str = get_auth_key()
-    meistertask: Meistertask = Meistertask(token)
+    if not sys.argv[1:]:
+        print(ROOT_USAGE)
+        exit(1)
+
+    # hidden commands of the shell completion, kept off the argument parser
+    if sys.argv[1] == "__complete":
+        from .completion import complete
+
+        exit(complete(sys.argv[2:]))
+
+    if sys.argv[1] == "__refresh-names":
+        from .completion import refresh
+
+        exit(refresh(get_auth_key()))
+
+    from .parser import Parser
 
     parser: Parser = Parser()
     args = parser.parse_args()
 
+    if args.command == "completion":
+        from .completion import SCRIPTS
+
+        print(SCRIPTS[args.shell].strip())
+        exit(0)
+
+    token: str = get_auth_key()
+
+    if args.command == "daemon":
+        from .daemon import daemon
+
+        exit(daemon(token, stop=args.stop))
+
+    try:
+        # hand the command over to a running daemon, falling back to this process
+        if forwardable(args):
+            from .daemon import forward
+
+            exit_code = forward(token, args)
+            if exit_code is not None:
+                exit(exit_code)
+
+        if args.stats or args.trace:
+            traced(args, token)
+        else:
+            run(args, token)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # the reader of the output is gone (`| head -1`): stop without a traceback
+        output_closed()
+
+
+def output_closed():
+    """Exit once stdout is closed, the flush at exit would fail again"""
+    devnull: int = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    exit(1)
+
+
+def traced(args, token: str):
+    """Run a command, reporting where its time went (--stats, --trace)"""
+    from . import tracing
+
+    tracer = tracing.enable()
+    command: str = " ".join(filter(None, [args.command, getattr(args, "option", None)]))
+    try:
+        with tracer.span(command, "command"):
+            run(args, token)
+    finally:
+        if args.stats:
+            tracer.report()
+        if args.trace:
+            tracer.write_trace(args.trace)
+            print(f"{CYAN}Trace written to {args.trace}{END}", file=sys.stderr)
+
+
+def forwardable(args) -> bool:
+    """Whether a daemon may run the command: no cache bypass, no long import"""
+    if os.environ.get("MEISTERTASK_NO_DAEMON"):
+        return False
+    if not args.cache or args.refresh:
+        return False
+    if args.stats or args.trace:
+        # measure this process, not a round trip to the daemon
+        return False
+    if args.queue or args.command in ("flush", "export", "batch", "board"):
+        return False
+    return getattr(args, "option", None) not in ("i", "import")
+
+
+def refresh_needed(args) -> bool:
+    # the mirror must not be fed stale cached pages
+    return args.refresh or args.command in ("sync", "search", "s")
+
+
+def connect(args, token: str):
+    """Facade running the command: the API, or the local mirror"""
+    if getattr(args, "local", False):
+        # answer from the local mirror, without loading the HTTP stack
+        from .mirror import LocalMeistertask
+
+        return LocalMeistertask(token)
+
+    from .meistertask import Meistertask
+
+    return Meistertask(
+        token,
+        # an export reads everything once, it would only fill the cache
+        cache=args.cache and args.command != "export",
+        refresh=refresh_needed(args),
+        concurrency=getattr(args, "workers", None),
+        queue=args.queue,
+        # a batch runs many commands: keep responses and resolved names at hand
+        memory=args.command == "batch",
+        remember=args.command == "batch",
+    )
+
+
+def run(args, token: str, meistertask=None):
+    """Run a parsed command
+
+    Params:
+    args: parsed arguments
+    token(str) API token
+    meistertask: facade to use, a new one is created by default
+    """
+    from .prompt import prompting_to
+
+    # machine readable output: records only, no banner nor totals
+    machine: bool = getattr(args, "format", "text") != "text"
+
+    if meistertask is None:
+        meistertask = connect(args, token)
+
+    if not machine:
+        return dispatch(args, token, meistertask, machine)
+
+    # keep stdout for the records: questions and choices go to stderr
+    with prompting_to(sys.stderr):
+        dispatch(args, token, meistertask, machine)
+
+
+def dispatch(args, token: str, meistertask, machine: bool):
+    """Run a parsed command with its facade"""
+    from .formats import record_writer
+    from .prompt import ask
+
+    if args.command == "sync":
+        from .mirror import Mirror
+
+        mirror: Mirror = Mirror(token)
+        total_projects, total_tasks = mirror.sync(meistertask, full=args.full)
+
+        from .completion import write_index
+
+        write_index(token, mirror)
+        print(f"[+] {SUCCESS}{total_projects} projects synced, {total_tasks} tasks updated{END}")
+
+    if args.command == "flush":
+        meistertask.flush(force=args.force, discard=args.discard, dry_run=args.dry_run)
+
+    if args.command == "export":
+        meistertask.export(args.directory, restart=args.restart)
+
+    if args.command == "batch":
+        from .batch import run_batch
+
+        exit(
+            run_batch(
+                token,
+                meistertask,
+                args.file,
+                jobs=args.jobs,
+                keep_going=args.keep_going,
+                pick_best=args.pick_best,
+                assume_yes=args.yes,
+            )
+        )
+
+    if args.command == "board":
+        from .board import run_board
+
+        project: Dict = meistertask.project_fetch(args.project)
+        exit(run_board(meistertask, project))
+
+    if args.command in ("search", "s"):
+        from .mirror import Mirror
+
+        mirror: Mirror = Mirror(token)
+        if not args.local:
+            # refresh stale projects (in parallel) before searching
+            mirror.sync(meistertask, max_age=args.max_age)
+
+        results = mirror.index.search(" ".join(args.query), args.limit)
+        with record_writer(args.format, "result", args.fields) as writer:
+            for score, task, project_name in results:
+                writer.write({**task, "project_name": project_name, "score": round(score, 3)})
+        if not machine:
+            print(f'\n{CYAN}Total number of results: {len(results)}{END}')
+
     if args.command.startswith("p"):
-        print(f"{CYAN}Project management{END}")
+        if not machine:
+            print(f"{CYAN}Project management{END}")
 
         if args.option in ("c", "create"):
             meistertask.project_create(args.name, args.description)
 
         if args.option in ("v", "show", "display", "view"):
             project: Dict = meistertask.project_fetch(args.name)
-            display_project(project)
+            with record_writer(args.format, "project", args.fields, single=True) as writer:
+                writer.write(project)
 
         if args.option in ("u", "update", "e", "edit"):
             project: Dict = meistertask.project_fetch(args.name)
 
             display_project(project)
-            new_name = str(input("[?] Type new name (Enter to skip):"))
-            new_description = str(input("[?] Type new description (Enter to skip):"))
-
-            name = new_name if (new_name and len(new_name)) else project["name"]
-            description = (
-                new_description
-                if (new_description and len(new_description))
-                else project["description"]
-            )
+            new_name = ask("[?] Type new name (Enter to skip):")
+            new_description = ask("[?] Type new description (Enter to skip):")
 
-            meistertask.project_update(project['id'], name, description)
+            # only the fields typed are sent: the shown project may come from
+            # the cache, its other fields may have changed on the API since
+            meistertask.project_update(project['id'], new_name, new_description)
 
         if args.option in ("d", "delete", "r", "remove", "rm"):
             project: Dict = meistertask.project_fetch(args.name)
@@ -54,55 +245,72 @@ def main():
             meistertask.project_delete(project["id"])
 
         if args.option in ("l", "ls", "list"):
-            projects: List[Dict] = meistertask.project_fetch_all(args.type)
-            for p in projects:
-                display_project(p)
-            print(f'\n{CYAN}Total number of projects: {len(projects)}{END}')
+            total: int = 0
+            with record_writer(args.format, "project", args.fields) as writer:
+                # json: every field of the API, not only the ones the cli uses
+                for p in meistertask.project_iter_all(args.type, raw=args.format == "json"):
+                    writer.write(p)
+                    total += 1
+            if not machine:
+                print(f'\n{CYAN}Total number of projects: {total}{END}')
 
     if args.command.startswith("t"):
-        print(f"{CYAN}Task management{END}")
+        if not machine:
+            print(f"{CYAN}Task management{END}")
 
         if args.option in ("c", "create"):
             project: Dict = meistertask.project_fetch(args.project)
 
             description: str = args.description if args.description else ""
-            meistertask.task_create(args.name, project["id"], description)
+            meistertask.task_create(args.name, project["id"], description, args.section)
 
         if args.option in ("u", "update", "e", "edit"):
-            project: Dict = meistertask.project_fetch(args.project)
-            task: Dict = meistertask.task_fetch(args.name, project["id"])
+            task: Dict = meistertask.task_resolve(args.name, args.project)
 
             display_task(task)
-            name: str = str(input("[?] Type name (Enter to skip):"))
-            description: str = str(input("[?] Type description (Enter to skip): "))
-
-            new_name = name if (name and len(name)) else task["name"]
-            new_description = (
-                description
-                if (description and len(description))
-                else task["description"]
-            )
+            name: str = ask("[?] Type name (Enter to skip):")
+            description: str = ask("[?] Type description (Enter to skip): ")
 
-            meistertask.task_update(task["id"], new_name, new_description)
+            # only the fields typed are sent, as for projects
+            meistertask.task_update(task, name, description)
 
         if args.option in ("ls", "l", "list"):
             project: Dict = meistertask.project_fetch(args.project)
-            tasks: List[Dict] = meistertask.task_fetch_all(project["id"])
-
-            filtered = filter_tasks_by_section(tasks, args.type)
-            if len(filtered):
-                for t in filtered:
-                    display_task(t)
-                print(f'\n{CYAN}Total number of tasks: {len(filtered)}{END}')
-            else:
+            # filtered by the facade: the mirror reads the section only
+            tasks: Iterator[Dict] = meistertask.task_iter_all(
+                project["id"], args.type, raw=args.format == "json"
+            )
+
+            # display tasks as soon as their page arrives
+            total: int = 0
+            with record_writer(args.format, "task", args.fields) as writer:
+                for t in tasks:
+                    writer.write(t)
+                    total += 1
+
+            if not machine and total:
+                print(f'\n{CYAN}Total number of tasks: {total}{END}')
+            elif not machine:
                 print(f'{CYAN}No task with section {args.type} is found{END}')
 
+        if args.option in ("i", "import"):
+            project: Dict = meistertask.project_fetch(args.project)
+            meistertask.task_import(args.file, project["id"], args.section)
+
         if args.option in ("m", "move", "mv"):
+            if not args.names and not (args.from_section or args.older_than):
+                print(f"{RED}Give task names, or --from-section / --older-than{END}")
+                exit(1)
+
             project: Dict = meistertask.project_fetch(args.project)
-            task: Dict = meistertask.task_fetch(args.name, project["id"])
-            sections: List[Dict] = meistertask.section_fetch_all(project["id"])
-            section: Dict = filter_sections_by_name(sections, args.section)
-            meistertask.task_move(task["id"], section["id"])
+            meistertask.task_move_many(
+                project,
+                args.names,
+                args.section,
+                from_section=args.from_section,
+                older_than=args.older_than,
+                dry_run=args.dry_run,
+            )
 
 
 if __name__ == "__main__":
@@ -1,6 +1,20 @@
+from .base import DEFAULT_CONCURRENCY, Session
+from .cache import Cache
 from .project import APIProject
 from .task import APITask
 from .section import APISection
+from .retry import RateLimiter, RetryPolicy
+from .utils import APIError
 
 
-__all__ = ['APIProject', 'APITask', 'APISection']
\ No newline at end of file
+__all__ = ['Session', 'Cache', 'APIProject', 'APITask', 'APISection',
+           'RateLimiter', 'RetryPolicy', 'APIError', 'DEFAULT_CONCURRENCY']
+
+
+def __getattr__(name):
+    # asyncio is only imported by commands fanning out
+    if name == "AsyncClients":
+        from .aio import AsyncClients
+
+        return AsyncClients
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,138 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List
+
+from .base import API, DEFAULT_CONCURRENCY, PAGE_SIZE
+from .project import APIProject
+from .section import APISection
+from .task import APITask
+
+
+class AsyncAPI:
+    """Async variant of an API client.
+
+    Calls go through the sync client in a worker thread, so they share its
+    session, cache and connection pool. A semaphore bounds how many run at once.
+    """
+
+    def __init__(self, api: API, semaphore: asyncio.Semaphore, executor: ThreadPoolExecutor):
+        self.api = api
+        self.semaphore = semaphore
+        self.executor = executor
+
+    async def _call(self, method: Callable, *args, **kwargs):
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, functools.partial(method, *args, **kwargs)
+            )
+
+
+class AsyncAPIProject(AsyncAPI):
+    async def project_fetch_all(self, filter_keyword="active") -> List[Dict]:
+        return await self._call(self.api.project_fetch_all, filter_keyword)
+
+    async def project_fetch(self, id: int) -> Dict:
+        return await self._call(self.api.project_fetch, id)
+
+    async def project_create(self, name: str, description: str) -> Dict:
+        return await self._call(self.api.project_create, name, description)
+
+    async def project_update(self, id: int, name: str = "", description: str = "") -> Dict:
+        return await self._call(self.api.project_update, id, name, description)
+
+    async def project_delete(self, id: int) -> Dict:
+        return await self._call(self.api.project_delete, id)
+
+    async def project_archive(self, id: int) -> Dict:
+        return await self._call(self.api.project_archive, id)
+
+
+class AsyncAPITask(AsyncAPI):
+    async def task_fetch_all(self, project_id: int) -> List[Dict]:
+        return await self._call(self.api.task_fetch_all, project_id)
+
+    async def task_fetch(self, id: int) -> Dict:
+        return await self._call(self.api.task_fetch, id)
+
+    async def task_fetch_page(self, section_id: int, page: int, page_size: int = PAGE_SIZE) -> List[Dict]:
+        return await self._call(self.api.task_fetch_page, section_id, page, page_size)
+
+    async def task_create(self, section_id: int, name: str, description: str = "") -> Dict:
+        return await self._call(self.api.task_create, section_id, name, description)
+
+    async def task_update(self, id: int, name: str, description: str = "") -> Dict:
+        return await self._call(self.api.task_update, id, name, description)
+
+    async def task_move(self, task_id: int, section_id: int) -> Dict:
+        return await self._call(self.api.task_move, task_id, section_id)
+
+    async def task_edit(self, id: int, fields: Dict) -> Dict:
+        return await self._call(self.api.task_edit, id, fields)
+
+
+class AsyncAPISection(AsyncAPI):
+    async def section_create(self, project_id: int, name: str, sequence: int = None) -> Dict:
+        return await self._call(self.api.section_create, project_id, name, sequence)
+
+    async def section_fetch_all(self, project_id: int) -> List[Dict]:
+        return await self._call(self.api.section_fetch_all, project_id)
+
+
+class AsyncClients:
+    """Async project, task and section clients sharing one concurrency limit.
+
+    Use it as an async context manager inside a running event loop:
+
+        async with AsyncClients(api_project, api_task, api_section) as clients:
+            await asyncio.gather(*(clients.task.task_fetch_all(id) for id in ids))
+    """
+
+    def __init__(
+        self,
+        api_project: APIProject,
+        api_task: APITask,
+        api_section: APISection,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ):
+        self.api_project = api_project
+        self.api_task = api_task
+        self.api_section = api_section
+        self.concurrency = concurrency
+
+    async def __aenter__(self):
+        # created here so the semaphore belongs to the running loop
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency)
+
+        self.project = AsyncAPIProject(self.api_project, self.semaphore, self.executor)
+        self.task = AsyncAPITask(self.api_task, self.semaphore, self.executor)
+        self.section = AsyncAPISection(self.api_section, self.semaphore, self.executor)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.executor.shutdown(wait=True)
+
+    async def call(self, func: Callable, *args, **kwargs):
+        """Run any sync function making API calls within the concurrency limit"""
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, functools.partial(func, *args, **kwargs)
+            )
+
+
+def run(fanout: Callable[[AsyncClients], Awaitable], clients: AsyncClients):
+    """Run an async fan-out from sync code and return its result
+
+    Params:
+    fanout: coroutine function receiving the entered clients
+    clients: clients to enter for the duration of the fan-out
+    """
+
+    async def main():
+        async with clients as entered:
+            return await fanout(entered)
+
+    return asyncio.run(main())
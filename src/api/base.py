@@ -1,9 +1,384 @@
-from typing import Dict
+import os
+import sys
+import time
+from typing import Dict, Iterator, List
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .. import tracing
+from ..tracing import span
+from .cache import Cache
+from .retry import LIMITER, CallStats, RateLimiter, RetryPolicy, url_template
+from .stream import CHUNK_SIZE, iter_batches, prefetched
+from .utils import APIError
 
 RED = "\33[31m"
+YELLOW = "\33[33m"
 END = "\33[0m"
 
+# root of every endpoint, MEISTERTASK_API_URL points the clients at another
+# server (e.g. benchmarks/stub.py)
+API_URL = "https://www.meistertask.com/api"
+
+# number of items requested per page on listing endpoints
+PAGE_SIZE = 100
+
+# chunks of a listing downloaded ahead of the caller, when prefetching
+PREFETCH_BATCHES = 8
+
+# seconds to connect to the API and to wait for each read of a response
+TIMEOUT = (3.05, 30)
+
+# seconds during which requests fail at once, after the API was unreachable
+OFFLINE_DELAY = 30
+
+# stale cache was served to this process
+OFFLINE_NOTICE = False
+
+# maximum number of API calls in flight during a fan-out
+DEFAULT_CONCURRENCY = 8
+
+
+class Session(requests.Session):
+    """HTTP session keeping a pool of keep-alive connections to the API
+
+    Params:
+    pool_size(int) number of connections kept open per host
+    keep_alive(bool) reuse connections between requests
+    retry(RetryPolicy) retries of throttled and failed requests
+    limiter(RateLimiter) request rate limit, shared by the process by default
+    timeout(tuple) connect and read timeouts of each request
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        keep_alive: bool = True,
+        retry: RetryPolicy = None,
+        limiter: RateLimiter = None,
+        timeout=TIMEOUT,
+    ):
+        super().__init__()
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.limiter = limiter if limiter is not None else LIMITER
+        self.timeout = timeout
+        self.stats = CallStats()
+        # monotonic time until which the API is considered unreachable
+        self.offline_until: float = 0.0
+
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("https://", self.adapter)
+        self.mount("http://", self.adapter)
+
+        if not keep_alive:
+            self.headers["Connection"] = "close"
+
+        if tracing.TRACER is not None:
+            tracing.TRACER.report_from(self.report)
+
+    def request(self, method: str, url: str, *args, **kwargs) -> requests.Response:
+        """Send a request within the rate limit, retrying throttled and failed ones"""
+        call: str = f"{method.upper()} {url_template(url)}"
+        with span(call, "http") as traced:
+            response, retries = self._send(call, method, url, *args, **kwargs)
+            size = response.headers.get("Content-Length")
+            if size is None and not kwargs.get("stream"):
+                size = len(response.content)
+            traced.set(status=response.status_code, bytes=int(size or 0), retries=retries)
+        return response
+
+    @property
+    def offline(self) -> bool:
+        """The API was unreachable a moment ago"""
+        return time.monotonic() < self.offline_until
+
+    def _send(self, call: str, method: str, url: str, *args, **kwargs):
+        started: float = time.perf_counter()
+        attempt: int = 0
+        throttled: int = 0
+        waited: float = 0.0
+        kwargs.setdefault("timeout", self.timeout)
+
+        # fail at once instead of waiting for timeouts again
+        if self.offline:
+            raise requests.exceptions.ConnectionError(f"{call}: the API is unreachable")
+
+        while True:
+            self.limiter.acquire()
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except requests.exceptions.ConnectionError as e:
+                if not self.retry.retry_error(method, e, attempt):
+                    self.stats.record(
+                        call, time.perf_counter() - started, attempt, True, throttled, waited
+                    )
+                    self.offline_until = time.monotonic() + OFFLINE_DELAY
+                    raise
+                delay: float = self.retry.delay(attempt)
+            else:
+                if not self.retry.retry_response(method, response, attempt):
+                    self.limiter.succeeded()
+                    failed: bool = response.status_code >= 400
+                    self.stats.record(
+                        call, time.perf_counter() - started, attempt, failed, throttled, waited
+                    )
+                    return response, attempt
+
+                delay: float = self.retry.delay(attempt, response)
+                if response.status_code == 429:
+                    throttled += 1
+                    self.limiter.throttled(delay)
+                response.close()
+
+            attempt += 1
+            waited += delay
+            time.sleep(delay)
+
+    def _pools(self) -> List:
+        pools = self.adapter.poolmanager.pools
+        return [pools[key] for key in pools.keys()]
+
+    @property
+    def requests_sent(self) -> int:
+        """Number of requests sent through the pool"""
+        return sum(pool.num_requests for pool in self._pools())
+
+    @property
+    def connections_opened(self) -> int:
+        """Number of new connections (TCP + TLS handshakes)"""
+        return sum(pool.num_connections for pool in self._pools())
+
+    @property
+    def connections_reused(self) -> int:
+        """Number of requests sent over an already open connection"""
+        return self.requests_sent - self.connections_opened
+
+    def report(self) -> List[str]:
+        """Lines of the --stats report: connections, then retried requests"""
+        if not self.requests_sent:
+            return []
+        return [
+            f"connections: {self.connections_opened} opened,"
+            f" reused by {self.connections_reused} of {self.requests_sent} requests"
+        ] + self.stats.report()
+
+
 class API:
-    def __init__(self, token: str):
+    def __init__(
+        self, token: str, session: Session = None, cache: Cache = None, raise_errors: bool = False
+    ):
         self.token = token
         self.headers: Dict = {"Authorization": f"Bearer {self.token}"}
+        self.session: Session = session if session is not None else Session()
+        self.cache: Cache = cache
+        self.base_url: str = os.environ.get("MEISTERTASK_API_URL", API_URL).rstrip("/")
+
+        # raise errors to the caller instead of printing them and exiting
+        self.raise_errors = raise_errors
+
+    def _cached(self, url: str, params: Dict, resource: str):
+        """(key, entry, fresh) of a response in the cache, key is None when not cached"""
+        if self.cache is None or resource is None:
+            return None, None, False
+
+        key: str = self.cache.key(url, params)
+        with span(resource, "cache") as traced:
+            entry = self.cache.get(resource, key)
+            fresh: bool = entry is not None and self.cache.is_fresh(resource, entry)
+            traced.set(hit=fresh, bytes=len(entry.body) if entry else 0)
+        return key, entry, fresh
+
+    def _revalidating(self, entry) -> Dict:
+        """Headers revalidating a stale entry instead of downloading it again"""
+        headers: Dict = dict(self.headers)
+        if entry and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def _get(self, url: str, params: Dict = None, resource: str = None):
+        """GET a json document, served from the cache while it is fresh
+
+        Params:
+        url(str) endpoint
+        params(dict) query parameters
+        resource(str) cache group of the response (projects, sections, tasks),
+            responses without one are never cached
+        """
+        key, entry, fresh = self._cached(url, params, resource)
+        if fresh:
+            return self._decode_entry(entry)
+
+        try:
+            r = self.session.get(url, headers=self._revalidating(entry), params=params)
+        except requests.exceptions.ConnectionError:
+            if entry is None:
+                raise
+            return self._decode_entry(self._stale(entry))
+
+        if r.status_code == 304 and entry:
+            self.cache.touch(resource, key, entry)
+            return self._decode_entry(entry)
+
+        if r.status_code != 200:
+            raise APIError(r.status_code)
+
+        if key is not None:
+            self.cache.put(
+                resource, key, r.content, r.headers.get("ETag"), r.headers.get("Last-Modified")
+            )
+        return self._json(r)
+
+    def _get_batches(self, url: str, params: Dict = None, resource: str = None) -> Iterator[List]:
+        """GET a json array and yield its items as they are downloaded,
+        in lists of the items decoded from each chunk
+
+        Same caching as _get: the body is kept aside while it streams and
+        cached once complete. A caller stopping early leaves the cache as is.
+        """
+        key, entry, fresh = self._cached(url, params, resource)
+        if fresh:
+            yield self._decode_entry(entry)
+            return
+
+        try:
+            r = self.session.get(
+                url, headers=self._revalidating(entry), params=params, stream=True
+            )
+        except requests.exceptions.ConnectionError:
+            if entry is None:
+                raise
+            yield self._decode_entry(self._stale(entry))
+            return
+
+        with r:
+            if r.status_code == 304 and entry:
+                self.cache.touch(resource, key, entry)
+                yield self._decode_entry(entry)
+                return
+
+            if r.status_code != 200:
+                raise APIError(r.status_code)
+
+            body: List[bytes] = [] if key is not None else None
+            yield from self._stream(r, body)
+
+        if key is not None:
+            self.cache.put(
+                resource, key, b"".join(body), r.headers.get("ETag"), r.headers.get("Last-Modified")
+            )
+
+    @staticmethod
+    def _stream(r: requests.Response, body: List[bytes] = None) -> Iterator[List]:
+        """Batches of items of a json array response, decoded chunk by chunk
+
+        Params:
+        r: response sent with stream=True
+        body(list) receives the raw chunks, when given
+        """
+        size: int = 0
+
+        def chunks() -> Iterator[bytes]:
+            nonlocal size
+            for chunk in r.iter_content(CHUNK_SIZE):
+                size += len(chunk)
+                if body is not None:
+                    body.append(chunk)
+                yield chunk
+
+        batches: Iterator[List] = iter_batches(chunks())
+        if tracing.TRACER is None:
+            yield from batches
+            return
+
+        # time spent reading and decoding, not the time the caller holds the items
+        start: float = time.perf_counter()
+        busy: float = 0.0
+        count: int = 0
+        while True:
+            started: float = time.perf_counter()
+            try:
+                batch: List = next(batches)
+            except StopIteration:
+                break
+            finally:
+                busy += time.perf_counter() - started
+            count += len(batch)
+            yield batch
+        tracing.TRACER.record(
+            "response stream",
+            "decode",
+            start,
+            time.perf_counter() - start,
+            {"bytes": size, "records": count},
+            busy=busy,
+        )
+
+    @staticmethod
+    def _stale(entry):
+        """Entry served while the API is unreachable, said once per process"""
+        global OFFLINE_NOTICE
+        if not OFFLINE_NOTICE:
+            OFFLINE_NOTICE = True
+            age: int = int((time.time() - entry.stored_at) // 60)
+            sys.stderr.write(f"{YELLOW}Offline, showing cached data ({age} min old){END}\n")
+        return entry
+
+    @staticmethod
+    def _json(r: requests.Response):
+        """Json document of a response, timed by --stats and --trace"""
+        with span("response", "decode", bytes=len(r.content)):
+            return r.json()
+
+    @staticmethod
+    def _decode_entry(entry):
+        with span("cache entry", "decode", bytes=len(entry.body)):
+            return entry.decode()
+
+    def _invalidate(self, *resources: str):
+        """Drop cached responses of resources changed by a mutation"""
+        if self.cache is not None:
+            self.cache.invalidate(*resources)
+
+    def _pages(self, url: str, params: Dict, page_size: int, resource: str) -> Iterator[List]:
+        """Batches of items of every page, see _get_batches"""
+        page: int = 1
+        while True:
+            count: int = 0
+            page_params: Dict = {**params, "page": page, "items": page_size}
+            for batch in self._get_batches(url, page_params, resource):
+                count += len(batch)
+                yield batch
+
+            # a short page is the last one
+            if count < page_size:
+                return
+            page += 1
+
+    def _paginate(
+        self,
+        url: str,
+        params: Dict = None,
+        page_size: int = PAGE_SIZE,
+        prefetch: bool = False,
+        resource: str = None,
+    ) -> Iterator[Dict]:
+        """Walk a listing endpoint page by page and yield its items lazily,
+        as soon as they are decoded
+
+        Params:
+        url(str) listing endpoint
+        params(dict) extra query parameters
+        resource(str) cache group of the pages
+        page_size(int) number of items per page
+        prefetch(bool) keep downloading, a few chunks ahead, while items are consumed
+        """
+        batches: Iterator[List] = self._pages(url, dict(params or {}), page_size, resource)
+        if prefetch:
+            batches = prefetched(batches, PREFETCH_BATCHES)
+        for batch in batches:
+            yield from batch
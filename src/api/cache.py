@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+# seconds a cached response is served without asking the API
+DEFAULT_TTLS: Dict[str, int] = {
+    "projects": 600,
+    "sections": 3600,
+    "tasks": 120,
+}
+
+
+# file of a resource directory, its mtime is the time of the last invalidation
+EXPIRED = "expired"
+
+
+def cache_home() -> str:
+    """Root directory of the cache, following the XDG base directory spec"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "meistertask")
+
+
+class CacheEntry:
+    def __init__(self, body: bytes, meta: Dict):
+        self.body = body
+        self.meta = meta
+        self.data = None
+        self.mtime: int = None
+
+    def decode(self):
+        """Json document of the body, decoded once"""
+        if self.data is None:
+            self.data = json.loads(self.body)
+        return self.data
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.meta.get("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.meta.get("last_modified")
+
+    @property
+    def stored_at(self) -> float:
+        return self.meta.get("stored_at", 0)
+
+
+class Cache:
+    """On-disk cache of API GET responses
+
+    Entries are grouped by token and resource (projects, sections, tasks),
+    so mutations can drop every entry of the resource they touch.
+
+    Params:
+    token(str) API token, cache entries are never shared between tokens
+    directory(str) cache root, defaults to $XDG_CACHE_HOME/meistertask
+    ttls(dict) seconds each resource is considered fresh
+    refresh(bool) revalidate every entry with the API, regardless of its age
+    memory(bool) also keep entries, decoded, in memory (long running processes)
+    """
+
+    def __init__(
+        self,
+        token: str,
+        directory: str = None,
+        ttls: Dict = None,
+        refresh: bool = False,
+        memory: bool = False,
+    ):
+        token_hash = hashlib.sha256(token.encode()).hexdigest()[:16]
+        self.directory = os.path.join(directory or cache_home(), token_hash)
+        self.ttls: Dict[str, int] = {**DEFAULT_TTLS, **(ttls or {})}
+        self.refresh = refresh
+        self.memory: Dict[Tuple[str, str], CacheEntry] = {} if memory else None
+
+    @staticmethod
+    def key(url: str, params: Dict = None) -> str:
+        query = urlencode(sorted((params or {}).items()))
+        return hashlib.sha1(f"{url}?{query}".encode()).hexdigest()
+
+    def _path(self, resource: str, key: str) -> str:
+        return os.path.join(self.directory, resource, key)
+
+    def get(self, resource: str, key: str) -> Optional[CacheEntry]:
+        path = self._path(resource, key)
+        if self.memory is None:
+            return self._read(path)
+
+        # other processes share the directory: an in-memory entry is only
+        # used while its meta file is still the one it was loaded from
+        try:
+            mtime: int = os.stat(f"{path}.meta").st_mtime_ns
+        except OSError:
+            self.memory.pop((resource, key), None)
+            return None
+
+        entry = self.memory.get((resource, key))
+        if entry is None or entry.mtime != mtime:
+            entry = self._read(path)
+            if entry is None:
+                return None
+            entry.mtime = mtime
+            self.memory[(resource, key)] = entry
+        return entry
+
+    @staticmethod
+    def _read(path: str) -> Optional[CacheEntry]:
+        try:
+            with open(f"{path}.meta") as f:
+                meta: Dict = json.load(f)
+            with open(f"{path}.body", "rb") as f:
+                body: bytes = f.read()
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(body, meta)
+
+    def is_fresh(self, resource: str, entry: CacheEntry) -> bool:
+        if self.refresh or entry.stored_at <= self._expired_at(resource):
+            return False
+        return time.time() - entry.stored_at < self.ttls.get(resource, 0)
+
+    def _expired_at(self, resource: str) -> float:
+        """Time of the last invalidation of a resource, 0 when there was none"""
+        try:
+            return os.stat(os.path.join(self.directory, resource, EXPIRED)).st_mtime
+        except OSError:
+            return 0.0
+
+    def put(self, resource: str, key: str, body: bytes, etag: str = None, last_modified: str = None):
+        path = self._path(resource, key)
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+
+        meta = {"stored_at": time.time(), "etag": etag, "last_modified": last_modified}
+        self._write(f"{path}.body", body)
+        self._write(f"{path}.meta", json.dumps(meta).encode())
+
+        if self.memory is not None:
+            entry = CacheEntry(body, meta)
+            entry.mtime = os.stat(f"{path}.meta").st_mtime_ns
+            self.memory[(resource, key)] = entry
+
+    def touch(self, resource: str, key: str, entry: CacheEntry):
+        """Mark a revalidated entry as fresh again"""
+        self.put(resource, key, entry.body, entry.etag, entry.last_modified)
+
+    def invalidate(self, *resources: str):
+        """Make every entry of resources stale
+
+        Stale entries are revalidated with the API before being used, and are
+        still served while it is unreachable (changes queued offline resolve
+        their tasks from them).
+        """
+        for resource in resources:
+            directory: str = os.path.join(self.directory, resource)
+            if os.path.isdir(directory):
+                self._write(os.path.join(directory, EXPIRED), b"")
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        if self.memory is not None:
+            self.memory.clear()
+
+    @staticmethod
+    def _write(path: str, data: bytes):
+        # write then rename, so a concurrent reader never sees a partial file
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
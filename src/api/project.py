@@ -1,47 +1,55 @@
-import requests
-from typing import List, Dict
+from typing import Iterator, List, Dict
 
-from .base import API
-from .utils import catch_http_errors
+from .base import API, Session, PAGE_SIZE
+from .cache import Cache
+from .utils import APIError, catch_http_errors
+from ..models import Project
 
 class APIProject(API):
-    def __init__(self, token: str):
-        super().__init__(token)
+    def __init__(
+        self, token: str, session: Session = None, cache: Cache = None, raise_errors: bool = False
+    ):
+        super().__init__(token, session, cache, raise_errors)
 
     @catch_http_errors
-    def project_fetch_all(self, filter_keyword="active") -> List[Dict]:
-        r = requests.get(
-            "https://www.meistertask.com/api/projects",
-            headers=self.headers,
+    def project_iter_all(
+        self,
+        filter_keyword="active",
+        page_size: int = PAGE_SIZE,
+        prefetch: bool = False,
+        raw: bool = False,
+    ) -> Iterator[Dict]:
+        items: Iterator[Dict] = self._paginate(
+            f"{self.base_url}/projects",
             params={"status": str(filter_keyword).strip().lower()},
+            page_size=page_size,
+            prefetch=prefetch,
+            resource="projects",
         )
-        
-        if r.status_code != 200:
-            print
-            raise Exception(f'Failed to connect to API ({r.status_code})')
-        return r.json()
+        # raw: every field of the API, not only the ones of the model
+        yield from items if raw else map(Project, items)
 
     @catch_http_errors
-    def project_fetch(self, id: int) -> Dict:
-        r = requests.get(
-            f"https://www.meistertask.com/api/projects/{id}", headers=self.headers
-        )
+    def project_fetch_all(self, filter_keyword="active") -> List[Dict]:
+        return list(self.project_iter_all(filter_keyword))
 
-        if r.status_code != 200:
-            raise Exception(f'Failed to connect to API ({r.status_code})')
-        return r.json()
+    @catch_http_errors
+    def project_fetch(self, id: int) -> Dict:
+        return Project(self._get(f"{self.base_url}/projects/{id}", resource="projects"))
 
     @catch_http_errors
     def project_create(self, name: str, description: str):
-        r = requests.post(
-            "https://www.meistertask.com/api/projects",
+        r = self.session.post(
+            f"{self.base_url}/projects",
             headers=self.headers,
             data={"name": name, "notes": description},
         )
 
         if r.status_code != 200:
-            raise Exception(f'Failed to connect to API ({r.status_code})')
-        return r.json()
+            raise APIError(r.status_code)
+
+        self._invalidate("projects")
+        return Project.from_response(self._json(r))
 
     @catch_http_errors
     def project_update(self, id: int, name: str = "", description: str = ""):
@@ -52,36 +60,42 @@ class APIProject(API):
         if len(description):
             data["notes"] = description
 
-        r = requests.put(
-            f"https://www.meistertask.com/api/projects/{id}",
+        r = self.session.put(
+            f"{self.base_url}/projects/{id}",
             headers=self.headers,
             data=data,
         )
 
         if r.status_code != 200:
-            raise Exception(f'Failed to connect to API ({r.status_code})')
-        return r.json()
+            raise APIError(r.status_code)
+
+        self._invalidate("projects")
+        return Project.from_response(self._json(r))
 
     @catch_http_errors
     def project_delete(self, id: int) -> Dict:
-        r = requests.put(
-            f"https://www.meistertask.com/api/projects/{id}",
+        r = self.session.put(
+            f"{self.base_url}/projects/{id}",
             headers=self.headers,
             data={"status": 4},
         )
 
         if r.status_code != 200:
-            raise Exception(f'Failed to connect to API ({r.status_code})')
-        return r.json()
+            raise APIError(r.status_code)
+
+        self._invalidate("projects")
+        return Project.from_response(self._json(r))
 
     @catch_http_errors
     def project_archive(self, id: int) -> Dict:
-        r = requests.put(
-            f"https://www.meistertask.com/api/projects/{id}",
+        r = self.session.put(
+            f"{self.base_url}/projects/{id}",
             headers=self.headers,
             data={"status": 5},
         )
 
         if r.status_code != 200:
-            raise Exception(f'Failed to connect to API ({r.status_code})')
-        return r.json()
\ No newline at end of file
+            raise APIError(r.status_code)
+
+        self._invalidate("projects")
+        return Project.from_response(self._json(r))
\ No newline at end of file
@@ -0,0 +1,234 @@
+import os
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+# responses worth another try: rate limited or temporary server failures
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+# methods safe to send twice
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+ID_PATTERN = re.compile(r"/\d+(?=/|$)")
+
+
+def url_template(url: str) -> str:
+    """Path of a url with ids replaced: https://host/api/tasks/12?a=b -> /api/tasks/{id}"""
+    return ID_PATTERN.sub("/{id}", urlsplit(url).path)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header, given in seconds or as a http date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def never_sent(error: Exception) -> bool:
+    """Whether a request failed before reaching the API: no connection could be opened"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class RetryPolicy:
+    """When and how long to wait before sending a failed request again
+
+    Params:
+    retries(int) maximum number of retries of a request
+    backoff(float) base delay in seconds, doubled on each retry
+    max_backoff(float) upper bound of a delay, Retry-After of the server included
+    connect_retries(int) maximum number of retries of a request that got no
+        response, an unreachable API rarely comes back within seconds
+    """
+
+    def __init__(
+        self,
+        retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        connect_retries: int = 2,
+    ):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.connect_retries = connect_retries
+
+    def retry_response(self, method: str, response: requests.Response, attempt: int) -> bool:
+        if attempt >= self.retries or response.status_code not in RETRY_STATUSES:
+            return False
+        # 429 and 503 mean the request was not processed, even a POST can be sent again
+        return method.upper() in IDEMPOTENT_METHODS or response.status_code in (429, 503)
+
+    def retry_error(self, method: str, error: Exception, attempt: int) -> bool:
+        if attempt >= min(self.retries, self.connect_retries):
+            return False
+        if never_sent(error):
+            return True
+        # a reset connection may have delivered the request already
+        return method.upper() in IDEMPOTENT_METHODS and isinstance(
+            error, requests.exceptions.ConnectionError
+        )
+
+    def delay(self, attempt: int, response: requests.Response = None) -> float:
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                # a server asking for an hour would stall the cli, try again sooner
+                return min(retry_after, self.max_backoff)
+
+        # exponential backoff with full jitter
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+class RateLimiter:
+    """Token bucket shared by every thread of the process
+
+    The rate halves when the API answers 429 (at most once per second) and
+    grows back after successful requests, so it settles at what the server
+    accepts, below `rate`: a hard ceiling, it is never probed above
+    (MEISTERTASK_RATE_LIMIT sets it for the process).
+
+    Params:
+    rate(float) highest rate, in requests per second
+    burst(int) requests allowed at once after a quiet period
+    min_rate(float) lowest rate after repeated throttling
+    """
+
+    def __init__(self, rate: float = 20.0, burst: int = 20, min_rate: float = 0.5):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.throttled_at = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def throttled(self, pause: float = 0.0):
+        """The API asked to slow down, optionally pausing every caller"""
+        with self.lock:
+            now = time.monotonic()
+            # concurrent requests throttled together slow down the rate once
+            if now - self.throttled_at >= 1.0:
+                self.rate = max(self.min_rate, self.rate / 2)
+                self.throttled_at = now
+            self.tokens = min(self.tokens, 0.0)
+            self.paused_until = max(self.paused_until, now + pause)
+
+    def succeeded(self):
+        with self.lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + 0.5)
+
+
+# requests per second sent to the API, MEISTERTASK_RATE_LIMIT raises it for
+# local servers (e.g. benchmarks/stub.py)
+RATE_LIMIT = float(os.environ.get("MEISTERTASK_RATE_LIMIT", 20))
+
+# one limiter per process, shared by all sessions, threads and async clients
+LIMITER = RateLimiter(RATE_LIMIT, burst=max(20, int(RATE_LIMIT)))
+
+
+class CallStats:
+    """Retry and latency counters per request (method and url template)"""
+
+    def __init__(self):
+        self.calls: Dict[str, Dict] = {}
+        self.lock = threading.Lock()
+
+    def record(
+        self,
+        call: str,
+        latency: float,
+        retries: int,
+        failed: bool = False,
+        throttled: int = 0,
+        waited: float = 0.0,
+    ):
+        """Count a request
+
+        Params:
+        call(str) method and url template, e.g. "GET /api/tasks/{id}"
+        latency(float) seconds from the first attempt to the response, waits included
+        retries(int) attempts after the first one
+        failed(bool) no response, or an error status
+        throttled(int) attempts answered 429
+        waited(float) seconds slept between attempts
+        """
+        with self.lock:
+            stats = self.calls.setdefault(
+                call,
+                {
+                    "calls": 0,
+                    "retries": 0,
+                    "failures": 0,
+                    "throttled": 0,
+                    "waited": 0.0,
+                    "latency": 0.0,
+                    "max_latency": 0.0,
+                },
+            )
+            stats["calls"] += 1
+            stats["retries"] += retries
+            stats["failures"] += int(failed)
+            stats["throttled"] += throttled
+            stats["waited"] += waited
+            stats["latency"] += latency
+            stats["max_latency"] = max(stats["max_latency"], latency)
+
+    def summary(self) -> Dict[str, Dict]:
+        """Copy of the counters, with the average latency of each call"""
+        with self.lock:
+            return {
+                call: {**stats, "avg_latency": stats["latency"] / stats["calls"]}
+                for call, stats in self.calls.items()
+            }
+
+    @property
+    def retries(self) -> int:
+        with self.lock:
+            return sum(stats["retries"] for stats in self.calls.values())
+
+    def report(self) -> List[str]:
+        """Lines of the --stats report, for the requests sent again"""
+        lines: List[str] = []
+        for call, stats in sorted(self.summary().items()):
+            if stats["retries"]:
+                lines.append(
+                    f"retried {call}: {stats['retries']} retries of {stats['calls']} requests,"
+                    f" {stats['throttled']} throttled (429), {stats['waited']:.1f}s waited"
+                )
+        return lines
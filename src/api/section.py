@@ -1,38 +1,41 @@
-import requests
 from typing import List, Dict
 
-from .base import API
-from .utils import catch_http_errors
+from .base import API, Session
+from .cache import Cache
+from .utils import APIError, catch_http_errors
+from ..models import Section
 
 
 class APISection(API):
 
-    def __init__(self, token:str):
-        super().__init__(token)
+    def __init__(
+        self, token: str, session: Session = None, cache: Cache = None, raise_errors: bool = False
+    ):
+        super().__init__(token, session, cache, raise_errors)
 
     @catch_http_errors
-    def section_create(self, project_id: int, name: str) -> Dict:
-        r = requests.post(
-            f"https://www.meistertask.com/api/projects/{project_id}/sections",
+    def section_create(self, project_id: int, name: str, sequence: int = None) -> Dict:
+        data = {"name": str(name)}
+        if sequence is not None:
+            data["sequence"] = sequence
+
+        r = self.session.post(
+            f"{self.base_url}/projects/{project_id}/sections",
             headers=self.headers,
-            data={"name": str(name)},
+            data=data,
         )
 
         if r.status_code != 200:
-            raise Exception(f'Failed to connect to API ({r.status_code})')
-        return r.json()
-
-
+            raise APIError(r.status_code)
 
+        self._invalidate("sections")
+        return Section.from_response(self._json(r))
 
     @catch_http_errors
-    def section_fetch_all(self, project_id: int) -> List[Dict]:
-
-        r = requests.get(
-            f"https://www.meistertask.com/api/projects/{project_id}/sections",
-            headers=self.headers,
+    def section_fetch_all(self, project_id: int, raw: bool = False) -> List[Dict]:
+        sections: List[Dict] = self._get(
+            f"{self.base_url}/projects/{project_id}/sections",
+            resource="sections",
         )
-
-        if r.status_code != 200:
-            raise Exception(f'Failed to connect to API ({r.status_code})')
-        return r.json()
+        # raw: every field of the API, not only the ones of the model
+        return sections if raw else [Section(section) for section in sections]
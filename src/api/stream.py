@@ -0,0 +1,126 @@
+"""Decoding of json arrays while they download, and read-ahead of iterators.
+
+A listing page is decoded as its chunks arrive: the first items are shown
+before the last byte is received, and no list of the whole page is ever
+built.
+"""
+
+import codecs
+import json
+import re
+import threading
+from queue import Full, Queue
+from typing import Iterable, Iterator, List
+
+# bytes read from the socket at once
+CHUNK_SIZE = 16 * 1024
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# characters that may follow an item of an array
+DELIMITERS = frozenset(",] \t\n\r")
+
+# end of a prefetched iterator
+_DONE = object()
+
+
+def iter_batches(chunks: Iterable[bytes]) -> Iterator[List]:
+    """Items of a json array, decoded as its chunks arrive
+
+    Yields the items completed by each chunk, as a list (often empty).
+
+    Params:
+    chunks: the array, in utf-8 encoded pieces of any size
+
+    Raises ValueError when the document is not an array or is cut short.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer: str = ""
+    position: int = 0
+    started: bool = False
+
+    for chunk in chunks:
+        # keep the undecoded tail only
+        buffer = buffer[position:] + utf8.decode(chunk)
+        position = 0
+        batch: List = []
+
+        while True:
+            position = WHITESPACE.match(buffer, position).end()
+            if position == len(buffer):
+                break
+
+            char: str = buffer[position]
+            if not started:
+                if char != "[":
+                    raise ValueError("Expected a json array")
+                started = True
+                position += 1
+            elif char == ",":
+                position += 1
+            elif char == "]":
+                yield batch
+                return
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    # an item cut by the end of the chunk
+                    break
+                if not isinstance(item, (dict, list, str)) and buffer[end:end + 1] not in DELIMITERS:
+                    # a number cut by the end of the chunk: "-3.5" of "-3.5e3"
+                    break
+                position = end
+                batch.append(item)
+
+        yield batch
+
+    raise ValueError("Truncated json array")
+
+
+def prefetched(items: Iterator, size: int) -> Iterator:
+    """Iterate in a background thread, at most `size` items ahead of the caller
+
+    Handing over an item between threads costs a few microseconds, hand over
+    batches of small items.
+
+    Errors of the iterator are raised to the caller. Closing the returned
+    generator stops the thread.
+    """
+    queue: Queue = Queue(maxsize=size)
+    stop = threading.Event()
+
+    def put(value) -> bool:
+        while not stop.is_set():
+            try:
+                queue.put(value, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+            put((_DONE, None))
+        except BaseException as e:
+            put((_DONE, e))
+        finally:
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            item, error = queue.get()
+            if error is not None:
+                raise error
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        stop.set()
@@ -1,59 +1,107 @@
-import requests
-from typing import List, Dict
+from typing import Iterator, List, Dict
 
-from .base import API
-from .utils import catch_http_errors
+from .base import API, Session, PAGE_SIZE
+from .cache import Cache
+from .utils import APIError, catch_http_errors
+from ..models import Task
 
 class APITask(API):
 
-    def __init__(self, token: str):
-        super().__init__(token)
+    def __init__(
+        self, token: str, session: Session = None, cache: Cache = None, raise_errors: bool = False
+    ):
+        super().__init__(token, session, cache, raise_errors)
 
 
     @catch_http_errors
-    def task_fetch_all(self, project_id: int) -> List[Dict]:
-        r = requests.get(
-            f"https://www.meistertask.com/api/projects/{project_id}/tasks",
-            headers=self.headers,
+    def task_iter_all(
+        self,
+        project_id: int,
+        page_size: int = PAGE_SIZE,
+        prefetch: bool = False,
+        sort: str = None,
+        raw: bool = False,
+    ) -> Iterator[Dict]:
+        items: Iterator[Dict] = self._paginate(
+            f"{self.base_url}/projects/{project_id}/tasks",
+            params={"sort": sort} if sort else None,
+            page_size=page_size,
+            prefetch=prefetch,
+            resource="tasks",
         )
+        # raw: every field of the API, not only the ones of the model
+        yield from items if raw else map(Task, items)
 
-        if r.status_code != 200:
-            raise Exception(f'Failed to connect to API ({r.status_code})')
-        return r.json()
+    @catch_http_errors
+    def task_fetch_page(self, section_id: int, page: int, page_size: int = PAGE_SIZE) -> List[Dict]:
+        """One page (from 1) of the tasks of a section, a short page is the last one"""
+        tasks: List[Dict] = self._get(
+            f"{self.base_url}/sections/{section_id}/tasks",
+            params={"page": page, "items": page_size},
+            resource="tasks",
+        )
+        return [Task(task) for task in tasks]
+
+    @catch_http_errors
+    def task_fetch_all(self, project_id: int) -> List[Dict]:
+        return list(self.task_iter_all(project_id))
+
+    @catch_http_errors
+    def task_fetch(self, id: int) -> Dict:
+        return Task(self._get(f"{self.base_url}/tasks/{id}", resource="tasks"))
 
     @catch_http_errors
     def task_create(self, section_id: int, name: str, description: str = ""):
-        r = requests.post(
-            f"https://www.meistertask.com/api/sections/{section_id}/tasks",
+        r = self.session.post(
+            f"{self.base_url}/sections/{section_id}/tasks",
             headers=self.headers,
             data={"name": str(name), "notes": str(description)},
         )
 
         if r.status_code != 200:
-            raise Exception(f'Failed to connect to API ({r.status_code})')
-        return r.json()
+            raise APIError(r.status_code)
+
+        self._invalidate("tasks")
+        return Task.from_response(self._json(r))
+
+    @catch_http_errors
+    def task_update(self, id: int, name: str = "", description: str = ""):
+        data = dict()
+        if len(name):
+            data["name"] = str(name)
+        if len(description):
+            data["notes"] = str(description)
+
+        r = self.session.put(f"{self.base_url}/tasks/{id}", headers=self.headers, data=data)
+
+        if r.status_code != 200:
+            raise APIError(r.status_code)
+
+        self._invalidate("tasks")
+        return Task.from_response(self._json(r))
 
     @catch_http_errors
-    def task_update(self, id: int, name: str, description: str = ""):
-        r = requests.put(
-            f"https://www.meistertask.com/api/tasks/{id}",
-            headers=self.headers,
-            data={"name": str(name), "notes": str(description)},
-        )
+    def task_edit(self, id: int, fields: Dict) -> Dict:
+        """Change any fields of a task (name, notes, section_id ...) at once"""
+        r = self.session.put(f"{self.base_url}/tasks/{id}", headers=self.headers, data=fields)
 
         if r.status_code != 200:
-            raise Exception(f'Failed to connect to API ({r.status_code})')
-        return r.json()
+            raise APIError(r.status_code)
+
+        self._invalidate("tasks")
+        return Task.from_response(self._json(r))
 
     @catch_http_errors
     def task_move(self, task_id: int, section_id: int) -> Dict:
 
-        r = requests.put(
-            f"https://www.meistertask.com/api/tasks/{task_id}",
+        r = self.session.put(
+            f"{self.base_url}/tasks/{task_id}",
             headers=self.headers,
             data={"section_id": section_id},
         )
 
         if r.status_code != 200:
-            raise Exception(f'Failed to connect to API ({r.status_code})')
-        return r.json()
\ No newline at end of file
+            raise APIError(r.status_code)
+
+        self._invalidate("tasks")
+        return Task.from_response(self._json(r))
\ No newline at end of file
@@ -1,17 +1,48 @@
+import functools
+import inspect
+
 import requests
 
 RED = "\33[31m"
 END = "\33[0m"
 
 
+class APIError(Exception):
+    """The API answered with an unexpected status code"""
+
+    def __init__(self, status_code: int):
+        super().__init__(f'Failed to connect to API ({status_code})')
+        self.status_code = status_code
+
+
+def handle_error(e: Exception):
+    """Print an error of the API, and exit"""
+    if isinstance(e, requests.exceptions.ConnectionError):
+        print(f'{RED}It seems there is not internet connection{END}')
+    else:
+        print(e)
+    exit(1)
+
+
 def catch_http_errors(func):
-    def wrapper(*args):
+    if inspect.isgeneratorfunction(func):
+        # errors of a lazy listing are raised while iterating, not on call
+        @functools.wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            try:
+                yield from func(*args, **kwargs)
+            except Exception as e:
+                if getattr(args[0], "raise_errors", False):
+                    raise
+                handle_error(e)
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
         try:
-            return func(*args)
-        except requests.exceptions.ConnectionError as e:
-            print(f'{RED}It seems there is not internet connection{END}')
-            exit()
+            return func(*args, **kwargs)
         except Exception as e:
-            print(e)
-            exit()
+            if getattr(args[0], "raise_errors", False):
+                raise
+            handle_error(e)
     return wrapper
@@ -0,0 +1,257 @@
+#!/usr/bin/python3
+"""Many cli commands run by one process: `meistertask batch <file|->`.
+
+One command per line, written as on the command line without `meistertask`,
+blank lines and `# comments` are skipped:
+
+    project view "my project"
+    task create "fix login" "my project"
+    task move "fix login" done "my project"
+
+The commands share one Meistertask facade: one pool of keep-alive
+connections, cached responses kept decoded in memory, and project names
+resolved once. Nobody can answer prompts, they fail the command unless
+--pick-best / --yes answer them.
+
+With --jobs, consecutive read-only commands (project list / view, task list)
+run together, their outputs printed in order. Any other command waits for
+the ones before it and runs alone.
+"""
+
+import io
+import shlex
+import sys
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Tuple
+
+from .utils import CYAN, RED, END
+
+# read-only commands run at once, at most
+GROUP_SIZE = 64
+
+# commands that cannot run within a batch
+EXCLUDED = ("batch", "board", "daemon", "completion")
+
+
+def read_commands(path: str) -> Iterator[Tuple[int, str]]:
+    """Lines of a batch file ("-": stdin) holding a command, with their number"""
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for number, line in enumerate(f, start=1):
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield number, line
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def read_only(args) -> bool:
+    """Whether a command only reads, and may run along others"""
+    if args.refresh or args.queue:
+        return False
+    from .parser.project import ProjectParser
+    from .parser.task import TaskParser
+
+    option: str = getattr(args, "option", None)
+    if args.command in ProjectParser.names:
+        return option in ("l", "ls", "list", "v", "show", "display", "view")
+    if args.command in TaskParser.names:
+        return option in ("l", "ls", "list")
+    return False
+
+
+class ThreadOutput:
+    """Stand-in for sys.stdout / sys.stderr sending each thread's writes to
+    its own buffer, while parallel commands run"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def capture(self) -> io.StringIO:
+        self.local.buffer = io.StringIO()
+        return self.local.buffer
+
+    def release(self):
+        self.local.buffer = None
+
+    def write(self, text: str) -> int:
+        buffer: io.StringIO = getattr(self.local, "buffer", None)
+        return (self.stream if buffer is None else buffer).write(text)
+
+    def flush(self):
+        if getattr(self.local, "buffer", None) is None:
+            self.stream.flush()
+
+    def isatty(self) -> bool:
+        return self.stream.isatty()
+
+    def __getattr__(self, name: str):
+        return getattr(self.stream, name)
+
+
+class Batch:
+    """Commands of a batch file, run with a shared facade
+
+    Params:
+    token(str) API token
+    meistertask(Meistertask) facade shared by the commands
+    jobs(int) read-only commands run at once
+    keep_going(bool) run the next commands after a failed one
+    """
+
+    def __init__(self, token: str, meistertask, jobs: int = 1, keep_going: bool = False):
+        self.token = token
+        self.meistertask = meistertask
+        self.jobs = max(jobs, 1)
+        self.keep_going = keep_going
+        self.queue: bool = meistertask.queue
+        self.failed: List[Tuple[int, str, int]] = []
+        self.total: int = 0
+
+    def parse(self, line: str):
+        """Parsed arguments of a command line, or the reason it cannot run"""
+        from .parser import Parser
+
+        try:
+            argv: List[str] = shlex.split(line, comments=True)
+            args = Parser(argv).parse_args()
+        except ValueError as e:
+            return f"Invalid line: {e}"
+        except SystemExit:
+            # argparse printed the error
+            return "Invalid command"
+
+        if args.command in EXCLUDED:
+            return f"{args.command} cannot run in a batch"
+        if not args.cache or args.stats or args.trace:
+            return "Give --no-cache, --stats and --trace to the batch command"
+        return args
+
+    def execute(self, args) -> int:
+        """Run a parsed command, return its exit code"""
+        from .__main__ import refresh_needed, run
+        from .prompt import NoAnswer
+
+        if self.meistertask.cache is not None:
+            self.meistertask.cache.refresh = refresh_needed(args)
+        self.meistertask.queue = self.queue or args.queue
+        try:
+            run(args, self.token, None if getattr(args, "local", False) else self.meistertask)
+        except NoAnswer as e:
+            print(f"{RED}No answer to: {e.question} (give it in the command, or see --pick-best, --yes){END}", file=sys.stderr)
+            return 1
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else int(e.code is not None)
+        except Exception:
+            traceback.print_exc()
+            return 1
+        return 0
+
+    def captured(self, stdout: ThreadOutput, stderr: ThreadOutput, args) -> Tuple[int, str, str]:
+        """Run a command, its output kept aside"""
+        output, errors = stdout.capture(), stderr.capture()
+        try:
+            exit_code: int = self.execute(args)
+        finally:
+            stdout.release()
+            stderr.release()
+        return exit_code, output.getvalue(), errors.getvalue()
+
+    def run_group(self, group: List[Tuple[int, str, object]]) -> bool:
+        """Run read-only commands at once, print their outputs in order
+
+        Return:
+            False when one failed and the batch must stop
+        """
+        if len(group) == 1:
+            return self.run_one(*group[0])
+
+        stdout, stderr = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = outputs = ThreadOutput(stdout), ThreadOutput(stderr)
+        try:
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                results = list(executor.map(lambda command: self.captured(*outputs, command[2]), group))
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+
+        ok: bool = True
+        for (number, line, _), (exit_code, output, errors) in zip(group, results):
+            sys.stdout.write(output)
+            sys.stdout.flush()
+            sys.stderr.write(errors)
+            ok = self.done(number, line, exit_code) and ok
+        return ok
+
+    def run_one(self, number: int, line: str, args) -> bool:
+        return self.done(number, line, self.execute(args))
+
+    def done(self, number: int, line: str, exit_code: int) -> bool:
+        self.total += 1
+        if exit_code:
+            self.failed.append((number, line, exit_code))
+            print(f"{RED}[-] Line {number} failed ({exit_code}): {line}{END}", file=sys.stderr)
+        return not exit_code or self.keep_going
+
+    def run(self, path: str) -> int:
+        """Run the commands of a batch file, return the exit code of the batch"""
+        group: List[Tuple[int, str, object]] = []
+        ok: bool = True
+
+        for number, line in read_commands(path):
+            args = self.parse(line)
+            if isinstance(args, str):
+                print(f"{RED}[-] Line {number}: {args}{END}", file=sys.stderr)
+                self.total += 1
+                self.failed.append((number, line, 2))
+                ok = self.keep_going
+            elif self.jobs > 1 and read_only(args):
+                group.append((number, line, args))
+                if len(group) >= GROUP_SIZE:
+                    ok = self.run_group(group)
+                    group = []
+            else:
+                if group:
+                    ok = self.run_group(group)
+                    group = []
+                ok = ok and self.run_one(number, line, args)
+            if not ok:
+                break
+
+        if ok and group:
+            ok = self.run_group(group)
+
+        if self.failed:
+            print(f"{RED}{len(self.failed)} of {self.total} commands failed{END}", file=sys.stderr)
+            return 1
+        print(f"{CYAN}{self.total} commands run{END}", file=sys.stderr)
+        return 0
+
+
+def run_batch(
+    token: str,
+    meistertask,
+    path: str,
+    jobs: int = 1,
+    keep_going: bool = False,
+    pick_best: bool = False,
+    assume_yes: bool = False,
+) -> int:
+    """Run a batch file, prompts answered by the policy of the options
+
+    Params:
+    token(str) API token
+    meistertask(Meistertask) facade shared by the commands
+    path(str) batch file, "-" for stdin
+    jobs(int) read-only commands run at once
+    keep_going(bool) run the next commands after a failed one
+    pick_best(bool) take the best match when a name matches several items
+    assume_yes(bool) answer yes to confirmations (project delete, archive)
+    """
+    from .prompt import answering
+
+    with answering("fail", pick_best=pick_best, assume_yes=assume_yes):
+        return Batch(token, meistertask, jobs, keep_going).run(path)
@@ -0,0 +1,410 @@
+#!/usr/bin/python3
+"""Interactive board of a project: `meistertask board <project>`.
+
+One column per section. A column loads the tasks of its section a page at
+a time, when the cursor gets near its last loaded task, and only the rows on
+screen are drawn: a board of thousands of tasks opens as fast as a small one.
+The first page of the sections next to the ones on screen loads in the
+background, moving to them does not wait.
+
+A move shows at once and is sent in the background, a move refused by the
+API is undone.
+
+    left right  h l   previous / next section
+    up down     k j   previous / next task
+    PgUp PgDn         page up / down
+    Home End    g G   first / last loaded task
+    < >         H L   move the task to the previous / next section
+    r                 retry the pages that failed to load
+    q                 quit, once the moves are sent
+"""
+
+import curses
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from .api import APITask
+from .api.base import PAGE_SIZE
+from .utils import RED, END
+
+# pages of sections loaded at once
+WORKERS = 4
+
+# a column loads its next page when the cursor is this close to its last task
+PREFETCH_ROWS = PAGE_SIZE // 2
+
+# narrowest column, fewer columns are shown on a narrow terminal
+COLUMN_WIDTH = 28
+
+# milliseconds waiting for a key before drawing again, pages loaded meanwhile show up
+REDRAW_DELAY = 100
+
+HELP = "h/l section  j/k task  H/L move  r retry  q quit"
+
+
+class Column:
+    """Tasks of a section, as many as loaded so far
+
+    Params:
+    section: section shown by the column
+    """
+
+    def __init__(self, section: Dict):
+        self.section = section
+        self.tasks: List[Dict] = []
+        # ids of the tasks loaded (or moved out), a task read twice is skipped
+        self.seen: Set[int] = set()
+        # tasks of the API listing read so far, the next page starts from there
+        self.fetched: int = 0
+        # tasks moved out of the column, they shift the listing back
+        self.removed: int = 0
+        self.wanted: int = 0
+        self.complete: bool = False
+        self.loading: bool = False
+        self.error: Optional[str] = None
+        # selected task, and first task on screen
+        self.row: int = 0
+        self.top: int = 0
+
+    def add(self, tasks: List[Dict], page: int, page_size: int, removed: int):
+        """Append a page of the listing
+
+        Params:
+        tasks: tasks of the page
+        page(int) number of the page
+        removed(int) tasks moved out of the column while the page loaded
+        """
+        for task in tasks:
+            if task["id"] not in self.seen:
+                self.seen.add(task["id"])
+                self.tasks.append(task)
+
+        # a move out of the column shifts the listing back by one: start the
+        # next page earlier, reading a task twice is harmless, missing one is not
+        self.fetched = max((page - 1) * page_size + len(tasks) - removed, 0)
+        self.complete = len(tasks) < page_size
+
+    def take(self, index: int) -> Dict:
+        """Remove a task moved to another column"""
+        task: Dict = self.tasks.pop(index)
+        self.fetched = max(self.fetched - 1, 0)
+        self.removed += 1
+        self.row = min(self.row, max(len(self.tasks) - 1, 0))
+        return task
+
+    def put(self, task: Dict, index: int = 0):
+        """Show a task moved to this column, before its page is loaded"""
+        self.seen.add(task["id"])
+        self.tasks.insert(min(index, len(self.tasks)), task)
+
+    def drop(self, id: int):
+        self.tasks = [task for task in self.tasks if task["id"] != id]
+        self.row = min(self.row, max(len(self.tasks) - 1, 0))
+
+    def title(self) -> str:
+        count: str = f"{len(self.tasks)}" if self.complete else f"{len(self.tasks)}+"
+        return f"{self.section['name']} ({count})"
+
+
+class Board:
+    """Columns of a project, loaded and changed in the background
+
+    Params:
+    api_task(APITask) client raising its errors, called by worker threads
+    sections: sections of the project, in board order
+    page_size(int) tasks loaded per request
+    """
+
+    def __init__(self, api_task: APITask, sections: List[Dict], page_size: int = PAGE_SIZE):
+        self.api_task = api_task
+        self.page_size = page_size
+        self.columns: List[Column] = [Column(section) for section in sections]
+        self.current: int = 0
+        # first column on screen
+        self.first: int = 0
+        self.status: str = ""
+        self.failed: List[str] = []
+        # held by the worker threads changing a column, and while drawing
+        self.lock = threading.Lock()
+        self.loader = ThreadPoolExecutor(max_workers=WORKERS)
+        # moves are sent one at a time, in order, and do not wait for page loads
+        self.mover = ThreadPoolExecutor(max_workers=1)
+        # ids of the tasks whose move is being sent
+        self.pending: Set[int] = set()
+        self.closed: bool = False
+
+    @property
+    def column(self) -> Column:
+        return self.columns[self.current]
+
+    def want(self, index: int, rows: int):
+        """Have a column hold at least `rows` tasks, loading pages in the background"""
+        if not 0 <= index < len(self.columns):
+            return
+        column: Column = self.columns[index]
+        with self.lock:
+            column.wanted = max(column.wanted, rows)
+            if column.loading or column.complete or column.error or self.closed:
+                return
+            if len(column.tasks) >= column.wanted:
+                return
+            column.loading = True
+        self.loader.submit(self.load, column)
+
+    def load(self, column: Column):
+        """Load pages of a column until it holds the tasks wanted (worker thread)"""
+        while True:
+            with self.lock:
+                if self.closed or column.complete or len(column.tasks) >= column.wanted:
+                    column.loading = False
+                    return
+                page: int = column.fetched // self.page_size + 1
+                removed: int = column.removed
+
+            try:
+                tasks: List[Dict] = self.api_task.task_fetch_page(
+                    column.section["id"], page, self.page_size
+                )
+            except Exception as e:
+                with self.lock:
+                    column.loading = False
+                    column.error = str(e) or type(e).__name__
+                return
+
+            with self.lock:
+                column.add(tasks, page, self.page_size, column.removed - removed)
+
+    def prefetch(self, rows: int, shown: int):
+        """Load the rows on screen and a little more, and the first page of the
+        sections next to the ones on screen"""
+        for index in range(self.first, self.first + shown):
+            if index < len(self.columns):
+                column: Column = self.columns[index]
+                self.want(index, column.top + rows + PREFETCH_ROWS)
+        self.want(self.first - 1, rows)
+        self.want(self.first + shown, rows)
+
+    def retry(self):
+        with self.lock:
+            for column in self.columns:
+                column.error = None
+        self.status = ""
+
+    def select(self, row: int):
+        column: Column = self.column
+        column.row = max(min(row, len(column.tasks) - 1), 0)
+
+    def move(self, step: int):
+        """Move the selected task `step` sections away: on screen at once, to
+        the API in the background"""
+        index: int = self.current + step
+        if not 0 <= index < len(self.columns):
+            return
+
+        with self.lock:
+            source, target = self.column, self.columns[index]
+            if not source.tasks:
+                return
+            task: Dict = source.tasks[source.row]
+            if task["id"] in self.pending:
+                self.status = f"Still moving: {task['name']}"
+                return
+
+            row: int = source.row
+            source.take(row)
+            previous: Tuple = (task["section_id"], task["section_name"])
+            task["section_id"] = target.section["id"]
+            task["section_name"] = target.section["name"]
+            target.put(task)
+            self.pending.add(task["id"])
+            self.status = f"Moving {task['name']} to {target.section['name']}"
+
+        self.mover.submit(self.send_move, task, source, target, row, previous)
+
+    def send_move(self, task: Dict, source: Column, target: Column, row: int, previous: Tuple):
+        """Send a move shown on screen, undo it when the API refuses it (worker thread)"""
+        try:
+            self.api_task.task_move(task["id"], target.section["id"])
+        except Exception as e:
+            with self.lock:
+                target.drop(task["id"])
+                task["section_id"], task["section_name"] = previous
+                source.put(task, row)
+                message: str = f"Failed to move {task['name']}: {str(e) or type(e).__name__}"
+                self.failed.append(message)
+                self.status = message
+        else:
+            self.status = f"Moved {task['name']} to {target.section['name']}"
+        finally:
+            with self.lock:
+                self.pending.discard(task["id"])
+
+    def press(self, key: int, rows: int) -> bool:
+        """Act on a key
+
+        Return:
+            False to quit
+        """
+        if key in (ord("q"), 27):
+            return False
+
+        column: Column = self.column
+        if key in (curses.KEY_LEFT, ord("h")):
+            self.current = max(self.current - 1, 0)
+        elif key in (curses.KEY_RIGHT, ord("l")):
+            self.current = min(self.current + 1, len(self.columns) - 1)
+        elif key in (curses.KEY_UP, ord("k")):
+            self.select(column.row - 1)
+        elif key in (curses.KEY_DOWN, ord("j")):
+            self.select(column.row + 1)
+        elif key == curses.KEY_PPAGE:
+            self.select(column.row - rows)
+        elif key == curses.KEY_NPAGE:
+            self.select(column.row + rows)
+        elif key in (curses.KEY_HOME, ord("g")):
+            self.select(0)
+        elif key in (curses.KEY_END, ord("G")):
+            self.select(len(column.tasks) - 1)
+        elif key in (ord("<"), ord("H")):
+            self.move(-1)
+        elif key in (ord(">"), ord("L")):
+            self.move(1)
+        elif key == ord("r"):
+            self.retry()
+        return True
+
+    def stop(self):
+        """Stop loading pages"""
+        with self.lock:
+            self.closed = True
+        self.loader.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        """Stop loading pages, wait for the moves to be sent"""
+        self.stop()
+        self.mover.shutdown(wait=True)
+
+
+def write(screen, y: int, x: int, text: str, width: int, attr: int = 0):
+    """Text cut to a width, curses refuses to write on the last cell of the screen"""
+    try:
+        screen.addnstr(y, x, text, max(width, 0), attr)
+    except curses.error:
+        pass
+
+
+def draw(screen, board: Board, project: Dict) -> int:
+    """Draw the columns on screen, only their visible rows
+
+    Return:
+        number of task rows of a column
+    """
+    height, width = screen.getmaxyx()
+    rows: int = max(height - 3, 1)
+    shown: int = max(1, min(len(board.columns), width // COLUMN_WIDTH))
+    # keep the current column on screen
+    if board.current < board.first:
+        board.first = board.current
+    elif board.current >= board.first + shown:
+        board.first = board.current - shown + 1
+    column_width: int = width // shown
+
+    screen.erase()
+    with board.lock:
+        write(screen, 0, 0, f" {project['name']}  {HELP}", width, curses.A_BOLD)
+
+        for index in range(board.first, min(board.first + shown, len(board.columns))):
+            column: Column = board.columns[index]
+            x: int = (index - board.first) * column_width
+            current: bool = index == board.current
+
+            # keep the selected task on screen
+            if column.row < column.top:
+                column.top = column.row
+            elif column.row >= column.top + rows:
+                column.top = column.row - rows + 1
+
+            title_attr: int = curses.A_BOLD | (curses.A_REVERSE if current else 0)
+            write(screen, 1, x, f" {column.title()} ".ljust(column_width - 1), column_width - 1, title_attr)
+
+            for offset in range(rows):
+                position: int = column.top + offset
+                y: int = offset + 2
+                if position < len(column.tasks):
+                    task: Dict = column.tasks[position]
+                    attr: int = curses.A_DIM if task["id"] in board.pending else 0
+                    if current and position == column.row:
+                        attr |= curses.A_REVERSE
+                    write(screen, y, x, f" {task['name']}".ljust(column_width - 1), column_width - 1, attr)
+                    continue
+
+                if column.error:
+                    write(screen, y, x, f" ! {column.error}", column_width - 1, curses.A_BOLD)
+                elif column.loading or not column.complete:
+                    write(screen, y, x, " loading...", column_width - 1, curses.A_DIM)
+                elif not column.tasks:
+                    write(screen, y, x, " (no task)", column_width - 1, curses.A_DIM)
+                break
+
+        status: str = board.status
+        if board.pending:
+            status = f"{status}  ({len(board.pending)} moves pending)"
+        write(screen, height - 1, 0, f" {status}", width - 1)
+
+    screen.refresh()
+    board.prefetch(rows, shown)
+    return rows
+
+
+def browse(screen, board: Board, project: Dict):
+    """Draw the board and act on keys until q"""
+    try:
+        curses.curs_set(0)
+    except curses.error:
+        pass
+    screen.timeout(REDRAW_DELAY)
+    screen.keypad(True)
+
+    while True:
+        rows: int = draw(screen, board, project)
+        key: int = screen.getch()
+        if key != -1 and not board.press(key, rows):
+            break
+
+    # moves being sent stay on screen until they are done, or undone
+    board.stop()
+    while board.pending:
+        draw(screen, board, project)
+        screen.getch()
+
+
+def run_board(meistertask, project: Dict) -> int:
+    """Browse the board of a project in the terminal
+
+    Params:
+    meistertask(Meistertask) facade holding the session and the cache
+    project: project to browse
+
+    Return:
+        exit code, 1 when a move failed
+    """
+    if not sys.stdin.isatty() or not sys.stdout.isatty():
+        print(f"{RED}The board needs a terminal{END}")
+        return 1
+
+    sections: List[Dict] = meistertask.section_fetch_all(project["id"])
+    # errors are shown on the board, they must not exit from a worker thread
+    api_task = APITask(meistertask.token, meistertask.session, meistertask.cache, raise_errors=True)
+    board: Board = Board(api_task, sections)
+    try:
+        curses.wrapper(browse, board, project)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        board.close()
+
+    for message in board.failed:
+        print(f"{RED}[-] {message}{END}")
+    return 1 if board.failed else 0
@@ -0,0 +1,306 @@
+"""Shell completion of commands, project, task and section names.
+
+Shells call `meistertask __complete <words...>` on every <TAB>. The answer
+comes from a small text index of names, so completing never waits for the
+API: when the index is stale, a detached `meistertask __refresh-names`
+updates it (through an incremental mirror sync) for the next <TAB>.
+
+Index lines: "p\t<project>", "s\t<project>\t<section>", "t\t<project>\t<task>"
+"""
+
+import os
+import sys
+import time
+from typing import Dict, Iterator, List, Tuple
+
+# seconds before the index is refreshed in the background
+INDEX_TTL = 600
+
+# a refresh holding its lock longer than this is considered dead
+LOCK_TIMEOUT = 120
+
+COMMANDS = ("project", "task", "sync", "search", "board", "flush", "export", "batch", "daemon", "completion")
+ALIASES = {"p": "project", "t": "task", "s": "search"}
+
+PROJECT_OPTIONS = {
+    "list": ("l", "ls"),
+    "create": ("c",),
+    "view": ("v", "show", "display"),
+    "update": ("u", "e", "edit"),
+    "delete": ("d", "rm", "del", "remove"),
+    "archive": (),
+}
+TASK_OPTIONS = {
+    "create": ("c",),
+    "list": ("l", "ls"),
+    "update": ("u", "e", "edit"),
+    "move": ("m", "mv"),
+    "import": ("i",),
+}
+
+# kind of each positional argument, None for free text
+PROJECT_POSITIONALS: Dict[str, Tuple] = {
+    "create": (None,),
+    "view": ("project",),
+    "update": ("project",),
+    "delete": ("project",),
+    "archive": ("project",),
+}
+TASK_POSITIONALS: Dict[str, Tuple] = {
+    "create": (None, "project"),
+    "list": ("project",),
+    "update": ("task", "project"),
+    # any number of tasks come first, this guesses a single one
+    "move": ("task", "section", "project"),
+    "import": ("file", "project"),
+}
+
+# options followed by a value, and the kind of that value
+VALUE_OPTIONS: Dict[str, str] = {
+    "-f": "format",
+    "--format": "format",
+    "--fields": None,
+    "-d": None,
+    "--description": None,
+    "-s": "section",
+    "--section": "section",
+    "-w": None,
+    "--workers": None,
+    "-n": None,
+    "--limit": None,
+    "--max-age": None,
+    "--from-section": "section",
+    "--older-than": None,
+}
+
+STATIC: Dict[str, Tuple] = {
+    "format": ("text", "json", "ndjson", "csv", "tsv"),
+    "shell": ("bash", "zsh", "fish"),
+}
+
+
+def canonical(name: str, options: Dict[str, Tuple]) -> str:
+    for option, aliases in options.items():
+        if name == option or name in aliases:
+            return option
+    return name
+
+
+def index_path(token: str) -> str:
+    import hashlib
+
+    # next to the API cache, without importing it (it loads the HTTP stack)
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    token_hash = hashlib.sha256(token.encode()).hexdigest()[:16]
+    return os.path.join(base, "meistertask", token_hash, "names")
+
+
+def takes_value(word: str, positionals: List[str]) -> bool:
+    if word == "-d":
+        # --description of create, but --done of task list
+        return len(positionals) > 1 and positionals[1] in ("create", "c")
+    if word == "-n":
+        # --limit of search, but --dry-run of task move
+        return bool(positionals) and positionals[0] in ("search", "s")
+    return word in VALUE_OPTIONS
+
+
+def expected_kind(words: List[str]):
+    """Kind of the word being completed, from the words before it
+
+    Returns a kind ("command", "project", "task", ...), or None when any
+    text goes, e.g. a new task name.
+    """
+    positionals: List[str] = []
+    value_of: str = ""
+    for word in words:
+        if value_of:
+            value_of = ""
+        elif takes_value(word, positionals):
+            value_of = word
+        elif not word.startswith("-"):
+            positionals.append(word)
+
+    if value_of:
+        return VALUE_OPTIONS[value_of]
+    if not positionals:
+        return "command"
+
+    command: str = ALIASES.get(positionals[0], positionals[0])
+    arguments: List[str] = positionals[2:]
+    if command == "completion":
+        return "shell" if len(positionals) == 1 else None
+    if command == "board":
+        return "project" if len(positionals) == 1 else None
+    if command == "project":
+        if len(positionals) == 1:
+            return "project option"
+        kinds = PROJECT_POSITIONALS.get(canonical(positionals[1], PROJECT_OPTIONS), ())
+    elif command == "task":
+        if len(positionals) == 1:
+            return "task option"
+        kinds = TASK_POSITIONALS.get(canonical(positionals[1], TASK_OPTIONS), ())
+    else:
+        return None
+
+    return kinds[len(arguments)] if len(arguments) < len(kinds) else None
+
+
+def read_index(path: str, kind: str) -> Iterator[str]:
+    """Names of a kind ("project", "section", "task") found in the index"""
+    marker: str = f"{kind[0]}\t"
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines: List[str] = f.read().splitlines()
+    except OSError:
+        return
+
+    for line in lines:
+        if line.startswith(marker):
+            yield line.rpartition("\t")[2]
+
+
+def candidates(kind: str, token: str) -> Iterator[str]:
+    if kind == "command":
+        return iter(COMMANDS)
+    if kind == "project option":
+        return iter(PROJECT_OPTIONS)
+    if kind == "task option":
+        return iter(TASK_OPTIONS)
+    if kind in STATIC:
+        return iter(STATIC[kind])
+    if kind not in ("project", "section", "task") or not token:
+        return iter(())
+
+    path: str = index_path(token)
+    try:
+        stale: bool = time.time() - os.stat(path).st_mtime > INDEX_TTL
+    except OSError:
+        stale = True
+    if stale:
+        refresh_in_background(path)
+
+    # sections and tasks of different projects share names
+    return iter(dict.fromkeys(read_index(path, kind)))
+
+
+def complete(words: List[str]) -> int:
+    """Print the completions of the last word, one per line
+
+    Params:
+    words: command line after `meistertask`, up to the word being completed
+    """
+    prefix: str = (words[-1] if words else "").lstrip("'\"").lower()
+    kind = expected_kind(words[:-1])
+    if kind is None:
+        return 0
+
+    token: str = os.environ.get("MEISTERTASK", "")
+    matches: List[str] = [c for c in candidates(kind, token) if c.lower().startswith(prefix)]
+    if matches:
+        sys.stdout.write("\n".join(matches) + "\n")
+    return 0
+
+
+def refresh_in_background(path: str):
+    """Start a detached process refreshing the index, unless one is running"""
+    lock: str = f"{path}.lock"
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    try:
+        os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+    except FileExistsError:
+        try:
+            if time.time() - os.stat(lock).st_mtime < LOCK_TIMEOUT:
+                return
+            os.utime(lock)
+        except OSError:
+            return
+
+    import subprocess
+
+    package: str = __name__.rpartition(".")[0]
+    root: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.Popen(
+        [sys.executable, "-m", package, "__refresh-names"],
+        cwd=root,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def refresh(token: str) -> int:
+    """Sync the local mirror, then rewrite the index from it"""
+    from .meistertask import Meistertask
+    from .mirror import Mirror
+
+    try:
+        mirror: Mirror = Mirror(token)
+        mirror.sync(Meistertask(token, refresh=True), max_age=INDEX_TTL)
+        write_index(token, mirror)
+    finally:
+        try:
+            os.unlink(f"{index_path(token)}.lock")
+        except OSError:
+            pass
+    return 0
+
+
+def write_index(token: str, mirror):
+    """Write the names of the mirror to the index, atomically"""
+    path: str = index_path(token)
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+
+    lines: List[str] = []
+    for kind, project, name in mirror.names():
+        # a tab or a newline in a name would break the line format
+        fields = [" ".join(value.split()) for value in (project, name) if value is not None]
+        lines.append("\t".join([kind[0], *fields]))
+
+    tmp: str = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp, path)
+
+
+BASH_SCRIPT = r"""
+_meistertask() {
+    local IFS=$'\n' candidate
+    COMPREPLY=()
+    for candidate in $(meistertask __complete "${COMP_WORDS[@]:1:COMP_CWORD}" 2>/dev/null); do
+        COMPREPLY+=("$(printf '%q' "$candidate")")
+    done
+}
+complete -o default -F _meistertask meistertask
+"""
+
+ZSH_SCRIPT = r"""
+#compdef meistertask
+_meistertask() {
+    local -a candidates
+    candidates=("${(@f)$(meistertask __complete "${(@)words[2,CURRENT]}" 2>/dev/null)}")
+    if [[ -n "${candidates[1]}" ]]; then
+        compadd -a candidates
+    else
+        _files
+    fi
+}
+compdef _meistertask meistertask
+"""
+
+FISH_SCRIPT = r"""
+function __meistertask_complete
+    set -l words (commandline -opc)
+    set -e words[1]
+    set -l candidates (meistertask __complete $words (commandline -ct) 2>/dev/null)
+    if test (count $candidates) -gt 0
+        printf '%s\n' $candidates
+    else
+        __fish_complete_path (commandline -ct)
+    end
+end
+complete -c meistertask -f -a '(__meistertask_complete)'
+"""
+
+SCRIPTS: Dict[str, str] = {"bash": BASH_SCRIPT, "zsh": ZSH_SCRIPT, "fish": FISH_SCRIPT}
@@ -0,0 +1,220 @@
+"""Resident process answering cli commands over a Unix socket.
+
+`meistertask daemon` keeps one Meistertask facade alive: its keep-alive
+connections stay open and cached responses stay decoded in memory. The cli
+forwards a parsed command to it and prints the output it sends back, so a
+command skips the interpreter start up, the HTTP stack import and the TLS
+handshakes. Commands needing a prompt are handed back to the cli.
+
+Protocol: one json line each way.
+    request:  {"token_hash": ..., "args": {...}} or {"token_hash": ..., "stop": true}
+    response: {"status": "ok" | "interactive" | "denied", "output", "errors", "exit_code"}
+"""
+
+import hashlib
+import json
+import os
+import socket
+import sys
+import tempfile
+from typing import Dict, Optional
+
+from .utils import SUCCESS, RED, YELLOW, END
+
+# waiting for a daemon that does not answer must not slow down the cli
+CONNECT_TIMEOUT = 0.2
+
+# seconds a forwarded command may run before the cli stops waiting for it
+COMMAND_TIMEOUT = 600
+
+# the daemon exits after this many seconds without a command
+IDLE_TIMEOUT = 3600
+
+
+def token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def runtime_dir() -> str:
+    """Private directory of the socket, following the XDG base directory spec"""
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    if base:
+        return base
+
+    directory = os.path.join(tempfile.gettempdir(), f"meistertask-{os.getuid()}")
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if os.stat(directory).st_uid != os.getuid():
+        print(f"{RED}{directory} belongs to another user{END}")
+        exit(1)
+    return directory
+
+
+def socket_path(token: str) -> str:
+    return os.path.join(runtime_dir(), f"meistertask-{token_hash(token)}.sock")
+
+
+def _exchange(path: str, request: Dict) -> Optional[Dict]:
+    """Send a request to the daemon listening on path
+
+    Returns None when no daemon accepts the connection, raises OSError or
+    ValueError when it fails after the request is sent.
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.settimeout(CONNECT_TIMEOUT)
+        try:
+            client.connect(path)
+        except OSError:
+            return None
+
+        # a daemon stuck on a command must not hang the cli forever
+        client.settimeout(COMMAND_TIMEOUT)
+        client.sendall(json.dumps(request).encode() + b"\n")
+        with client.makefile("rb") as f:
+            return json.loads(f.readline())
+    finally:
+        client.close()
+
+
+def forward(token: str, args) -> Optional[int]:
+    """Run a parsed command in the daemon
+
+    Returns the exit code of the command, or None when it must run in this
+    process: no daemon is running, or the command needs a prompt.
+    """
+    path: str = socket_path(token)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        response = _exchange(path, {"token_hash": token_hash(token), "args": vars(args)})
+    except socket.timeout:
+        print(f"{RED}The daemon did not answer within {COMMAND_TIMEOUT} seconds{END}")
+        return 1
+    except (OSError, ValueError):
+        # the command may have run already, do not run it twice
+        print(f"{RED}Lost the connection to the daemon{END}")
+        return 1
+
+    if response is None or response["status"] != "ok":
+        return None
+
+    sys.stdout.write(response["output"])
+    sys.stderr.write(response["errors"])
+    sys.stdout.flush()
+    return response["exit_code"]
+
+
+def daemon(token: str, stop: bool = False) -> int:
+    """Serve commands until stopped, or idle for IDLE_TIMEOUT seconds
+
+    Params:
+    token(str) API token, the daemon only answers commands using it
+    stop(bool) stop the running daemon instead
+    """
+    path: str = socket_path(token)
+    try:
+        response = _exchange(path, {"token_hash": token_hash(token), "stop": True} if stop else {})
+    except (OSError, ValueError):
+        response = None
+
+    if stop:
+        if response is None:
+            print(f"{YELLOW}No daemon is running{END}")
+            return 1
+        print(f"[+] {SUCCESS}Daemon stopped{END}")
+        return 0
+
+    if response is not None:
+        print(f"{YELLOW}A daemon is already running on {path}{END}")
+        return 1
+
+    # left behind by a daemon that did not exit cleanly
+    if os.path.exists(path):
+        os.unlink(path)
+
+    import argparse
+    import socketserver
+
+    from .__main__ import refresh_needed
+    from .meistertask import Meistertask
+
+    meistertask: Meistertask = Meistertask(token, memory=True)
+    expected: str = token_hash(token)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            try:
+                request: Dict = json.loads(self.rfile.readline())
+            except ValueError:
+                return
+
+            if request.get("token_hash") != expected:
+                response: Dict = {"status": "denied"}
+            elif request.get("stop"):
+                self.server.stopped = True
+                response = {"status": "ok"}
+            elif "args" in request:
+                args = argparse.Namespace(**request["args"])
+                # keep warm data fresh for commands feeding the mirror
+                meistertask.cache.refresh = refresh_needed(args)
+                response = execute(args, token, meistertask)
+            else:
+                response = {"status": "ok"}
+
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+    # the socket is readable and writable by its owner only
+    umask: int = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(path, Handler)
+    finally:
+        os.umask(umask)
+
+    server.stopped = False
+    server.timeout = IDLE_TIMEOUT
+    server.handle_timeout = lambda: setattr(server, "stopped", True)
+
+    print(f"[+] {SUCCESS}Daemon listening on {path}{END}")
+    try:
+        while not server.stopped:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(path)
+    return 0
+
+
+def execute(args, token: str, meistertask) -> Dict:
+    """Run a command, capturing its output and exit code"""
+    import io
+    import traceback
+    from contextlib import redirect_stderr, redirect_stdout
+
+    from .__main__ import run
+    from .prompt import NoAnswer, answering
+
+    output, errors = io.StringIO(), io.StringIO()
+    exit_code: int = 0
+
+    try:
+        # the daemon has no terminal: a command asking a question is handed back
+        with answering("fail"), redirect_stdout(output), redirect_stderr(errors):
+            # local commands read the mirror, not the API
+            run(args, token, None if getattr(args, "local", False) else meistertask)
+    except NoAnswer:
+        return {"status": "interactive"}
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else int(e.code is not None)
+    except Exception:
+        errors.write(traceback.format_exc())
+        exit_code = 1
+
+    return {
+        "status": "ok",
+        "output": output.getvalue(),
+        "errors": errors.getvalue(),
+        "exit_code": exit_code,
+    }
@@ -0,0 +1,183 @@
+#!/usr/bin/python3
+"""Export of every project (active and archived) into a directory.
+
+    manifest.json           projects exported so far, see Manifest
+    projects.ndjson.gz      every project
+    <project id>.ndjson.gz  sections then tasks of a project, one per line
+
+Records hold every field returned by the API, plus "kind" (section, task).
+Many projects are exported at once, each one streamed from its listing pages
+to its gzip file: memory does not grow with the size of the account.
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Tuple
+
+from .api import AsyncClients
+from .utils import YELLOW, END
+
+# gzip level of the archives: 6 compresses nearly as well as 9, much faster
+COMPRESS_LEVEL = 6
+
+MANIFEST = "manifest.json"
+
+
+def now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def write_records(path: str, records: Iterable[Dict]) -> int:
+    """Write records to a gzip NDJSON file, on disk when this returns
+
+    Params:
+    path(str) file to write, replaced once complete
+    records: records to write, read one at a time
+
+    Return:
+        number of records written
+    """
+    count: int = 0
+    tmp: str = f"{path}.part"
+    try:
+        with open(tmp, "wb") as raw:
+            with gzip.open(raw, "wt", encoding="utf-8", compresslevel=COMPRESS_LEVEL) as f:
+                for record in records:
+                    f.write(json.dumps(record))
+                    f.write("\n")
+                    count += 1
+            raw.flush()
+            os.fsync(raw.fileno())
+    except BaseException:
+        os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+    return count
+
+
+class Manifest:
+    """Projects already exported to a directory, rewritten after each project
+
+    {"started_at", "finished_at", "projects": {id: {"name", "status", "file",
+    "sections", "tasks", "exported_at"}}}
+
+    An export without finished_at was interrupted: running it again skips
+    the projects it lists.
+
+    Params:
+    directory(str) export directory
+    restart(bool) forget an interrupted export, export every project again
+    """
+
+    def __init__(self, directory: str, restart: bool = False):
+        self.path: str = os.path.join(directory, MANIFEST)
+        self.lock = threading.Lock()
+        self.data: Dict = {}
+
+        if not restart and os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self.data = json.load(f)
+        if not self.data or self.data.get("finished_at"):
+            # a finished export is done again from scratch
+            self.data = {"started_at": now(), "finished_at": None, "projects": {}}
+
+    def done(self, project_id: int) -> bool:
+        entry: Dict = self.data["projects"].get(str(project_id))
+        directory: str = os.path.dirname(self.path)
+        return entry is not None and os.path.exists(os.path.join(directory, entry["file"]))
+
+    def mark(self, project: Dict, file: str, sections: int, tasks: int):
+        with self.lock:
+            self.data["projects"][str(project["id"])] = {
+                "name": project["name"],
+                "status": project.get("status"),
+                "file": file,
+                "sections": sections,
+                "tasks": tasks,
+                "exported_at": now(),
+            }
+            self.save()
+
+    def finish(self):
+        with self.lock:
+            self.data["finished_at"] = now()
+            self.save()
+
+    def save(self):
+        tmp: str = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+
+def export_project(api_section, api_task, directory: str, project_id: int) -> Tuple[int, int]:
+    """Write sections and tasks of a project to <project id>.ndjson.gz
+
+    Return:
+        number of sections and number of tasks written
+    """
+    sections: List[Dict] = api_section.section_fetch_all(project_id, raw=True)
+    counts: Dict[str, int] = {"section": len(sections), "task": 0}
+
+    def records() -> Iterable[Dict]:
+        for section in sections:
+            yield {"kind": "section", **section}
+        # the next page downloads while this one is compressed
+        for task in api_task.task_iter_all(project_id, prefetch=True, raw=True):
+            counts["task"] += 1
+            yield {"kind": "task", **task}
+
+    write_records(os.path.join(directory, f"{project_id}.ndjson.gz"), records())
+    return counts["section"], counts["task"]
+
+
+def export_account(
+    meistertask, directory: str, restart: bool = False
+) -> Tuple[int, int, List[Tuple[str, str]]]:
+    """Export every project, many projects at once, resuming an interrupted export
+
+    Params:
+    meistertask(Meistertask) facade holding the api clients
+    directory(str) export directory, created if needed
+    restart(bool) export every project again, even after an interruption
+
+    Return:
+        number of exported projects, number of skipped projects (already
+        exported) and failed projects with their error
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest = Manifest(directory, restart)
+
+    projects: List[Dict] = list(meistertask.api_project.project_iter_all("all", raw=True))
+    write_records(os.path.join(directory, "projects.ndjson.gz"), projects)
+
+    pending: List[Dict] = [p for p in projects if not manifest.done(p["id"])]
+    failed: List[Tuple[str, str]] = []
+
+    async def export(clients: AsyncClients, project: Dict) -> bool:
+        try:
+            sections, tasks = await clients.call(
+                export_project, clients.api_section, clients.api_task, directory, project["id"]
+            )
+        except Exception as e:
+            failed.append((project["name"], str(e) or type(e).__name__))
+            return False
+
+        manifest.mark(project, f"{project['id']}.ndjson.gz", sections, tasks)
+        print(f"{YELLOW}[*] {project['name']}: {sections} sections, {tasks} tasks{END}")
+        return True
+
+    async def run(clients: AsyncClients):
+        return await asyncio.gather(*(export(clients, p) for p in pending))
+
+    results: List[bool] = meistertask.fan_out(run, raise_errors=True)
+    if not failed:
+        manifest.finish()
+
+    return sum(results), len(projects) - len(pending), failed
@@ -0,0 +1,200 @@
+#!/usr/bin/python3
+
+import json
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+from .utils import BlockWriter, render_project, render_search_result, render_task
+
+FORMATS = ("text", "json", "ndjson", "csv", "tsv")
+
+# columns of csv and tsv output when no --fields is given
+DEFAULT_FIELDS: Dict[str, List[str]] = {
+    "project": ["id", "name", "notes", "status", "created_at", "updated_at"],
+    "task": [
+        "id",
+        "name",
+        "notes",
+        "section_id",
+        "section_name",
+        "project_id",
+        "status",
+        "created_at",
+        "updated_at",
+    ],
+    "result": ["id", "name", "section_name", "project_id", "project_name", "score"],
+}
+
+
+def parse_fields(fields: str) -> List[str]:
+    """--fields id,name,section_name -> ["id", "name", "section_name"]"""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()]
+
+
+class RecordWriter(ABC):
+    """Write records (projects, tasks ...) as they are fetched
+
+    Params:
+    kind(str) project, task or result
+    fields(list) keep only these fields, in this order
+    stream: output, defaults to stdout
+    """
+
+    def __init__(self, kind: str, fields: List[str] = None, stream=None):
+        self.kind = kind
+        self.fields = fields
+        self.stream = stream if stream is not None else sys.stdout
+
+    def project(self, record: Dict) -> Dict:
+        if self.fields is None:
+            # models (src/models.py) are dict-like, not dicts
+            return dict(record)
+        return {field: record.get(field) for field in self.fields}
+
+    @abstractmethod
+    def write(self, record: Dict):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class TextWriter(RecordWriter):
+    """Colored text made for people, the default output"""
+
+    def __init__(self, kind: str, fields: List[str] = None, stream=None):
+        if fields:
+            # the layout of the text is fixed, fields are for machine formats
+            raise ValueError("--fields needs --format json, ndjson, csv or tsv")
+        super().__init__(kind, fields, stream)
+        self.writer = BlockWriter(self.stream)
+
+    def write(self, record: Dict):
+        if self.kind == "project":
+            self.writer.write(render_project(record))
+        elif self.kind == "task":
+            self.writer.write(render_task(record))
+        else:
+            self.writer.write(render_search_result(record, record.get("project_name")))
+
+    def close(self):
+        self.writer.flush()
+
+
+class JsonWriter(RecordWriter):
+    """One json array, or a single object for `single` records (view commands)"""
+
+    def __init__(self, kind: str, fields: List[str] = None, stream=None, single: bool = False):
+        super().__init__(kind, fields, stream)
+        self.single = single
+        self.count = 0
+
+    def write(self, record: Dict):
+        if self.single:
+            self.stream.write(json.dumps(self.project(record)))
+        else:
+            self.stream.write(",\n" if self.count else "[\n")
+            self.stream.write(json.dumps(self.project(record)))
+        self.count += 1
+
+    def close(self):
+        if not self.single:
+            self.stream.write("\n]\n" if self.count else "[]\n")
+        elif self.count:
+            self.stream.write("\n")
+
+
+class NdjsonWriter(RecordWriter):
+    """One json object per line"""
+
+    def write(self, record: Dict):
+        self.stream.write(json.dumps(self.project(record)) + "\n")
+
+
+class CsvWriter(RecordWriter):
+    """Comma (or tab) separated values, with a header line"""
+
+    def __init__(self, kind: str, fields: List[str] = None, stream=None, delimiter: str = ","):
+        import csv
+
+        super().__init__(kind, fields or DEFAULT_FIELDS.get(kind), stream)
+        self.writer = csv.writer(self.stream, delimiter=delimiter, lineterminator="\n")
+        self.writer.writerow(self.fields)
+
+    def write(self, record: Dict):
+        self.writer.writerow([record.get(field, "") for field in self.fields])
+
+
+class TracedWriter(RecordWriter):
+    """Time spent writing the records of another writer (--stats, --trace)"""
+
+    def __init__(self, writer: RecordWriter, format: str):
+        from . import tracing
+
+        super().__init__(writer.kind, writer.fields, writer.stream)
+        self.writer = writer
+        self.name = f"{format} {writer.kind}"
+        self.tracer = tracing.TRACER
+        self.started: float = time.perf_counter()
+        self.busy: float = 0.0
+        self.count: int = 0
+
+    def write(self, record: Dict):
+        start: float = time.perf_counter()
+        self.writer.write(record)
+        self.busy += time.perf_counter() - start
+        self.count += 1
+
+    def close(self):
+        start: float = time.perf_counter()
+        self.writer.close()
+        end: float = time.perf_counter()
+
+        # one event from the first record to the last, records arrive with their page
+        self.tracer.record(
+            self.name,
+            "render",
+            self.started,
+            end - self.started,
+            {"records": self.count},
+            busy=self.busy + end - start,
+        )
+
+
+def record_writer(format: str, kind: str, fields: str = None, single: bool = False) -> RecordWriter:
+    """Writer of records for an output format
+
+    Params:
+    format(str) one of FORMATS
+    kind(str) project, task or result
+    fields(str) comma separated fields to keep
+    single(bool) a single record is written (view commands)
+    """
+    from . import tracing
+
+    writer: RecordWriter = new_writer(format, kind, parse_fields(fields), single)
+    if tracing.TRACER is not None:
+        return TracedWriter(writer, format)
+    return writer
+
+
+def new_writer(format: str, kind: str, fields: List[str], single: bool) -> RecordWriter:
+    if format == "json":
+        return JsonWriter(kind, fields, single=single)
+    if format == "ndjson":
+        return NdjsonWriter(kind, fields)
+    if format == "csv":
+        return CsvWriter(kind, fields)
+    if format == "tsv":
+        return CsvWriter(kind, fields, delimiter="\t")
+    return TextWriter(kind, fields)
@@ -0,0 +1,162 @@
+#!/usr/bin/python3
+
+import asyncio
+import csv
+import json
+import os
+from typing import Dict, Iterator, List, Set, Tuple
+
+from .api import AsyncClients
+from .names import normalize
+from .utils import RED, YELLOW, END
+
+# rows sent to the worker pool at once
+BATCH_SIZE = 64
+
+
+def parse_row(text: str):
+    """Fields of a JSONL line, or the error to report for its row"""
+    try:
+        row = json.loads(text)
+    except ValueError as e:
+        return ValueError(f"Invalid json: {e}")
+    if not isinstance(row, dict):
+        return ValueError("Row is not a json object")
+    return row
+
+
+def read_rows(path: str) -> Iterator[Tuple[int, Dict]]:
+    """Stream rows of a CSV, JSONL or JSON file with their row number.
+
+    CSV files have a header line, JSONL files one json object per line, JSON
+    files an array of objects (read at once). A row that cannot be parsed is
+    yielded as the ValueError to report, the rows after it are still read.
+    Known fields: name, description (or notes), section
+    """
+    extension: str = os.path.splitext(path)[1].lower()
+
+    with open(path, newline="", encoding="utf-8") as f:
+        if extension in (".jsonl", ".ndjson"):
+            for number, line in enumerate(f, start=1):
+                if line.strip():
+                    yield number, parse_row(line)
+        elif extension == ".json":
+            try:
+                rows = json.load(f)
+            except ValueError as e:
+                print(f"{RED}Invalid json file {path}: {e}{END}")
+                exit(1)
+            if not isinstance(rows, list):
+                print(f"{RED}A json file holds an array of tasks, use .jsonl for one task per line{END}")
+                exit(1)
+            for number, row in enumerate(rows, start=1):
+                yield number, row if isinstance(row, dict) else ValueError("Row is not a json object")
+        else:
+            delimiter = "\t" if extension == ".tsv" else ","
+            for number, row in enumerate(csv.DictReader(f, delimiter=delimiter), start=1):
+                yield number, row
+
+
+class Checkpoint:
+    """Row numbers already imported, appended to a file next to the import file"""
+
+    def __init__(self, path: str):
+        self.path = f"{path}.checkpoint"
+        self.done: Set[int] = set()
+
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.done = {int(line) for line in f if line.strip()}
+
+        self.file = open(self.path, "a")
+
+    def mark(self, number: int):
+        self.done.add(number)
+        self.file.write(f"{number}\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def resolve_section(sections: Dict[str, int], row: Dict, default: int) -> int:
+    """Section id of a row, from the section map built once per import"""
+    name: str = (row.get("section") or "").strip()
+    if not name:
+        return default
+    if normalize(name) not in sections:
+        raise ValueError(f"Unknown section: {name}")
+    return sections[normalize(name)]
+
+
+def import_tasks(
+    meistertask, path: str, project_id: int, section_name: str = None
+) -> Tuple[int, int, List[Tuple[int, str]]]:
+    """Create a task for every row of a file, resuming an interrupted import
+
+    Params:
+    meistertask(Meistertask) facade holding the api clients
+    path(str) CSV, JSONL or JSON file
+    project_id(int) project of the new tasks
+    section_name(str) section of rows without one (default: first section)
+
+    Return:
+        number of created tasks, number of skipped rows (already imported)
+        and failed rows with their error
+    """
+    section_list: List[Dict] = meistertask.section_fetch_all(project_id)
+    sections: Dict[str, int] = {normalize(s["name"]): s["id"] for s in section_list}
+    default: int = section_list[0]["id"]
+    if section_name:
+        default = resolve_section(sections, {"section": section_name}, default)
+
+    checkpoint = Checkpoint(path)
+    created, skipped = 0, 0
+    failed: List[Tuple[int, str]] = []
+
+    async def create(clients: AsyncClients, number: int, row: Dict):
+        try:
+            if isinstance(row, ValueError):
+                raise row
+            name: str = (row.get("name") or "").strip()
+            if not name:
+                raise ValueError("Task name is missing")
+            description: str = row.get("description") or row.get("notes") or ""
+            section_id: int = resolve_section(sections, row, default)
+
+            await clients.task.task_create(section_id, name, description)
+        except Exception as e:
+            failed.append((number, str(e)))
+        else:
+            checkpoint.mark(number)
+            return True
+
+    async def run(clients: AsyncClients):
+        nonlocal created, skipped
+        batch: List[Tuple[int, Dict]] = []
+
+        for number, row in read_rows(path):
+            if number in checkpoint.done:
+                skipped += 1
+                continue
+
+            batch.append((number, row))
+            if len(batch) >= BATCH_SIZE:
+                results = await asyncio.gather(*(create(clients, *r) for r in batch))
+                created += sum(1 for r in results if r)
+                print(f"{YELLOW}[*] {created} tasks imported{END}")
+                batch = []
+
+        results = await asyncio.gather(*(create(clients, *r) for r in batch))
+        created += sum(1 for r in results if r)
+
+    try:
+        meistertask.fan_out(run, raise_errors=True)
+    finally:
+        checkpoint.close()
+
+    # the whole file is imported, the checkpoint is no longer needed
+    if not failed:
+        os.remove(checkpoint.path)
+
+    return created, skipped, failed
@@ -0,0 +1,196 @@
+#!/usr/bin/python3
+"""Journal of task changes made while the API was unreachable (or --queue).
+
+Each change is a json line appended (and fsynced) to
+$XDG_DATA_HOME/meistertask/<token hash>.journal, `meistertask flush` sends
+them later. Entries:
+
+    {"id", "op": "create", "project_id", "section_id", "fields": {name, notes}, "label"}
+    {"id", "op": "update", "project_id", "task_id", "fields": {...}, "base", "label"}
+    {"id", "op": "attempt", "entry"}
+
+A move is an update of section_id. `base` is the updated_at of the task
+when the change was made: a task changed by someone else since then is a
+conflict, left in the journal. An attempt is written before a create is
+sent: a flush stopped before removing the create may have made the task,
+the next one looks for it before creating it again.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import sys
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Set
+
+from .utils import END, YELLOW
+
+
+def journal_path(token: str) -> str:
+    # next to the local mirror, without importing it (it loads sqlite3)
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(
+        os.path.expanduser("~"), ".local", "share"
+    )
+    token_hash = hashlib.sha256(token.encode()).hexdigest()[:16]
+    return os.path.join(base, "meistertask", f"{token_hash}.journal")
+
+
+def create_entry(project_id: int, section_id: int, name: str, notes: str = "") -> Dict:
+    return {
+        "id": uuid.uuid4().hex,
+        "op": "create",
+        "project_id": project_id,
+        "section_id": section_id,
+        "fields": {"name": name, "notes": notes},
+        "label": name,
+    }
+
+
+def update_entry(task: Dict, fields: Dict, label: str = None) -> Dict:
+    """Change of the fields of a task
+
+    Params:
+    task: the task as it was seen when the change was made
+    fields: new values, e.g. {"name": ...} or {"section_id": ...}
+    label(str) description of the change, for listings
+    """
+    return {
+        "id": uuid.uuid4().hex,
+        "op": "update",
+        "project_id": task["project_id"],
+        "task_id": task["id"],
+        "fields": fields,
+        "base": task.get("updated_at"),
+        "label": label or task["name"],
+    }
+
+
+def attempt_entry(entry: Dict) -> Dict:
+    """Mark of a create about to be sent"""
+    return {"id": uuid.uuid4().hex, "op": "attempt", "entry": entry["id"]}
+
+
+def coalesce(entries: Iterable[Dict]) -> List[Dict]:
+    """Merge the updates of each task into one, in journal order
+
+    The merged update keeps the base of the first change, the fields of the
+    last one, and the ids of every entry it replaces in "ids". A create sent
+    before is "attempted", its attempts are in its "ids".
+    """
+    changes: List[Dict] = []
+    updates: Dict[int, Dict] = {}
+    attempts: Dict[str, List[str]] = {}
+    for entry in entries:
+        if entry["op"] == "attempt":
+            attempts.setdefault(entry["entry"], []).append(entry["id"])
+            continue
+        if entry["op"] != "update":
+            changes.append({**entry, "ids": [entry["id"]]})
+            continue
+
+        update = updates.get(entry["task_id"])
+        if update is None:
+            update = updates[entry["task_id"]] = {**entry, "fields": {}, "ids": [], "labels": []}
+            changes.append(update)
+        update["fields"].update(entry["fields"])
+        update["ids"].append(entry["id"])
+        update["labels"].append(entry["label"])
+
+    for update in updates.values():
+        update["label"] = "; ".join(dict.fromkeys(update.pop("labels")))
+    for change in changes:
+        if change["op"] == "create" and change["id"] in attempts:
+            change["attempted"] = True
+            change["ids"] += attempts[change["id"]]
+    return changes
+
+
+class Journal:
+    """Durable list of pending changes
+
+    Params:
+    token(str) API token, each token has its own journal
+    path(str) journal file, see journal_path
+    """
+
+    def __init__(self, token: str, path: str = None):
+        self.path: str = path or journal_path(token)
+
+    @contextmanager
+    def _locked(self, name: str = "lock", blocking: bool = True):
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        fd = os.open(f"{self.path}.{name}", os.O_CREAT | os.O_RDWR, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            yield
+        finally:
+            os.close(fd)
+
+    def flushing(self):
+        """Lock held by a flush, raises BlockingIOError while another one runs"""
+        return self._locked("flush", blocking=False)
+
+    def append(self, *entries: Dict):
+        """Write entries, on disk when this returns"""
+        data: bytes = "".join(json.dumps(entry) + "\n" for entry in entries).encode()
+        with self._locked():
+            fd = os.open(self.path, os.O_CREAT | os.O_WRONLY | os.O_APPEND, 0o600)
+            try:
+                os.write(fd, data)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def _lines(self) -> List[str]:
+        """Lines of the journal, without the last one if a crash cut it while appending"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data: str = f.read()
+        except FileNotFoundError:
+            return []
+
+        lines: List[str] = data.splitlines()
+        if lines and not data.endswith("\n"):
+            lines.pop()
+        return lines
+
+    def read(self) -> List[Dict]:
+        entries: List[Dict] = []
+        for number, line in enumerate(self._lines(), 1):
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                print(f"{YELLOW}Skipped line {number} of {self.path}: not a change{END}", file=sys.stderr)
+        return entries
+
+    def remove(self, ids: Set[str]):
+        """Drop sent entries, keeping the ones appended meanwhile (and lines
+        that cannot be read, for whoever repairs the journal)"""
+        with self._locked():
+            lines: List[str] = []
+            for line in self._lines():
+                try:
+                    if json.loads(line)["id"] in ids:
+                        continue
+                except (ValueError, KeyError, TypeError):
+                    pass
+                lines.append(line)
+
+            if not lines:
+                try:
+                    os.unlink(self.path)
+                except FileNotFoundError:
+                    pass
+                return
+
+            tmp: str = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write("".join(line + "\n" for line in lines))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+
+    def __len__(self) -> int:
+        return len(self.read())
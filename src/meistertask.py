@@ -1,27 +1,113 @@
 #!/usr/bin/python3
 
-from typing import Dict, List
-from .api import *
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Set, Tuple
+import requests
+
 from .api import *
+from .api.base import PAGE_SIZE
+from .api.utils import handle_error
+from .models import Task
 
 from .utils import select_one_project, select_one_section, select_one_task
-from .utils import  SUCCESS, RED, END
+from .utils import  SUCCESS, RED, YELLOW, END
 from .utils import (
     display_project,
     display_task,
-    match_names,
-    check_errors
+    check_errors,
+    filter_sections_by_name,
+    filter_tasks_by_section,
+    parse_age,
+    age_of,
 )
+from .names import NameIndex, normalize, reference_id
+from .prompt import confirm, output
+from .journal import Journal, attempt_entry, coalesce, create_entry, update_entry
 
 
 class Meistertask:
     """Core logic of app"""
 
-    def __init__(self, token: str):
+    def __init__(
+        self,
+        token: str,
+        pool_size: int = 10,
+        keep_alive: bool = True,
+        cache: bool = True,
+        refresh: bool = False,
+        concurrency: int = None,
+        raise_errors: bool = False,
+        memory: bool = False,
+        queue: bool = False,
+        remember: bool = False,
+    ):
         self.token = token
-        self.api_project = APIProject(self.token)
-        self.api_task = APITask(self.token)
-        self.api_section = APISection(self.token)
+        self.concurrency = concurrency or DEFAULT_CONCURRENCY
+        # write task changes to the journal instead of sending them
+        self.queue = queue
+        self.journal = Journal(token)
+
+        # one pool of keep-alive connections shared by all api clients
+        self.session = Session(pool_size=max(pool_size, self.concurrency), keep_alive=keep_alive)
+        self.cache = Cache(self.token, refresh=refresh, memory=memory) if cache else None
+        self.api_project = APIProject(self.token, self.session, self.cache, raise_errors)
+        self.api_task = APITask(self.token, self.session, self.cache, raise_errors)
+        self.api_section = APISection(self.token, self.session, self.cache, raise_errors)
+
+        # projects resolved by name, kept for the life of the facade (batch)
+        self.resolved: Dict[str, Dict] = {} if remember else None
+
+    def fan_out(self, fanout: Callable[["AsyncClients"], Awaitable], raise_errors: bool = False):
+        """Run concurrent API calls, at most `concurrency` at once
+
+        Params:
+        fanout: coroutine function receiving the async clients
+        raise_errors: raise API errors to the fan-out instead of exiting
+        """
+        api_project, api_task, api_section = self.api_project, self.api_task, self.api_section
+        if raise_errors:
+            api_project = self._raising(APIProject)
+            api_task = self._raising(APITask)
+            api_section = self._raising(APISection)
+
+        from .api import aio
+
+        clients = aio.AsyncClients(api_project, api_task, api_section, self.concurrency)
+        return aio.run(fanout, clients)
+
+    def _raising(self, client_class):
+        """Client raising API errors to the caller instead of exiting"""
+        return client_class(self.token, self.session, self.cache, raise_errors=True)
+
+    def _send_or_queue(self, entry: Dict, send: Callable[[], Dict]) -> Optional[Dict]:
+        """Send a task change, or write it to the journal (--queue, or API unreachable)
+
+        Return:
+            the response, None when the change was queued
+        """
+        if not self.queue and not self.session.offline:
+            try:
+                return send()
+            except requests.exceptions.ConnectionError:
+                pass
+            except requests.exceptions.Timeout:
+                print(f"{RED}No answer from the API, check whether the change was made{END}")
+                exit(1)
+            except Exception as e:
+                handle_error(e)
+
+        self._queue(entry)
+        return None
+
+    def _queue(self, *entries: Dict):
+        self.journal.append(*entries)
+        for entry in entries:
+            print(f"{YELLOW}[*] Queued: {entry['label']}{END}")
+        print(f"{YELLOW}{len(self.journal)} changes pending, send them with: meistertask flush{END}")
+
+    def _forget_projects(self):
+        """Drop resolved project names, a project is about to change"""
+        if self.resolved is not None:
+            self.resolved.clear()
 
     def project_create(self, name: str, description=""):
         """create new project
@@ -34,22 +120,37 @@ class Meistertask:
             print(f"{RED}Project name must be at least 05 charcters{END}")
             exit(1)
 
+        self._forget_projects()
         response: Dict = self.api_project.project_create(name, description)
 
         check_errors("Failed to create project", response)
 
         # add default sections: Open, In Progress, Done
         project_id: int = response["id"]
-        self.api_section.section_create(project_id, "Open")
-        self.api_section.section_create(project_id, "In Progress")
-        self.api_section.section_create(project_id, "Done")
+
+        import asyncio
+
+        async def create_sections(clients: "AsyncClients"):
+            await asyncio.gather(
+                *(
+                    clients.section.section_create(project_id, name, sequence)
+                    for sequence, name in enumerate(["Open", "In Progress", "Done"])
+                )
+            )
+
+        self.fan_out(create_sections)
 
         display_project(response)
         print(f"[+] {SUCCESS}Project created Successfully{END}")
 
-    def project_update(self, id: int, name: str, description=""):
-        """update project name and description"""
+    def project_update(self, id: int, name: str = "", description=""):
+        """update project name and description, empty ones are left as they are"""
 
+        if not name and not description:
+            print(f"{YELLOW}Nothing to update{END}")
+            return
+
+        self._forget_projects()
         response: Dict = self.api_project.project_update(id, name, description)
         check_errors("failed to update project", response)
 
@@ -63,15 +164,8 @@ class Meistertask:
         id: project id
         """
 
-        while True:
-            try:
-                choice = str(input("Do you want to delete this project [y/n]?"))
-                if choice.lower() in ["y", "yes", "n", "no"]:
-                    break
-            except:
-                print(f"{RED} Choose from [y, yes/n, no]{END}")
-
-        if choice.lower() in ["y", "yes"]:
+        if confirm("Do you want to delete this project"):
+            self._forget_projects()
             response: Dict = self.api_project.project_delete(id)
 
             # check errors
@@ -89,18 +183,8 @@ class Meistertask:
         Params
         id(int): project id
         """
-        while True:
-            try:
-                choice = str(input("Do you want to archive this project [y/n] ?"))
-                if choice.lower() in ["y", "yes", "no", "n"]:
-                    break
-                else:
-                    raise ValueError("Invalid choice")
-            except:
-                print(f"{RED}Valid choices: [y, yes / n, no]{END}")
-
-        if choice.lower() in ["y", "yes"]:
-
+        if confirm("Do you want to archive this project"):
+            self._forget_projects()
             response: Dict = self.api_project.project_archive(id)
 
             # check errors
@@ -135,28 +219,61 @@ class Meistertask:
 
         return projects
 
+    def project_iter_all(self, type="active", raw: bool = False) -> Iterator[Dict]:
+        """Iterate over projects page by page
+
+        Params:
+        type(str) active, archived or all
+        raw(bool) every field of the API, as dicts (--format json)
+        """
+
+        if type not in ("active", "archived", "all"):
+            raise ValueError(f"Project type is invalid: {type}")
+
+        return self.api_project.project_iter_all(type, prefetch=True, raw=raw)
+
     def project_fetch(self, name: str) -> Dict:
-        """Fetch project by name"""
+        """Fetch project by id (1234, #1234) or by name
+
+        An id costs one request, a name the listing of all projects. With
+        remember, each name is resolved once (and asked about once).
+        """
+        key: str = normalize(name)
+        if self.resolved is not None and key in self.resolved:
+            return self.resolved[key]
+
+        project: Dict = self._project_fetch(name)
+        if self.resolved is not None:
+            self.resolved[key] = project
+        return project
+
+    def _project_fetch(self, name: str) -> Dict:
+        project_id: Optional[int] = reference_id(name)
+        if project_id is not None:
+            project: Dict = self._fetch_id(APIProject, "project_fetch", project_id)
+            if project is not None:
+                return project
 
         projects: List[Dict] = self.api_project.project_fetch_all()
         if not projects or not len(projects):
-            print(f"{RED}You do NOT have any project {END}")
+            print(f"{RED}You do NOT have any project {END}", file=output())
             exit(1)
 
-        matched: List = [p for p in projects if match_names(p["name"], name)]
+        matched: List[Dict] = NameIndex(projects).resolve(name)
         if not matched or not len(matched):
-            print(f'{RED}No project is found with name: {name} {END}')
+            print(f'{RED}No project is found with name: {name} {END}', file=output())
             exit(1)
             
         return select_one_project(matched)
 
-    def task_create(self, name: str, project_id: int, description=""):
+    def task_create(self, name: str, project_id: int, description="", section_name: str = None):
         """Create new task on specific project
 
         Params:
         name(str) task name
         project_id: project id
         description(str) task description
+        section_name(str) section of the task, chosen by the user when not given
         """
 
         if len(name) < 5:
@@ -165,23 +282,87 @@ class Meistertask:
 
         # choose a section from the project for the task(default: open)
         sections: List[Dict] = self.api_section.section_fetch_all(project_id)
-        section: Dict = select_one_section(sections)
-
-        response: Dict = self.api_task.task_create(section["id"], name, description)
+        if section_name:
+            section: Dict = self._section_named(sections, section_name)
+        else:
+            section = select_one_section(sections)
+
+        response: Dict = self._send_or_queue(
+            create_entry(project_id, section["id"], name, description),
+            lambda: self._raising(APITask).task_create(section["id"], name, description),
+        )
+        if response is None:
+            return
         check_errors("failed to add task", response)
         display_task(response)
         print(f"[+] {SUCCESS}Task addedd successfully{END}")
 
-    def task_update(self, id: int, name: str, description: str):
-        """Update task name and description
+    def task_import(self, path: str, project_id: int, section_name: str = None):
+        """Import tasks from a CSV, JSONL or JSON file
 
         Params:
-        id(int) task id
+        path(str) file to import, interrupted imports resume where they stopped
+        project_id(int) project id
+        section_name(str) section of rows without one
+        """
+        from .importer import import_tasks
+
+        created, skipped, failed = import_tasks(self, path, project_id, section_name)
+
+        for number, error in failed:
+            print(f"{RED}[-] Row {number}: {error}{END}")
+        if skipped:
+            print(f"{YELLOW}[*] {skipped} rows were already imported{END}")
+        print(f"[+] {SUCCESS}{created} tasks imported{END}")
+
+        if failed:
+            print(f"{RED}{len(failed)} rows failed, run the import again to retry them{END}")
+            exit(1)
+
+    def export(self, directory: str, restart: bool = False):
+        """Export every project, its sections and tasks to gzip NDJSON files
+
+        Params:
+        directory(str) export directory, interrupted exports resume where they stopped
+        restart(bool) export every project again
+        """
+        from .export import export_account
+
+        exported, skipped, failed = export_account(self, directory, restart)
+
+        for name, error in failed:
+            print(f"{RED}[-] {name}: {error}{END}")
+        if skipped:
+            print(f"{YELLOW}[*] {skipped} projects were already exported{END}")
+        print(f"[+] {SUCCESS}{exported} projects exported to {directory}{END}")
+
+        if failed:
+            print(f"{RED}{len(failed)} projects failed, run the export again to retry them{END}")
+            exit(1)
+
+    def task_update(self, task: Dict, name: str = "", description: str = ""):
+        """Update task name and description, empty ones are left as they are
+
+        Params:
+        task(dict) task to update
         name(str) new task name
         description(str) new task description
         """
-
-        response: Dict = self.api_task.task_update(id, name, description)
+        fields: Dict = {}
+        if name:
+            fields["name"] = name
+        if description:
+            fields["notes"] = description
+        if not fields:
+            print(f"{YELLOW}Nothing to update{END}")
+            return
+
+        response: Dict = self._send_or_queue(
+            update_entry(task, fields, f"{task['name']}: edited"),
+            lambda: self._raising(APITask).task_edit(task["id"], fields),
+        )
+        if response is None:
+            return
         check_errors("failed to update project", response)
         display_task(response)
         print(f"{SUCCESS}[+] Task updated successfully{END}")
@@ -199,6 +380,347 @@ class Meistertask:
         display_task(response)
         print(f"[+] {SUCCESS}Task moved successfully{END}")
 
+    def task_move_many(
+        self,
+        project: Dict,
+        names: List[str],
+        section_name: str,
+        from_section: str = None,
+        older_than: str = None,
+        dry_run: bool = False,
+    ):
+        """Move tasks to a section, `concurrency` at once
+
+        Sections are fetched once. Tasks given by id are fetched one request
+        each, the tasks of the project are only listed to match names, or to
+        filter every task when none is given.
+
+        Params:
+        project(dict) project of the tasks
+        names(list) task names, ids or "project/name", every task matching the filters when empty
+        section_name(str) target section
+        from_section(str) only move tasks of this section
+        older_than(str) only move tasks not updated for this age (14d, 12h, 30m)
+        dry_run(bool) list the tasks to move, without moving them
+        """
+        sections: List[Dict] = self.section_fetch_all(project["id"])
+        target: Dict = self._section_named(sections, section_name)
+        source: Dict = self._section_named(sections, from_section) if from_section else None
+        max_age: float = parse_age(older_than) if older_than else None
+
+        selected: List[Dict] = []
+        if names:
+            selected, names = self._tasks_by_id(project, names)
+        if names or not selected:
+            tasks: List[Dict] = self.task_fetch_all(project["id"])
+            selected += self._tasks_named(tasks, names) if names else tasks
+        # a task given twice (by id and by name) moves once
+        selected = list({task["id"]: task for task in selected}.values())
+
+        if source is not None:
+            selected = [t for t in selected if t.section_id == source.id]
+        if max_age is not None:
+            # a task never updated (updated_at null) is as old as its creation
+            selected = [t for t in selected if age_of(t.updated or t.created) > max_age]
+        selected = [t for t in selected if t.section_id != target.id]
+
+        if not selected:
+            print(f"{YELLOW}No task to move{END}")
+            return
+
+        if dry_run:
+            for task in selected:
+                print(f"  ({task['id']}) {task['name']}: {task['section_name']} -> {target['name']}")
+            print(f"{YELLOW}{len(selected)} tasks would be moved to {target['name']}{END}")
+            return
+
+        moves: Dict[int, Dict] = {
+            task["id"]: update_entry(
+                task, {"section_id": target["id"]}, f"{task['name']} -> {target['name']}"
+            )
+            for task in selected
+        }
+        if self.queue or self.session.offline:
+            self._queue(*moves.values())
+            return
+
+        import asyncio
+
+        failed: List[Dict] = []
+        unreachable: List[Dict] = []
+
+        async def move(clients: "AsyncClients", task: Dict):
+            try:
+                await clients.task.task_move(task["id"], target["id"])
+            except requests.exceptions.ConnectionError:
+                unreachable.append(moves[task["id"]])
+            except Exception as e:
+                failed.append(task)
+                print(f"{RED}[-] ({task['id']}) {task['name']}: {e}{END}")
+            else:
+                print(f"[+] ({task['id']}) {task['name']} -> {target['name']}")
+
+        async def move_all(clients: "AsyncClients"):
+            await asyncio.gather(*(move(clients, task) for task in selected))
+
+        self.fan_out(move_all, raise_errors=True)
+
+        moved: int = len(selected) - len(failed) - len(unreachable)
+        print(f"[+] {SUCCESS}{moved} tasks moved to {target['name']}{END}")
+        if unreachable:
+            self._queue(*unreachable)
+        if failed:
+            print(f"{RED}{len(failed)} tasks failed, run the command again to retry them{END}")
+            exit(1)
+
+    def flush(self, force: bool = False, discard: bool = False, dry_run: bool = False):
+        """Send the task changes of the journal
+
+        The changes of a task are merged into one request. Projects are
+        replayed concurrently, the changes of a project in journal order.
+        A task changed on the API since it was changed here is a conflict,
+        left in the journal.
+
+        Params:
+        force(bool) send conflicting changes anyway
+        discard(bool) drop conflicting changes from the journal
+        dry_run(bool) list the requests to send, without sending them
+        """
+        try:
+            with self.journal.flushing():
+                self._flush(force, discard, dry_run)
+        except BlockingIOError:
+            print(f"{RED}Another flush is running{END}")
+            exit(1)
+
+    def _flush(self, force: bool, discard: bool, dry_run: bool):
+        entries: List[Dict] = self.journal.read()
+        if not entries:
+            print(f"{YELLOW}No pending change{END}")
+            return
+
+        changes: List[Dict] = coalesce(entries)
+        # attempts are marks of the flushes, not changes
+        entries = [entry for entry in entries if entry["op"] != "attempt"]
+        if dry_run:
+            for change in changes:
+                task: str = change.get("task_id") or "new"
+                print(f"  {change['op']} ({task}) {change['label']}: {change['fields']}")
+            print(f"{YELLOW}{len(changes)} requests for {len(entries)} changes{END}")
+            return
+
+        # compare with the API, not with the cache
+        if self.cache is not None:
+            self.cache.refresh = True
+
+        by_project: Dict[int, List[Dict]] = {}
+        for change in changes:
+            by_project.setdefault(change["project_id"], []).append(change)
+
+        import asyncio
+
+        sent: Set[str] = set()
+        conflicts: List[Dict] = []
+        failed: List[Dict] = []
+
+        async def created(clients: "AsyncClients", change: Dict) -> bool:
+            """Whether an attempted create made its task: one of that name is in its section"""
+            page: int = 1
+            while True:
+                tasks: List[Dict] = await clients.task.task_fetch_page(change["section_id"], page)
+                if any(task["name"] == change["fields"]["name"] for task in tasks):
+                    return True
+                if len(tasks) < PAGE_SIZE:
+                    return False
+                page += 1
+
+        async def send(clients: "AsyncClients", change: Dict):
+            fields: Dict = change["fields"]
+            if change["op"] == "create":
+                # sent by a flush stopped before removing it from the journal
+                if change.get("attempted") and await created(clients, change):
+                    return True
+                attempt: Dict = attempt_entry(change)
+                self.journal.append(attempt)
+                change["ids"].append(attempt["id"])
+                await clients.task.task_create(
+                    change["section_id"], fields["name"], fields.get("notes", "")
+                )
+                return True
+
+            current: Dict = await clients.task.task_fetch(change["task_id"])
+            if not force and change.get("base") and current["updated_at"] != change["base"]:
+                return False
+            await clients.task.task_edit(change["task_id"], fields)
+            return True
+
+        async def replay(clients: "AsyncClients", changes: List[Dict]):
+            for change in changes:
+                try:
+                    done: bool = await send(clients, change)
+                except Exception as e:
+                    failed.append(change)
+                    print(f"{RED}[-] {change['label']}: {e}{END}")
+                    continue
+
+                if done:
+                    sent.update(change["ids"])
+                    print(f"[+] {change['label']}")
+                else:
+                    conflicts.append(change)
+                    print(f"{YELLOW}[!] {change['label']}: changed on the API meanwhile{END}")
+
+        async def replay_all(clients: "AsyncClients"):
+            await asyncio.gather(*(replay(clients, changes) for changes in by_project.values()))
+
+        self.fan_out(replay_all, raise_errors=True)
+
+        dropped: Set[str] = {id for c in conflicts for id in c["ids"]} if discard else set()
+        self.journal.remove(sent | dropped)
+
+        requests_sent: int = len(changes) - len(conflicts) - len(failed)
+        sent_changes: int = sum(1 for entry in entries if entry["id"] in sent)
+        print(f"[+] {SUCCESS}{sent_changes} changes sent in {requests_sent} requests{END}")
+        if conflicts and discard:
+            print(f"{YELLOW}{len(conflicts)} conflicting changes discarded{END}")
+        elif conflicts:
+            print(
+                f"{YELLOW}{len(conflicts)} conflicts, flush with --force to overwrite them"
+                f" or --discard to drop them{END}"
+            )
+        if failed:
+            print(f"{RED}{len(failed)} changes failed, run the flush again to retry them{END}")
+        if failed or (conflicts and not discard):
+            exit(1)
+
+    @staticmethod
+    def _section_named(sections: List[Dict], name: str) -> Dict:
+        section: Dict = filter_sections_by_name(sections, name)
+        if section is None:
+            names: str = ", ".join(s["name"] for s in sections)
+            print(f"{RED}No section is found with name: {name} (sections: {names}){END}")
+            exit(1)
+        return section
+
+    def _tasks_by_id(self, project: Dict, references: List[str]) -> Tuple[List[Dict], List[str]]:
+        """Tasks given by id, fetched concurrently, without listing the project
+
+        Return:
+            tasks found, and the references left to match by name (ids unknown
+            to the API may be names made of digits)
+        """
+        import asyncio
+
+        ids: List[int] = [reference_id(r) for r in references]
+        wanted: List[int] = [id for id in ids if id is not None]
+
+        async def fetch(clients: "AsyncClients", id: int):
+            try:
+                return await clients.task.task_fetch(id)
+            except Exception as e:
+                return None if isinstance(e, APIError) and e.status_code == 404 else e
+
+        async def fetch_all(clients: "AsyncClients"):
+            return await asyncio.gather(*(fetch(clients, id) for id in wanted))
+
+        fetched: Dict[int, Dict] = {}
+        if wanted:
+            fetched = dict(zip(wanted, self.fan_out(fetch_all, raise_errors=True)))
+
+        found: List[Dict] = []
+        names: List[str] = []
+        for reference, id in zip(references, ids):
+            task = fetched.get(id) if id is not None else None
+            if isinstance(task, requests.exceptions.ConnectionError):
+                task = self._unseen_task(id, project["id"])
+            if isinstance(task, Exception):
+                handle_error(task)
+            if task is None:
+                names.append(self._in_project(reference, project))
+            elif task["project_id"] != project["id"]:
+                print(f"{RED}Task {id} is not in project {project['name']}{END}")
+                exit(1)
+            else:
+                found.append(task)
+        return found, names
+
+    @staticmethod
+    def _in_project(reference: str, project: Dict) -> str:
+        """Task name of a "project/name" reference to the project, other references as they are"""
+        prefix, slash, name = reference.partition("/")
+        if slash and name.strip():
+            if normalize(prefix) == normalize(project["name"]) or reference_id(prefix) == project["id"]:
+                return name
+        return reference
+
+    @staticmethod
+    def _tasks_named(tasks: List[Dict], names: List[str]) -> List[Dict]:
+        """Tasks matching names or ids, each task once"""
+        index: NameIndex = NameIndex(tasks)
+        by_id: Dict[str, Dict] = {str(task["id"]): task for task in tasks}
+
+        selected: Dict[int, Dict] = {}
+        for name in names:
+            if name.lstrip("#") in by_id:
+                task: Dict = by_id[name.lstrip("#")]
+            else:
+                matched: List[Dict] = index.resolve(name)
+                if not matched:
+                    print(f"{RED}No task is found with name: {name} {END}")
+                    exit(1)
+                task = select_one_task(matched)
+            selected[task["id"]] = task
+        return list(selected.values())
+
+    def task_resolve(self, reference: str, project: str = None) -> Dict:
+        """Fetch task by id (1234, #1234), by "project/name" or by name in project
+
+        Params:
+        reference(str) task id or name
+        project(str) project id or name, needed to find a task by name only
+        """
+        task_id: Optional[int] = reference_id(reference)
+        if task_id is not None:
+            try:
+                task: Dict = self._raising(APITask).task_fetch(task_id)
+            except requests.exceptions.ConnectionError:
+                # unreachable and not cached: the change is queued against the id
+                return self._unseen_task(task_id)
+            except Exception as e:
+                # not found: the reference may be a name made of digits
+                if not (isinstance(e, APIError) and e.status_code == 404):
+                    handle_error(e)
+            else:
+                return task
+
+        if project is None and "/" in reference:
+            project, _, reference = reference.partition("/")
+        if project is None and task_id is not None:
+            print(f"{RED}No task is found with id: {task_id}{END}")
+            exit(1)
+        if project is None:
+            print(f"{RED}Give the project of the task, or its id: {reference}{END}")
+            exit(1)
+
+        return self.task_fetch(reference, self.project_fetch(project)["id"])
+
+    @staticmethod
+    def _unseen_task(id: int, project_id: int = None) -> Task:
+        """Task known by its id only: the API is unreachable and has not been
+        asked about it before. Its changes are queued without a base, a flush
+        sends them without looking for a conflict."""
+        print(f"{YELLOW}The API is unreachable, task {id} is changed as given (not seen before){END}")
+        return Task({"id": id, "project_id": project_id, "name": f"#{id}"})
+
+    def _fetch_id(self, client_class, method: str, id: int) -> Optional[Dict]:
+        """Item with an id, None when there is none (the reference may be a name)"""
+        try:
+            return getattr(self._raising(client_class), method)(id)
+        except Exception as e:
+            if isinstance(e, APIError) and e.status_code == 404:
+                return None
+            handle_error(e)
+
     def task_fetch(self, name: str, project_id: str):
         """Fetch task from project by name"""
 
@@ -207,7 +729,11 @@ class Meistertask:
             print(f"{RED}No task is found in project{END}")
             exit(1)
 
-        matched: List = [t for t in tasks if match_names(t["name"], name)]
+        matched: List[Dict] = NameIndex(tasks).resolve(name)
+        if not matched or not len(matched):
+            print(f'{RED}No task is found with name: {name} {END}')
+            exit(1)
+
         return select_one_task(matched)
 
     def task_fetch_all(self, project_id: int) -> List[Dict]:
@@ -219,6 +745,17 @@ class Meistertask:
 
         return tasks
 
+    def task_iter_all(self, project_id: int, section_name: str = None, raw: bool = False) -> Iterator[Dict]:
+        """Iterate over tasks of project page by page
+
+        Params:
+        project_id(int) project id
+        section_name(str) only the tasks of this section ("all": every task)
+        raw(bool) every field of the API, as dicts (--format json)
+        """
+        tasks: Iterator[Dict] = self.api_task.task_iter_all(project_id, prefetch=True, raw=raw)
+        return filter_tasks_by_section(tasks, section_name, raw) if section_name else tasks
+
     def section_fetch_all(self, id: int):
         """Fetch sections of projec
 
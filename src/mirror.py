@@ -0,0 +1,360 @@
+#!/usr/bin/python3
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .models import Project, Section, Task
+from .names import NameIndex, reference_id
+from .prompt import output
+from .search import SearchIndex, latest_versions
+from .utils import RED, YELLOW, END, section_key, select_one_project
+
+# rows written to the database at once while syncing
+BATCH_SIZE = 500
+
+# project status codes, as sent by project_delete and project_archive
+PROJECT_STATUS = {"active": 1, "archived": 5}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    status INTEGER,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sections (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    sequence REAL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL,
+    section_id INTEGER,
+    section_name TEXT,
+    name TEXT NOT NULL,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    project_id INTEGER PRIMARY KEY,
+    tasks_updated_at TEXT,
+    synced_at TEXT
+);
+CREATE INDEX IF NOT EXISTS projects_name ON projects (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS sections_project ON sections (project_id, sequence);
+CREATE INDEX IF NOT EXISTS tasks_project ON tasks (project_id, section_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS tasks_section ON tasks (section_id);
+CREATE INDEX IF NOT EXISTS tasks_name ON tasks (name COLLATE NOCASE);
+"""
+
+
+def data_home() -> str:
+    """Root directory of local data, following the XDG base directory spec"""
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(
+        os.path.expanduser("~"), ".local", "share"
+    )
+    return os.path.join(base, "meistertask")
+
+
+def token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+class Mirror:
+    """Local SQLite copy of projects, sections and tasks.
+
+    Sync is incremental: tasks are listed newest first (sort=-updated_at) and
+    the listing stops at the newest task already mirrored; a listing found out
+    of order before that point is read to the end instead. A task moved to
+    another project is rewritten when that project syncs (its updated_at
+    changes). The API lists no deleted tasks, so a task deleted there stays in
+    the mirror until a full sync (sync --full) downloads every task again.
+
+    Params:
+    token(str) API token, each token has its own database
+    path(str) database file, defaults to $XDG_DATA_HOME/meistertask/<token hash>.db
+    """
+
+    def __init__(self, token: str, path: str = None):
+        if path is None:
+            os.makedirs(data_home(), mode=0o700, exist_ok=True)
+            path = os.path.join(data_home(), f"{token_hash(token)}.db")
+
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+
+        # full-text index of task names and notes, kept in the same database
+        self.index = SearchIndex(self.connection, self.lock)
+        if self.index.empty and self.synced:
+            self.index.rebuild()
+
+    def close(self):
+        self.connection.close()
+
+    @property
+    def synced(self) -> bool:
+        """The mirror holds at least one sync"""
+        row = self.connection.execute("SELECT COUNT(*) FROM sync_state").fetchone()
+        return bool(row[0])
+
+    # writes
+
+    def _execute_many(self, query: str, rows: List[Tuple]):
+        with self.lock, self.connection:
+            self.connection.executemany(query, rows)
+
+    def upsert_projects(self, projects: Iterable[Project]):
+        self._execute_many(
+            "INSERT OR REPLACE INTO projects (id, name, status, updated_at, data) VALUES (?, ?, ?, ?, ?)",
+            [
+                (p.id, p.name, p.status, p.updated_at, json.dumps(p.to_dict()))
+                for p in projects
+            ],
+        )
+
+    def replace_sections(self, project_id: int, sections: Iterable[Section]):
+        rows = [
+            (s.id, project_id, s.name, s.sequence, json.dumps(s.to_dict())) for s in sections
+        ]
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM sections WHERE project_id = ?", (project_id,))
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO sections (id, project_id, name, sequence, data) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def upsert_tasks(self, tasks: List[Task]):
+        tasks = latest_versions(tasks)
+        self.index.update(tasks)
+        self._execute_many(
+            "INSERT OR REPLACE INTO tasks (id, project_id, section_id, section_name, name, updated_at, data)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    t.id,
+                    t.project_id,
+                    t.section_id,
+                    t.section_name,
+                    t.name,
+                    t.updated_at,
+                    json.dumps(t.to_dict()),
+                )
+                for t in tasks
+            ],
+        )
+
+    def keep_tasks(self, project_id: int, ids: Set[int]) -> int:
+        """Delete the tasks of a project not in ids, at once
+
+        Return:
+            number of deleted tasks
+        """
+        with self.lock, self.connection:
+            rows = self.connection.execute("SELECT id FROM tasks WHERE project_id = ?", (project_id,))
+            gone: List[int] = [id for (id,) in rows if id not in ids]
+            self.index.delete(gone)
+            self.connection.executemany("DELETE FROM tasks WHERE id = ?", [(id,) for id in gone])
+        return len(gone)
+
+    def tasks_updated_at(self, project_id: int) -> str:
+        """updated_at of the newest mirrored task of a project"""
+        row = self.connection.execute(
+            "SELECT tasks_updated_at FROM sync_state WHERE project_id = ?", (project_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def synced_at(self) -> Dict[int, datetime]:
+        """Time of the last sync of each project"""
+        rows = self.connection.execute("SELECT project_id, synced_at FROM sync_state")
+        return {project_id: datetime.fromisoformat(at) for project_id, at in rows if at}
+
+    def mark_synced(self, project_id: int, tasks_updated_at: str):
+        now: str = datetime.now(timezone.utc).isoformat()
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO sync_state (project_id, tasks_updated_at, synced_at) VALUES (?, ?, ?)",
+                (project_id, tasks_updated_at, now),
+            )
+
+    # sync
+
+    def sync_project(self, meistertask, project_id: int, full: bool = False) -> int:
+        """Copy sections and changed tasks of a project
+
+        Return:
+            number of tasks written
+        """
+        self.replace_sections(project_id, meistertask.api_section.section_fetch_all(project_id))
+
+        since: str = None if full else self.tasks_updated_at(project_id)
+
+        newest: str = since
+        previous: str = None
+        written: int = 0
+        batch: List[Dict] = []
+        # ids listed by a full sync, the other tasks were deleted on the API
+        listed: Set[int] = set()
+
+        for task in meistertask.api_task.task_iter_all(project_id, sort="-updated_at"):
+            updated_at: str = task.get("updated_at") or ""
+            if previous is not None and updated_at > previous:
+                # the listing is not sorted after all, stopping early would
+                # miss changes: read it to the end
+                since = None
+            previous = updated_at
+
+            # tasks come newest first, the rest is already mirrored
+            if since and updated_at < since:
+                break
+
+            newest = max(newest or "", updated_at)
+            listed.add(task["id"])
+            batch.append(task)
+            if len(batch) >= BATCH_SIZE:
+                self.upsert_tasks(batch)
+                written += len(batch)
+                batch = []
+
+        self.upsert_tasks(batch)
+        written += len(batch)
+
+        # only once the listing is complete: a sync failing halfway keeps every task
+        if full:
+            self.keep_tasks(project_id, listed)
+        self.mark_synced(project_id, newest)
+        return written
+
+    def sync(self, meistertask, full: bool = False, max_age: float = None) -> Tuple[int, int]:
+        """Sync every project, many projects at once
+
+        Params:
+        meistertask(Meistertask) facade holding the api clients
+        full(bool) download every task again, dropping deleted ones
+        max_age(float) only sync projects not synced for max_age seconds
+
+        Return:
+            number of projects and number of tasks written
+        """
+        import asyncio
+
+        projects: List[Dict] = list(meistertask.api_project.project_iter_all("all"))
+        self.upsert_projects(projects)
+
+        if max_age is not None:
+            now: datetime = datetime.now(timezone.utc)
+            synced_at: Dict[int, datetime] = self.synced_at()
+            projects = [
+                p
+                for p in projects
+                if p["id"] not in synced_at
+                or (now - synced_at[p["id"]]).total_seconds() >= max_age
+            ]
+
+        async def sync_all(clients):
+            return await asyncio.gather(
+                *(clients.call(self.sync_project, meistertask, p["id"], full) for p in projects)
+            )
+
+        written: List[int] = meistertask.fan_out(sync_all)
+        return len(projects), sum(written)
+
+    # reads
+
+    def projects(self, type: str = "active", raw: bool = False) -> Iterator[Dict]:
+        """Mirrored projects, as dicts when raw"""
+        query: str = "SELECT data FROM projects"
+        params: Tuple = ()
+        if type in PROJECT_STATUS:
+            query += " WHERE status = ?"
+            params = (PROJECT_STATUS[type],)
+
+        for (data,) in self.connection.execute(query + " ORDER BY name COLLATE NOCASE", params):
+            yield json.loads(data) if raw else Project(json.loads(data))
+
+    def project(self, id: int) -> Optional[Dict]:
+        row = self.connection.execute("SELECT data FROM projects WHERE id = ?", (id,)).fetchone()
+        return Project(json.loads(row[0])) if row else None
+
+    def names(self) -> Iterator[Tuple[str, str, str]]:
+        """(kind, project name, name) of every project, section and task"""
+        for (name,) in self.connection.execute("SELECT name FROM projects ORDER BY name"):
+            yield "project", None, name
+
+        for kind in ("sections", "tasks"):
+            rows = self.connection.execute(
+                f"SELECT p.name, x.name FROM {kind} x JOIN projects p ON p.id = x.project_id"
+                " ORDER BY p.name, x.name"
+            )
+            for project, name in rows:
+                yield kind[:-1], project, name
+
+    def sections(self, project_id: int) -> List[Dict]:
+        rows = self.connection.execute(
+            "SELECT data FROM sections WHERE project_id = ? ORDER BY sequence", (project_id,)
+        )
+        return [Section(json.loads(data)) for (data,) in rows]
+
+    def tasks(self, project_id: int, section_name: str = None, raw: bool = False) -> Iterator[Dict]:
+        """Tasks of a project, or of its sections named section_name ("all": every task), as dicts when raw"""
+        query: str = "SELECT data FROM tasks WHERE project_id = ?"
+        params: Tuple = (project_id,)
+        if section_name and section_key(section_name) != "all":
+            # names compared as the cli does ("inprogess"), then the rows read by the section index
+            key: str = section_key(section_name)
+            ids: List[int] = [s.id for s in self.sections(project_id) if section_key(s.name) == key]
+            query += f" AND section_id IN ({', '.join('?' * len(ids))})"
+            params += tuple(ids)
+
+        for (data,) in self.connection.execute(query, params):
+            yield json.loads(data) if raw else Task(json.loads(data))
+
+
+class LocalMeistertask:
+    """Read-only stand-in for Meistertask, answering from the mirror
+
+    Params:
+    token(str) API token, selects the mirror to read
+    """
+
+    def __init__(self, token: str):
+        self.mirror = Mirror(token)
+        if not self.mirror.synced:
+            print(f"{YELLOW}The local mirror is empty, run: meistertask sync{END}", file=output())
+            exit(1)
+
+    def project_iter_all(self, type="active", raw: bool = False) -> Iterator[Dict]:
+        if type not in ("active", "archived", "all"):
+            raise ValueError(f"Project type is invalid: {type}")
+
+        return self.mirror.projects(type, raw)
+
+    def project_fetch(self, name: str) -> Dict:
+        """Fetch project by id (1234, #1234) or by name"""
+        project_id: Optional[int] = reference_id(name)
+        project: Dict = self.mirror.project(project_id) if project_id is not None else None
+        if project is not None:
+            return project
+
+        matched: List[Dict] = NameIndex(self.mirror.projects("all")).resolve(name)
+        if not matched:
+            print(f'{RED}No project is found with name: {name} {END}', file=output())
+            exit(1)
+
+        return select_one_project(matched)
+
+    def task_iter_all(self, project_id: int, section_name: str = None, raw: bool = False) -> Iterator[Dict]:
+        return self.mirror.tasks(project_id, section_name, raw)
+
+    def section_fetch_all(self, id: int) -> List[Dict]:
+        return self.mirror.sections(id)
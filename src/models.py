@@ -0,0 +1,156 @@
+#!/usr/bin/python3
+"""Projects, sections and tasks decoded from the API.
+
+Only the fields used by the cli are kept, in `__slots__`: a task holds a few
+pointers instead of a dict of every field of the response. Commands needing
+every field of the API (export, --format json) read the raw responses instead.
+Models still read like the dicts they replace (task["name"], task.get("notes"),
+dict(task)), hot paths use the attributes (task.name).
+"""
+
+import sys
+from typing import Dict, FrozenSet, Iterator, Optional, Tuple, Union
+
+
+def parse_timestamp(timestamp: str) -> Optional["datetime"]:
+    """2020-01-01T10:00:00.000Z -> aware datetime"""
+    if not timestamp:
+        return None
+    from datetime import datetime
+
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+
+
+class Model:
+    """Base of the models
+
+    Subclasses list their fields in FIELDS (and __slots__), and the fields
+    holding few distinct strings (section names ...) in INTERNED. Fields of
+    the response not in FIELDS are dropped.
+    """
+
+    __slots__ = ()
+    FIELDS: Tuple[str, ...] = ()
+    INTERNED: Tuple[str, ...] = ()
+    # FIELDS as a set, for lookups by key
+    _KEYS: FrozenSet[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._KEYS = frozenset(cls.FIELDS)
+
+    def __init__(self, data: Dict):
+        for field in self.FIELDS:
+            value = data.get(field)
+            if field in self.INTERNED and isinstance(value, str):
+                value = sys.intern(value)
+            object.__setattr__(self, field, value)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Model":
+        return data if isinstance(data, cls) else cls(data)
+
+    @classmethod
+    def from_response(cls, data: Dict) -> Union["Model", Dict]:
+        """Model of a response, or the response itself when it holds errors (see check_errors)"""
+        return data if "errors" in data else cls(data)
+
+    def __getitem__(self, field: str):
+        if field in self._KEYS:
+            return getattr(self, field)
+        raise KeyError(field)
+
+    def __setitem__(self, field: str, value):
+        if field not in self._KEYS:
+            raise KeyError(field)
+        object.__setattr__(self, field, value)
+
+    def __contains__(self, field: str) -> bool:
+        return field in self._KEYS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Model):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    # equal by value and mutable, like the dicts they replace
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={self.id!r}, name={self.name!r})"
+
+    def get(self, field: str, default=None):
+        value = getattr(self, field) if field in self._KEYS else None
+        return default if value is None else value
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.FIELDS
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+class Timestamped(Model):
+    """Model with created_at / updated_at, parsed on first use"""
+
+    __slots__ = ("_created", "_updated")
+
+    @property
+    def created(self) -> Optional["datetime"]:
+        try:
+            return self._created
+        except AttributeError:
+            self._created = parse_timestamp(self.created_at)
+            return self._created
+
+    @property
+    def updated(self) -> Optional["datetime"]:
+        try:
+            return self._updated
+        except AttributeError:
+            self._updated = parse_timestamp(self.updated_at)
+            return self._updated
+
+    def __setitem__(self, field: str, value):
+        super().__setitem__(field, value)
+        # drop the parsed value of a changed timestamp
+        if field in ("created_at", "updated_at"):
+            try:
+                object.__delattr__(self, f"_{field[:-3]}")
+            except AttributeError:
+                pass
+
+
+class Project(Timestamped):
+    FIELDS = ("id", "name", "notes", "status", "created_at", "updated_at")
+    __slots__ = FIELDS
+
+
+class Section(Model):
+    FIELDS = ("id", "name", "project_id", "sequence")
+    INTERNED = ("name",)
+    __slots__ = FIELDS
+
+
+class Task(Timestamped):
+    FIELDS = (
+        "id",
+        "name",
+        "notes",
+        "section_id",
+        "section_name",
+        "project_id",
+        "status",
+        "created_at",
+        "updated_at",
+    )
+    INTERNED = ("section_name",)
+    __slots__ = FIELDS
@@ -0,0 +1,247 @@
+#!/usr/bin/python3
+
+from bisect import bisect_left
+from heapq import nlargest
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import math
+import re
+
+# compiled once, user input only reaches patterns escaped (re.escape)
+TOKEN_PATTERN = re.compile(r"\w+")
+# runs of characters other than words and the separator of the names
+NON_WORD_PATTERN = re.compile(r"[^\w\x00]+")
+
+# "1234" or "#1234", an id given instead of a name
+REFERENCE_PATTERN = re.compile(r"#?(\d+)")
+
+# starts each name of the searched text, so that every word of it follows a
+# space and "\x00 name\x00" is the whole name
+SEPARATOR = "\x00 "
+
+# credit of a query word found in a name: as a word, as the start of a word,
+# or as a misspelled word (times its similarity)
+WORD_CREDIT = 1.0
+PREFIX_CREDIT = 0.7
+TYPO_CREDIT = 0.6
+
+# share of the score given by the trigrams of the whole name, when re-ranking
+TRIGRAM_WEIGHT = 0.3
+
+# bonus of names starting with the query
+PREFIX_BONUS = 0.2
+
+# a query word of more names is looked up in the names holding its rarer
+# words only
+COMMON_NAMES = 1000
+
+# matches scoring less are dropped: a shared common word only
+MIN_SCORE = 0.2
+
+# a best match with this score, leading the next one by the margin, is chosen
+# without asking
+AUTO_SCORE = 0.75
+AUTO_MARGIN = 0.2
+
+
+def normalize(name: str) -> str:
+    """Lowercase a name and collapse its whitespace"""
+    return " ".join(name.lower().split())
+
+
+def reference_id(reference: str) -> Optional[int]:
+    """Id of a reference such as "1234" or "#1234", None for a name"""
+    matched = REFERENCE_PATTERN.fullmatch(reference.strip())
+    return int(matched.group(1)) if matched else None
+
+
+def tokenize(name: str) -> List[str]:
+    return TOKEN_PATTERN.findall(name.lower())
+
+
+def simplify(name: str) -> str:
+    """Lowercase words of a name, separated by one space ("Fix: login!" -> "fix login")"""
+    return NON_WORD_PATTERN.sub(" ", name.lower()).strip(" ")
+
+
+def trigrams(text: str) -> Set[str]:
+    text = f"  {text} "
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def similarity(a: Set[str], b: Set[str]) -> float:
+    """Dice coefficient of two trigram sets"""
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def typo_pattern(word: str) -> str:
+    """Regular expression of the words one edit away from word: a character
+    replaced, added, removed, or two swapped"""
+    variants: Set[str] = set()
+    for i in range(len(word) + 1):
+        before, after = re.escape(word[:i]), re.escape(word[i:])
+        variants.add(f"{before}\\w{after}")
+        if i < len(word):
+            variants.add(f"{before}\\w{re.escape(word[i + 1:])}")
+            variants.add(f"{before}{re.escape(word[i + 1:])}")
+        if i < len(word) - 1:
+            variants.add(f"{before}{re.escape(word[i + 1] + word[i] + word[i + 2:])}")
+    return f"^(?:{'|'.join(variants)})$"
+
+
+class NameIndex:
+    """Ranked lookup of named items (projects, tasks ...) by a query.
+
+    The names are joined, lowercased, into one text searched with regular
+    expressions starting with the query words: looking a query up costs a few
+    scans of the text at C speed, plus a step per name holding a rare query
+    word, not per name. Words of many names ("fix") are looked up in the names
+    holding the rarer words of the query only.
+
+    Score of a name, from 0 to 1 (an exact match):
+    - query words found in the name, as words, word prefixes or misspelled
+      words, weighted by their rarity (a word of every name counts for little)
+    - a bonus when the name starts with the query
+    - the best candidates are re-ranked with the trigram similarity of the
+      whole name
+
+    Parameter:
+        items: items to index, each one has a name
+        key: key holding the name of an item
+    """
+
+    def __init__(self, items: Iterable[Dict], key: str = "name"):
+        self.items: List[Dict] = list(items)
+
+        self.names: List[str] = []
+        for item in self.items:
+            name: str = item[key].lower()
+            # names of words and single spaces (most of them) skip the regular
+            # expression, which costs a unicode lookup per character
+            self.names.append(" ".join(name.split()) if name.replace(" ", "").isalnum() else simplify(name))
+        # searched as "\x00 name\x00 name ... \x00"
+        self.text: str = f"{SEPARATOR}{SEPARATOR.join(self.names)}\x00"
+        # offset of the separator ending each name in text
+        self.ends: List[int] = []
+        end: int = 0
+        for name in self.names:
+            end += len(SEPARATOR) + len(name)
+            self.ends.append(end)
+        self._vocabulary: str = None
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _matches(self, pattern: str) -> Tuple[List[int], List[str]]:
+        """Position of the name holding each match of pattern, and the match"""
+        positions: List[int] = []
+        found: List[str] = []
+        for match in re.finditer(pattern, self.text):
+            positions.append(bisect_left(self.ends, match.end()))
+            found.append(match.group())
+        return positions, found
+
+    def _weight(self, count: int) -> float:
+        """Weight of a word found in count names: rare words weigh more than
+        words of every name ("fix", "the")"""
+        return math.log(1 + len(self.names) / (1 + count))
+
+    def _word_credits(self, word: str, candidates: Iterable[int] = None) -> Dict[int, float]:
+        """Credit of a query word in each name holding it, or in candidates only"""
+        if candidates is not None:
+            credits: Dict[int, float] = {}
+            for position in candidates:
+                name: str = f" {self.names[position]} "
+                if f" {word} " in name:
+                    credits[position] = WORD_CREDIT
+                elif f" {word}" in name:
+                    credits[position] = PREFIX_CREDIT
+            return credits
+
+        credits = {}
+        for position, matched in zip(*self._matches(f" {re.escape(word)}\\w*")):
+            # " word" is the word, " words" starts with it
+            if len(matched) == len(word) + 1:
+                credits[position] = WORD_CREDIT
+            elif position not in credits:
+                credits[position] = PREFIX_CREDIT
+        if credits or len(word) < 3:
+            return credits
+
+        # a misspelled word: look for the words of the names one edit away
+        if self._vocabulary is None:
+            self._vocabulary = "\n".join(set(" ".join(self.names).split(" ")))
+        for typo in re.findall(typo_pattern(word), self._vocabulary, re.MULTILINE):
+            credit: float = TYPO_CREDIT * (1 - 1 / max(len(word), len(typo)))
+            positions, _ = self._matches(f" {re.escape(typo)}(?!\\w)")
+            for position in positions:
+                credits[position] = max(credits.get(position, 0.0), credit)
+        return credits
+
+    def rank(self, query: str, k: int = 10) -> List[Tuple[float, Dict]]:
+        """Best k matches of query, as (score, item), best first"""
+        name: str = simplify(query)
+        if not name:
+            return []
+        exact, _ = self._matches(f"\x00 {re.escape(name)}(?=\x00)")
+        if exact:
+            return [(1.0, self.items[position]) for position in exact[:k]]
+
+        # rarest words first: their names are the candidates, and a word of
+        # many names is looked up in the candidates only, not in every name
+        counts: Dict[str, int] = {word: self.text.count(f" {word}") for word in name.split(" ")}
+        candidates: Set[int] = set()
+        weighted: List[Tuple[float, Dict[int, float]]] = []
+        for word in sorted(counts, key=counts.get):
+            if candidates and counts[word] > COMMON_NAMES:
+                credits: Dict[int, float] = self._word_credits(word, candidates)
+                weighted.append((self._weight(counts[word]), credits))
+            else:
+                credits = self._word_credits(word)
+                weighted.append((self._weight(len(credits)), credits))
+                candidates.update(credits)
+
+        scores: Dict[int, float] = {}
+        total_weight: float = sum(weight for weight, _ in weighted)
+        for weight, credits in weighted:
+            for position, credit in credits.items():
+                scores[position] = scores.get(position, 0.0) + weight * credit / total_weight
+        if not scores:
+            return []
+
+        for position in self._matches(f"\x00 {re.escape(name)}")[0]:
+            if position in scores:
+                scores[position] += PREFIX_BONUS
+
+        # keep a few more than k, then re-rank them on the whole name
+        query_trigrams: Set[str] = trigrams(name)
+        ranked: List[Tuple[float, int]] = []
+        for position, score in nlargest(k * 3, scores.items(), key=itemgetter(1)):
+            score = (1 - TRIGRAM_WEIGHT) * score + TRIGRAM_WEIGHT * similarity(
+                query_trigrams, trigrams(self.names[position])
+            )
+            if score >= MIN_SCORE:
+                ranked.append((score, position))
+        ranked.sort(key=lambda entry: (-entry[0], len(self.names[entry[1]]), entry[1]))
+        # the bonus may lift a name over 1, the score of an exact match
+        return [(round(min(score, 1.0), 3), self.items[position]) for score, position in ranked[:k]]
+
+    def search(self, query: str, k: int = 10) -> List[Dict]:
+        """Find items matching query, best matches first.
+
+        Return:
+            exact matches if any, otherwise the k best ranked matches
+        """
+        return [item for _, item in self.rank(query, k)]
+
+    def resolve(self, query: str, k: int = 10) -> List[Dict]:
+        """Items to choose from for query: the best match alone when it
+        clearly leads (exact, or well ahead of the next one), else the k best
+        """
+        ranked: List[Tuple[float, Dict]] = self.rank(query, k)
+        # several exact matches score 1.0 each, none leads
+        if len(ranked) > 1 and ranked[0][0] >= AUTO_SCORE and ranked[0][0] - ranked[1][0] >= AUTO_MARGIN:
+            return [ranked[0][1]]
+        return [item for _, item in ranked]
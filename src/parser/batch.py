@@ -0,0 +1,37 @@
+class BatchParser:
+    # command name and aliases
+    names = ("batch",)
+
+    def __init__(self, subparsers):
+        self.subparsers = subparsers
+        self.parser = self.subparsers.add_parser(
+            "batch",
+            description="Run the commands of a file (one per line) in one process",
+        )
+
+    def configure(self):
+        self.parser.add_argument("file", help='file of commands, "-" to read them from stdin')
+        self.parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=1,
+            help="read-only commands (list, view) run at once",
+        )
+        self.parser.add_argument(
+            "-k",
+            "--keep-going",
+            action="store_true",
+            help="run the next commands after a failed one",
+        )
+        self.parser.add_argument(
+            "--pick-best",
+            action="store_true",
+            help="take the best match when a name matches several projects or tasks",
+        )
+        self.parser.add_argument(
+            "-y",
+            "--yes",
+            action="store_true",
+            help="answer yes to confirmations (project delete, archive)",
+        )
@@ -0,0 +1,13 @@
+class BoardParser:
+    # command name and aliases
+    names = ("board",)
+
+    def __init__(self, subparsers):
+        self.subparsers = subparsers
+        self.parser = self.subparsers.add_parser(
+            "board",
+            description="Browse the sections and tasks of a project, and move tasks, in the terminal",
+        )
+
+    def configure(self):
+        self.parser.add_argument("project", help="project name or id")
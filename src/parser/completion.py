@@ -0,0 +1,13 @@
+class CompletionParser:
+    # command name and aliases
+    names = ("completion",)
+
+    def __init__(self, subparsers):
+        self.subparsers = subparsers
+        self.parser = self.subparsers.add_parser(
+            "completion",
+            description="Print the shell completion script",
+        )
+
+    def configure(self):
+        self.parser.add_argument("shell", choices=["bash", "zsh", "fish"])
@@ -0,0 +1,17 @@
+class DaemonParser:
+    # command name and aliases
+    names = ("daemon",)
+
+    def __init__(self, subparsers):
+        self.subparsers = subparsers
+        self.parser = self.subparsers.add_parser(
+            "daemon",
+            description="Keep connections and cached data warm for the next commands",
+        )
+
+    def configure(self):
+        self.parser.add_argument(
+            "--stop",
+            action="store_true",
+            help="stop the running daemon",
+        )
@@ -0,0 +1,26 @@
+class ExportParser:
+    # command name and aliases
+    names = ("export",)
+
+    def __init__(self, subparsers):
+        self.subparsers = subparsers
+        self.parser = self.subparsers.add_parser(
+            "export",
+            description="Export every project, its sections and tasks, to gzip NDJSON files",
+        )
+
+    def configure(self):
+        self.parser.add_argument(
+            "directory",
+            nargs="?",
+            default="meistertask-export",
+            help="export directory (default: meistertask-export)",
+        )
+        self.parser.add_argument(
+            "-w", "--workers", type=int, default=8, help="number of projects exported at once"
+        )
+        self.parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="export every project again, instead of resuming an interrupted export",
+        )
@@ -0,0 +1,29 @@
+class FlushParser:
+    # command name and aliases
+    names = ("flush",)
+
+    def __init__(self, subparsers):
+        self.subparsers = subparsers
+        self.parser = self.subparsers.add_parser(
+            "flush",
+            description="Send the task changes queued while offline (or with --queue)",
+        )
+
+    def configure(self):
+        self.parser.add_argument(
+            "-n",
+            "--dry-run",
+            action="store_true",
+            help="list the requests to send, without sending them",
+        )
+        conflicts = self.parser.add_mutually_exclusive_group()
+        conflicts.add_argument(
+            "--force",
+            action="store_true",
+            help="send changes to tasks changed on the API meanwhile",
+        )
+        conflicts.add_argument(
+            "--discard",
+            action="store_true",
+            help="drop changes to tasks changed on the API meanwhile",
+        )
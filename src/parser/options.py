@@ -0,0 +1,13 @@
+def add_format_arguments(parser):
+    """Add --format and --fields to a listing or view command"""
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=["text", "json", "ndjson", "csv", "tsv"],
+        default="text",
+        help="output format (default: text)",
+    )
+    parser.add_argument(
+        "--fields",
+        help="comma separated fields to output, e.g. id,name,section_name",
+    )
@@ -1,34 +1,111 @@
 import argparse
+import sys
+from typing import List
 from src.usage import PROJECT_USAGE, ROOT_USAGE, TASK_USAGE
 from .project import ProjectParser
 from .task import TaskParser
+from .sync import SyncParser
+from .search import SearchParser
+from .daemon import DaemonParser
+from .completion import CompletionParser
+from .flush import FlushParser
+from .export import ExportParser
+from .batch import BatchParser
+from .board import BoardParser
 
 
 class Parser:
-    def __init__(self):
+    def __init__(self, argv: List[str] = None):
+        self.argv: List[str] = sys.argv[1:] if argv is None else argv
         self.parser = argparse.ArgumentParser(
             prog="meistertask",
             description="A CLI tools for Meistertask",
             epilog=f"For more info: https://github.com/ablil/meistertaks-cli",
         )
+        self.parser.add_argument(
+            "--no-cache",
+            help="do not read or write the local cache",
+            action="store_false",
+            dest="cache",
+        )
+        self.parser.add_argument(
+            "--refresh",
+            help="revalidate cached projects, sections and tasks with the API",
+            action="store_true",
+        )
+        self.parser.add_argument(
+            "--queue",
+            help="write task changes to the local journal, see: meistertask flush",
+            action="store_true",
+        )
+        self.parser.add_argument(
+            "--stats",
+            help="print the time spent in requests, json decoding and rendering",
+            action="store_true",
+        )
+        self.parser.add_argument(
+            "--trace",
+            metavar="FILE",
+            help="write a Chrome trace-event file of the command (chrome://tracing)",
+        )
         self.subparsers = self.parser.add_subparsers(
             title="Meistertask core commands",
             dest="command",
             metavar="command",
-            help="[project, task]",
+            help="[project, task, sync, search, board, flush, export, batch, daemon, completion]",
         )
 
-        self.configure()
+        self.configure(self.command_name())
 
-    def configure(self):
-        self.projet_parser = ProjectParser(self.subparsers)
-        self.projet_parser.configure()
+    def command_name(self) -> str:
+        """First positional argument, the command about to run"""
+        value: bool = False
+        for arg in self.argv:
+            if value:
+                value = False
+            elif arg == "--trace":
+                # its value is not the command
+                value = True
+            elif not arg.startswith("-"):
+                return arg
+        return None
 
+    def configure(self, command: str = None):
+        self.projet_parser = ProjectParser(self.subparsers)
         self.task_parser = TaskParser(self.subparsers)
-        self.task_parser.configure()
+        self.sync_parser = SyncParser(self.subparsers)
+        self.search_parser = SearchParser(self.subparsers)
+        self.daemon_parser = DaemonParser(self.subparsers)
+        self.completion_parser = CompletionParser(self.subparsers)
+        self.flush_parser = FlushParser(self.subparsers)
+        self.export_parser = ExportParser(self.subparsers)
+        self.batch_parser = BatchParser(self.subparsers)
+        self.board_parser = BoardParser(self.subparsers)
+
+        # subcommands are only built for the command being run
+        if command in ProjectParser.names:
+            self.projet_parser.configure()
+        if command in TaskParser.names:
+            self.task_parser.configure()
+        if command in SyncParser.names:
+            self.sync_parser.configure()
+        if command in SearchParser.names:
+            self.search_parser.configure()
+        if command in DaemonParser.names:
+            self.daemon_parser.configure()
+        if command in CompletionParser.names:
+            self.completion_parser.configure()
+        if command in FlushParser.names:
+            self.flush_parser.configure()
+        if command in ExportParser.names:
+            self.export_parser.configure()
+        if command in BatchParser.names:
+            self.batch_parser.configure()
+        if command in BoardParser.names:
+            self.board_parser.configure()
 
     def parse_args(self):
-        args = self.parser.parse_args()
+        args = self.parser.parse_args(self.argv)
         if not args.command:
             print(ROOT_USAGE)
             exit(1)
@@ -40,4 +117,7 @@ class Parser:
         if args.command.startswith("t") and not args.option:
             print(TASK_USAGE)
             exit(3)
+
+        if getattr(args, "fields", None) and args.format == "text":
+            self.parser.error("--fields needs --format json, ndjson, csv or tsv")
         return args
\ No newline at end of file
@@ -1,6 +1,9 @@
+from .options import add_format_arguments
 
 
 class ProjectParser:
+    # command name and aliases
+    names = ("project", "p")
 
     def __init__(self, subparsers):
         self.subparsers = subparsers
@@ -20,6 +23,14 @@ class ProjectParser:
         list_parser = project_subparsers.add_parser(
             "list", aliases=["l", "ls"], description="List project by their type"
         )
+        list_parser.add_argument(
+            "-L",
+            "--local",
+            "--offline",
+            action="store_true",
+            help="read from the local mirror (see: meistertask sync)",
+        )
+        add_format_arguments(list_parser)
         list_group = list_parser.add_mutually_exclusive_group()
         list_group.add_argument(
             "-a",
@@ -50,20 +61,29 @@ class ProjectParser:
         view_parser = project_subparsers.add_parser(
             "view", aliases=["v", "show", "display"], description="View project details"
         )
-        view_parser.add_argument("name", help="project name")
+        view_parser.add_argument("name", help="project name or id (1234, #1234)")
+        view_parser.add_argument(
+            "-L",
+            "--local",
+            "--offline",
+            action="store_true",
+            help="read from the local mirror (see: meistertask sync)",
+        )
+
+        add_format_arguments(view_parser)
 
         update_project = project_subparsers.add_parser(
             "update", aliases=['u', 'e', "edit"], description="Update project name or description"
         )
-        update_project.add_argument("name", help="project name")
+        update_project.add_argument("name", help="project name or id")
         
 
         delete_parser = project_subparsers.add_parser(
             "delete", aliases=["d", "rm", "del", "remove"], description="Delete a project"
         )
-        delete_parser.add_argument("name", help="project name")
+        delete_parser.add_argument("name", help="project name or id")
 
         archive_parser = project_subparsers.add_parser(
             "archive", description="Archive a projet"
         )
-        archive_parser.add_argument("name", help="project name")
\ No newline at end of file
+        archive_parser.add_argument("name", help="project name or id")
\ No newline at end of file
@@ -0,0 +1,37 @@
+from .options import add_format_arguments
+
+
+class SearchParser:
+    # command name and aliases
+    names = ("search", "s")
+
+    def __init__(self, subparsers):
+        self.subparsers = subparsers
+        self.parser = self.subparsers.add_parser(
+            "search",
+            aliases=["s"],
+            description=(
+                "Search task names and notes across every project. "
+                'Words must all match, use "quoted words" for a phrase and word* for a prefix'
+            ),
+        )
+
+    def configure(self):
+        self.parser.add_argument("query", nargs="+", help="words to search")
+        self.parser.add_argument(
+            "-n", "--limit", type=int, default=20, help="maximum number of results"
+        )
+        self.parser.add_argument(
+            "--max-age",
+            type=float,
+            default=600,
+            help="refresh projects not synced for that many seconds (default: 600)",
+        )
+        self.parser.add_argument(
+            "-L",
+            "--local",
+            "--offline",
+            action="store_true",
+            help="search the local mirror as is, without refreshing it",
+        )
+        add_format_arguments(self.parser)
@@ -0,0 +1,17 @@
+class SyncParser:
+    # command name and aliases
+    names = ("sync",)
+
+    def __init__(self, subparsers):
+        self.subparsers = subparsers
+        self.parser = self.subparsers.add_parser(
+            "sync",
+            description="Copy projects, sections and tasks into the local mirror",
+        )
+
+    def configure(self):
+        self.parser.add_argument(
+            "--full",
+            action="store_true",
+            help="download every task again, dropping deleted ones",
+        )
@@ -1,4 +1,10 @@
+from .options import add_format_arguments
+
+
 class TaskParser:
+    # command name and aliases
+    names = ("task", "t")
+
     def __init__(self, subparsers):
         self.subparsers = subparsers
         self.parser = self.subparsers.add_parser(
@@ -11,18 +17,27 @@ class TaskParser:
         task_subparsers = self.parser.add_subparsers(
             title="Task commands",
             dest="option",
-            metavar="[create, list, update, delete, move]",
+            metavar="[create, list, update, delete, move, import]",
         )
         create_task = task_subparsers.add_parser(
             "create", aliases=["c"], description="Create new task"
         )
         create_task.add_argument("name", help="task name")
         create_task.add_argument("-d", "--description", help="task description")
-        create_task.add_argument("project", help="project name")
+        create_task.add_argument("-s", "--section", help="section of the task (asked when not given)")
+        create_task.add_argument("project", help="project name or id")
         list_tasks = task_subparsers.add_parser(
             "list", aliases=["l", "ls"], description="List tasks by section"
         )
-        list_tasks.add_argument("project", help="project name")
+        list_tasks.add_argument("project", help="project name or id (1234, #1234)")
+        list_tasks.add_argument(
+            "-L",
+            "--local",
+            "--offline",
+            action="store_true",
+            help="read from the local mirror (see: meistertask sync)",
+        )
+        add_format_arguments(list_tasks)
         list_task_group = list_tasks.add_mutually_exclusive_group(required=True)
         list_task_group.add_argument(
             "-a",
@@ -59,12 +74,44 @@ class TaskParser:
         update_task = task_subparsers.add_parser(
             "update", aliases=["u", "e", "edit"], description="Update task details"
         )
-        update_task.add_argument("name", help="task name")
-        update_task.add_argument("project", help="project name")
+        update_task.add_argument("name", help="task name, id (1234, #1234) or project/name")
+        update_task.add_argument(
+            "project", nargs="?", help="project name or id, not needed with a task id"
+        )
 
         move_task = task_subparsers.add_parser(
-            "move", aliases=["m", "mv"], description="Move task to new section"
+            "move", aliases=["m", "mv"], description="Move tasks to new section"
+        )
+        move_task.add_argument(
+            "names", nargs="*", metavar="name", help="task names, ids (1234, #1234) or project/name"
+        )
+        move_task.add_argument("section", help="target section (open, inprogress, done ...)")
+        move_task.add_argument("project", help="project name or id")
+        move_task.add_argument(
+            "--from-section", help="move the tasks of this section (with or without names)"
+        )
+        move_task.add_argument(
+            "--older-than",
+            metavar="AGE",
+            help="move tasks not updated for AGE: 14d, 12h, 30m",
+        )
+        move_task.add_argument(
+            "-n", "--dry-run", action="store_true", help="list the tasks to move, without moving"
+        )
+        move_task.add_argument(
+            "-w", "--workers", type=int, default=8, help="number of tasks moved at once"
+        )
+
+        import_tasks = task_subparsers.add_parser(
+            "import", aliases=["i"], description="Import tasks from a CSV, JSONL or JSON file"
+        )
+        import_tasks.add_argument(
+            "file", help="CSV, JSONL or JSON file with name, description and section fields"
+        )
+        import_tasks.add_argument("project", help="project name or id")
+        import_tasks.add_argument(
+            "-s", "--section", help="section of rows without one (default: first section)"
+        )
+        import_tasks.add_argument(
+            "-w", "--workers", type=int, default=8, help="number of tasks created at once"
         )
-        move_task.add_argument("name", help="task name")
-        move_task.add_argument("section", choices=["open", "inprogess", "done"])
-        move_task.add_argument("project", help="project name")
\ No newline at end of file
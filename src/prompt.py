@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+"""Questions asked while a command runs, and who answers them.
+
+Every prompt of the cli goes through ask, confirm or choose. By default
+they read the terminal. Processes without one change the policy:
+
+    POLICY = "ask"     read stdin, end of input stops the command
+    POLICY = "fail"    raise NoAnswer (daemon, batch)
+    PICK_BEST = True   a selection among name matches takes the first, best one
+                       (other selections, e.g. a section, still need an answer)
+    ASSUME_YES = True  a confirmation is answered yes
+
+Questions, choices and name resolution errors are written to stdout, or to
+the stream given by prompting_to: stderr, while a command writes records
+(--format json ...).
+"""
+
+import sys
+import threading
+from contextlib import contextmanager
+from typing import List
+
+from .utils import RED, YELLOW, END
+
+POLICY = "ask"
+PICK_BEST = False
+ASSUME_YES = False
+
+# stream of the prompts, per thread: parallel batch commands have their own
+_local = threading.local()
+
+
+class NoAnswer(BaseException):
+    """A prompt was reached and nobody can answer it
+
+    A BaseException, so that commands catching errors do not swallow it.
+    """
+
+    def __init__(self, question: str):
+        super().__init__(question.strip())
+        self.question = question.strip()
+
+
+@contextmanager
+def answering(policy: str = "fail", pick_best: bool = False, assume_yes: bool = False):
+    """Answer the prompts of the block with a policy, restoring the previous one"""
+    global POLICY, PICK_BEST, ASSUME_YES
+
+    previous = POLICY, PICK_BEST, ASSUME_YES
+    POLICY, PICK_BEST, ASSUME_YES = policy, pick_best, assume_yes
+    try:
+        yield
+    finally:
+        POLICY, PICK_BEST, ASSUME_YES = previous
+
+
+@contextmanager
+def prompting_to(stream):
+    """Write the prompts of the block to a stream"""
+    previous = getattr(_local, "stream", None)
+    _local.stream = stream
+    try:
+        yield
+    finally:
+        _local.stream = previous
+
+
+def output():
+    """Stream of the prompts"""
+    return getattr(_local, "stream", None) or sys.stdout
+
+
+def ask(question: str) -> str:
+    """Answer of the user to a question"""
+    if POLICY != "ask":
+        raise NoAnswer(question)
+
+    stream = output()
+    try:
+        if stream is sys.stdout:
+            return input(question)
+        stream.write(question)
+        stream.flush()
+        return input()
+    except EOFError:
+        # stdin is closed or exhausted, asking again would loop forever
+        print(f"\n{RED}No answer to: {question.strip()}{END}", file=stream)
+        exit(1)
+
+
+def confirm(question: str) -> bool:
+    """Yes or no answer to a question"""
+    if ASSUME_YES:
+        return True
+
+    while True:
+        choice: str = ask(f"{question} [y/n] ").strip().lower()
+        if choice in ("y", "yes"):
+            return True
+        if choice in ("n", "no"):
+            return False
+        print(f"{RED}Valid choices: [y, yes / n, no]{END}", file=output())
+
+
+def choose(kind: str, names: List[str], ranked: bool = True) -> int:
+    """Index of the item selected among several matches, best match first
+
+    Params:
+    kind(str) project, section, task ...
+    names: names of the matches
+    ranked(bool) names are matches of a name, best first: PICK_BEST takes the first
+    """
+    if PICK_BEST and ranked:
+        return 0
+
+    stream = output()
+    for index, name in enumerate(names):
+        print(f"\t[{index}] {name}", file=stream)
+    print(f"{YELLOW}Multiple {kind}s are found, select one.{END}", file=stream)
+
+    while True:
+        try:
+            choice = int(ask(f"[?] {kind.capitalize()} id: "))
+            if 0 <= choice < len(names):
+                return choice
+        except ValueError:
+            pass
+        print(f"{RED}Select valid {kind} id{END}", file=stream)
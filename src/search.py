@@ -0,0 +1,232 @@
+#!/usr/bin/python3
+
+import heapq
+import json
+import math
+import re
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+from .models import Task
+from .names import tokenize
+
+# fields of a task in the index, with their weight in the score
+NAME, NOTES = 0, 1
+FIELD_WEIGHTS = {NAME: 2.0, NOTES: 1.0}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    term TEXT NOT NULL,
+    task_id INTEGER NOT NULL,
+    field INTEGER NOT NULL,
+    positions TEXT NOT NULL,
+    PRIMARY KEY (term, task_id, field)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS terms_task ON terms (task_id);
+CREATE TABLE IF NOT EXISTS documents (
+    task_id INTEGER PRIMARY KEY,
+    name_length INTEGER NOT NULL,
+    notes_length INTEGER NOT NULL
+);
+"""
+
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+# postings of a query clause: task id -> field -> positions
+Postings = Dict[int, Dict[int, List[int]]]
+
+# ids bound per query, below the SQLite variable limit
+CHUNK_SIZE = 500
+
+
+def chunks(items: List, size: int = CHUNK_SIZE) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def latest_versions(tasks: List[Task]) -> List[Task]:
+    """Tasks with one version each, the latest: a task changed while a sync
+    walks the listing shows up on two pages"""
+    latest: Dict[int, Task] = {}
+    for task in tasks:
+        seen: Task = latest.get(task.id)
+        if seen is None or (task.updated_at or "") >= (seen.updated_at or ""):
+            latest[task.id] = task
+    return list(latest.values())
+
+
+def parse_query(query: str) -> List[Tuple[str, List[str]]]:
+    """Split a query into clauses: ("term", [word]), ("prefix", [word]) or ("phrase", words)
+
+    Example: 'login "reset password" api*'
+    """
+    clauses: List[Tuple[str, List[str]]] = []
+    for phrase, word in QUERY_PATTERN.findall(query):
+        if phrase:
+            words: List[str] = tokenize(phrase)
+            if len(words) == 1:
+                clauses.append(("term", words))
+            elif words:
+                clauses.append(("phrase", words))
+        elif word.endswith("*") and tokenize(word):
+            clauses.append(("prefix", tokenize(word)[:1]))
+        else:
+            clauses.extend(("term", [w]) for w in tokenize(word))
+    return clauses
+
+
+class SearchIndex:
+    """Inverted index of task names and notes, stored next to the mirror.
+
+    Params:
+    connection(sqlite3.Connection) database of the mirror
+    lock(threading.Lock) lock guarding writes to the database
+    """
+
+    def __init__(self, connection: sqlite3.Connection, lock: threading.Lock):
+        self.connection = connection
+        self.lock = lock
+        self.connection.executescript(SCHEMA)
+
+    @staticmethod
+    def _postings(task: Task) -> Iterable[Tuple]:
+        for field, text in ((NAME, task.name), (NOTES, task.notes)):
+            positions: Dict[str, List[int]] = {}
+            for position, word in enumerate(tokenize(text or "")):
+                positions.setdefault(word, []).append(position)
+            for word, found in positions.items():
+                yield word, task.id, field, ",".join(map(str, found))
+
+    def update(self, tasks: List[Task]):
+        """(Re)index tasks, replacing what was indexed for them"""
+        tasks = latest_versions(tasks)
+        ids = [(t.id,) for t in tasks]
+        postings = [posting for task in tasks for posting in self._postings(task)]
+        documents = [
+            (t.id, len(tokenize(t.name or "")), len(tokenize(t.notes or "")))
+            for t in tasks
+        ]
+
+        with self.lock, self.connection:
+            self.connection.executemany("DELETE FROM terms WHERE task_id = ?", ids)
+            self.connection.executemany("INSERT INTO terms VALUES (?, ?, ?, ?)", postings)
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?)", documents
+            )
+
+    def delete(self, task_ids: List[int]):
+        """Drop tasks from the index, in the transaction of the caller (holding the lock)"""
+        ids = [(id,) for id in task_ids]
+        self.connection.executemany("DELETE FROM terms WHERE task_id = ?", ids)
+        self.connection.executemany("DELETE FROM documents WHERE task_id = ?", ids)
+
+    @property
+    def empty(self) -> bool:
+        return self.connection.execute("SELECT 1 FROM documents LIMIT 1").fetchone() is None
+
+    def rebuild(self):
+        """Index every mirrored task, for mirrors synced before the index existed"""
+        rows = self.connection.execute("SELECT data FROM tasks").fetchall()
+        self.update([Task(json.loads(data)) for (data,) in rows])
+
+    # queries
+
+    def _lookup(self, query: str, params: Tuple) -> Postings:
+        postings: Postings = {}
+        for task_id, field, positions in self.connection.execute(query, params):
+            found: List[int] = postings.setdefault(task_id, {}).setdefault(field, [])
+            found.extend(int(p) for p in positions.split(","))
+        return postings
+
+    def _term(self, word: str) -> Postings:
+        return self._lookup("SELECT task_id, field, positions FROM terms WHERE term = ?", (word,))
+
+    def _prefix(self, prefix: str) -> Postings:
+        # range scan on the primary key
+        return self._lookup(
+            "SELECT task_id, field, positions FROM terms WHERE term >= ? AND term < ?",
+            (prefix, prefix + "\U0010ffff"),
+        )
+
+    def _phrase(self, words: List[str]) -> Postings:
+        postings: List[Postings] = [self._term(word) for word in words]
+        matched: Postings = {}
+
+        for task_id in set.intersection(*(set(p) for p in postings)):
+            for field, starts in postings[0][task_id].items():
+                following = [set(p[task_id].get(field, ())) for p in postings[1:]]
+                found = [
+                    start
+                    for start in starts
+                    if all(start + offset in positions for offset, positions in enumerate(following, 1))
+                ]
+                if found:
+                    matched.setdefault(task_id, {})[field] = found
+        return matched
+
+    def _statistics(self) -> Tuple[int, Dict[int, float]]:
+        total, name_length, notes_length = self.connection.execute(
+            "SELECT COUNT(*), AVG(name_length), AVG(notes_length) FROM documents"
+        ).fetchone()
+        return total, {NAME: name_length or 1.0, NOTES: notes_length or 1.0}
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[float, Dict, str]]:
+        """Find tasks matching every clause of query, best first (BM25)
+
+        Return:
+            score, task and project name of the best `limit` matches
+        """
+        clauses = parse_query(query)
+        if not clauses:
+            return []
+
+        lookups = {
+            "term": lambda words: self._term(words[0]),
+            "prefix": lambda words: self._prefix(words[0]),
+            "phrase": self._phrase,
+        }
+        postings: List[Postings] = [lookups[kind](words) for kind, words in clauses]
+
+        candidates = set.intersection(*(set(p) for p in postings))
+        if not candidates:
+            return []
+
+        total, average = self._statistics()
+        lengths: Dict[int, Tuple[int, int]] = {}
+        for chunk in chunks(list(candidates)):
+            for task_id, name_length, notes_length in self.connection.execute(
+                "SELECT task_id, name_length, notes_length FROM documents"
+                f" WHERE task_id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ):
+                lengths[task_id] = (name_length, notes_length)
+
+        scores: Dict[int, float] = dict.fromkeys(candidates, 0.0)
+        for clause in postings:
+            idf: float = math.log(1 + (total - len(clause) + 0.5) / (len(clause) + 0.5))
+            for task_id in candidates:
+                for field, positions in clause[task_id].items():
+                    length: int = lengths.get(task_id, (1, 1))[field]
+                    tf: int = len(positions)
+                    norm: float = tf + K1 * (1 - B + B * length / average[field])
+                    scores[task_id] += FIELD_WEIGHTS[field] * idf * tf * (K1 + 1) / norm
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        if not best:
+            return []
+
+        rows = self.connection.execute(
+            "SELECT tasks.id, tasks.data, projects.name FROM tasks"
+            " LEFT JOIN projects ON projects.id = tasks.project_id"
+            f" WHERE tasks.id IN ({','.join('?' * len(best))})",
+            tuple(task_id for task_id, _ in best),
+        )
+        found: Dict[int, Tuple[Dict, str]] = {
+            task_id: (Task(json.loads(data)), project) for task_id, data, project in rows
+        }
+        return [(score, *found[task_id]) for task_id, score in best if task_id in found]
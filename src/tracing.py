@@ -0,0 +1,178 @@
+#!/usr/bin/python3
+"""Timing of the requests, json decoding and rendering of one command.
+
+Off unless --stats or --trace is given: `span` then returns a shared no-op
+context manager, so instrumented code costs a global lookup.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+
+class Span:
+    """Timed block, recorded when it exits"""
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def set(self, **args):
+        self.args.update(args)
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is not None:
+            self.args.setdefault("error", exc_type.__name__)
+        self.tracer.record(
+            self.name, self.category, self.start, time.perf_counter() - self.start, self.args
+        )
+
+
+class NullSpan:
+    def set(self, **args):
+        pass
+
+    def __enter__(self) -> "NullSpan":
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class Tracer:
+    """Events of one command, summed up by category and name"""
+
+    def __init__(self):
+        self.origin: float = time.perf_counter()
+        self.events: List[Dict] = []
+        self.totals: Dict[Tuple[str, str], Dict] = {}
+        # callables adding their lines to the report (e.g. the connections of a session)
+        self.sources: List[Callable[[], List[str]]] = []
+        self.lock = threading.Lock()
+
+    def span(self, name: str, category: str, **args) -> Span:
+        return Span(self, name, category, args)
+
+    def report_from(self, source: Callable[[], List[str]]):
+        """Add the lines returned by source, when the report is written"""
+        with self.lock:
+            self.sources.append(source)
+
+    def record(
+        self, name: str, category: str, start: float, duration: float, args: Dict = None,
+        busy: float = None,
+    ):
+        """Add an event
+
+        Params:
+        name(str) e.g. "GET /api/projects/{id}/tasks"
+        category(str) http, cache, decode, render or command
+        start(float) perf_counter() at the start of the event
+        duration(float) seconds
+        args(dict) details: status, bytes, retries, records ...
+        busy(float) seconds actually spent, when less than the duration
+        """
+        args = args or {}
+        with self.lock:
+            total = self.totals.setdefault(
+                (category, name), {"count": 0, "time": 0.0, "max": 0.0, "bytes": 0, "errors": 0, "retries": 0}
+            )
+            total["count"] += 1
+            total["time"] += duration if busy is None else busy
+            total["max"] = max(total["max"], duration if busy is None else busy)
+            total["bytes"] += args.get("bytes") or 0
+            total["errors"] += int(args.get("status", 0) >= 400 or "error" in args)
+            total["retries"] += args.get("retries", 0)
+
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": round((start - self.origin) * 1e6, 1),
+                    "dur": round(duration * 1e6, 1),
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                    "args": args,
+                }
+            )
+
+    def write_trace(self, path: str):
+        """Chrome trace-event file, open it in chrome://tracing or ui.perfetto.dev"""
+        with self.lock:
+            events: List[Dict] = list(self.events)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def report(self, stream=None):
+        """Table of the time spent per request and phase"""
+        stream = stream if stream is not None else sys.stderr
+        wall: float = time.perf_counter() - self.origin
+        with self.lock:
+            totals = sorted(self.totals.items(), key=lambda item: -item[1]["time"])
+            sources: List[Callable[[], List[str]]] = list(self.sources)
+
+        lines: List[str] = [
+            f"\n{'':40} {'count':>6} {'errors':>6} {'retries':>7} {'bytes':>8}"
+            f" {'total':>9} {'max':>9}"
+        ]
+        for category in ("http", "cache", "decode", "render"):
+            for (cat, name), total in totals:
+                if cat != category:
+                    continue
+                lines.append(
+                    f"{category + ' ' + name:40.40} {total['count']:6} {total['errors']:6}"
+                    f" {total['retries']:7} {human_bytes(total['bytes']):>8}"
+                    f" {total['time'] * 1000:7.1f}ms"
+                    f" {total['max'] * 1000:7.1f}ms"
+                )
+
+        for source in sources:
+            lines.extend(source())
+        requests: int = sum(t["count"] for (cat, _), t in totals if cat == "http")
+        lines.append(f"{requests} requests, {wall:.3f}s wall time")
+        stream.write("\n".join(lines) + "\n")
+
+
+def human_bytes(size: int) -> str:
+    if not size:
+        return "-"
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+# the tracer of this process, set by --stats / --trace
+TRACER: Tracer = None
+
+
+def enable() -> Tracer:
+    global TRACER
+    TRACER = Tracer()
+    return TRACER
+
+
+def span(name: str, category: str, **args):
+    """Time a block when tracing is on
+
+        with span("GET /api/projects", "http") as s:
+            ...
+            s.set(status=200)
+    """
+    if TRACER is None:
+        return NULL_SPAN
+    return TRACER.span(name, category, **args)
@@ -7,10 +7,19 @@ USAGE:
 CORE COMMANDS
     project:    Manage project
     task:       Manage tasks of specific project
+    sync:       Copy projects, sections and tasks into the local mirror
+    search:     Search tasks across every project
+    board:      Browse a project and move its tasks in the terminal
+    flush:      Send the task changes queued while offline
+    export:     Export every project, its sections and tasks
+    batch:      Run the commands of a file in one process
+    daemon:     Keep connections and cached data warm for the next commands
+    completion: Print the shell completion script (bash, zsh, fish)
 
 CORE COMMANDS ALIASES:
     project:    p
     task:       t
+    search:     s
 """
 
 
@@ -41,11 +50,13 @@ SUBCOMMANDS
     create:     Create taks
     list:       List tasks by section
     update:     Update task name and description
-    move:       Move task to another section
+    move:       Move tasks to another section
+    import:     Import tasks from a CSV, JSONL or JSON file
 
 SUBCOMMANDS ALIASES:
     create:     c
     list:       l, ls
     update:     u, e, edit
     move:       m, mv
+    import:     i
 """
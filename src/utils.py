@@ -1,9 +1,8 @@
 #!/usr/bin/python3
 
-from typing import Dict, List, Set
+from typing import Dict, Iterable, Iterator, List
 import os
-import re
-import textwrap
+import sys
 
 GREEN = "\33[32m"
 RED = "\33[31m"
@@ -16,81 +15,142 @@ END = "\33[0m"
 
 
 def format_datetime(datetime: str):
+    if not datetime:
+        return "-"
     date, time = datetime.split("T")
 
     return f"{date} {time.split('.')[0]}"
 
 
-def display_project(project: Dict, details=True, summary=False):
-    project_id: int = project["id"]
-    name: str = project["name"]
-    description: str = project["notes"]
-    created_at: str = format_datetime(project["created_at"])
-    updated_at: str = format_datetime(project["updated_at"])
+class BlockWriter:
+    """Write rendered blocks to stdout, a whole block per write.
 
-    if summary:
-        print("")
-        print(f"> {CYAN}Project Name {END} ({project_id}) : {name}")
-        print(f"> {CYAN}Project Description{END}: {description}")
+    On a terminal every block is written as soon as it is rendered. Otherwise
+    (pipe, file) blocks are joined and written `chunk` at a time.
+    """
 
-    else:
-        print("")
-        print(f"> {CYAN}Project Id{END}: {project_id}")
-        print(f"> {CYAN}Project Name{END}: {name}")
-        print(f"> {CYAN}Project Description{END}: {description}")
-        print(f"> {CYAN}Created at{END}: {created_at}")
-        print(f"> {CYAN}Updated at{END}: {updated_at} ")
+    def __init__(self, stream=None, chunk: int = 256):
+        self.stream = stream if stream is not None else sys.stdout
+        self.interactive: bool = self.stream.isatty()
+        self.chunk = chunk
+        self.blocks: List[str] = []
+
+    def write(self, block: str):
+        if self.interactive:
+            self.stream.write(block)
+            return
+
+        self.blocks.append(block)
+        if len(self.blocks) >= self.chunk:
+            self.flush()
 
+    def flush(self):
+        if self.blocks:
+            self.stream.write("".join(self.blocks))
+            self.blocks = []
 
-def display_task(task: Dict, long_format=True):
+    def __enter__(self):
+        return self
 
-    task_id: int = task["id"]
-    name: str = task["name"]
-    description: str = task["notes"]
-    section: str = task["section_name"]
-    created_at: str = format_datetime(task["created_at"])
+    def __exit__(self, *exc_info):
+        self.flush()
+
+
+def render_project(project: "Project", summary=False) -> str:
+    project_id: int = project.id
+    name: str = project.name
+    description: str = project.notes
+
+    if summary:
+        return (
+            f"\n> {CYAN}Project Name {END} ({project_id}) : {name}"
+            f"\n> {CYAN}Project Description{END}: {description}\n"
+        )
+
+    created_at: str = format_datetime(project.created_at)
+    updated_at: str = format_datetime(project.updated_at)
+    return (
+        f"\n> {CYAN}Project Id{END}: {project_id}"
+        f"\n> {CYAN}Project Name{END}: {name}"
+        f"\n> {CYAN}Project Description{END}: {description}"
+        f"\n> {CYAN}Created at{END}: {created_at}"
+        f"\n> {CYAN}Updated at{END}: {updated_at} \n"
+    )
+
+
+def render_task(task: "Task", long_format=True) -> str:
+    task_id: int = task.id
+    name: str = task.name
+    description: str = task.notes
 
     if long_format:
-        print("")
-        print(f"> {CYAN}Task Id{END} : {task_id}")
-        print(f"> {CYAN}Task Name{END} : {name}")
+        section: str = task.section_name
+        created_at: str = format_datetime(task.created_at)
+        lines: List[str] = ["", f"> {CYAN}Task Id{END} : {task_id}", f"> {CYAN}Task Name{END} : {name}"]
         if description:
-            print(f"> {CYAN}Description{END} : {description}")
-        print(f"> {CYAN}Section{END} : {section}")
-        print(f"> {CYAN}Created{END} : {created_at}")
+            lines.append(f"> {CYAN}Description{END} : {description}")
+        lines.append(f"> {CYAN}Section{END} : {section}")
+        lines.append(f"> {CYAN}Created{END} : {created_at}")
     else:
-        print("")
-        print(f"\t\t> {YELLOW}Task{END} ({task_id}) : {name}")
+        lines: List[str] = ["", f"\t\t> {YELLOW}Task{END} ({task_id}) : {name}"]
         if description:
-            print(f"\t\t> {YELLOW}Description{END} :")
-            print(wrap_text(description, width=50, tabs=3))
+            lines.append(f"\t\t> {YELLOW}Description{END} :")
+            lines.append(wrap_text(description, width=50, tabs=3))
+
+    lines.append("")
+    return "\n".join(lines)
+
+
+def render_search_result(task: Dict, project_name: str) -> str:
+    return (
+        f"\n> {CYAN}{project_name}{END} / {task['section_name']} ({task['id']}) : {task['name']}\n"
+    )
+
+
+def display_project(project: Dict, details=True, summary=False, writer: BlockWriter = None):
+    block: str = render_project(project, summary)
+    if writer is not None:
+        writer.write(block)
+    else:
+        sys.stdout.write(block)
 
 
-def display_detailed_project(project: Dict, sections: List[Dict], tasks: List[Dict]):
+def display_task(task: Dict, long_format=True, writer: BlockWriter = None):
+    block: str = render_task(task, long_format)
+    if writer is not None:
+        writer.write(block)
+    else:
+        sys.stdout.write(block)
+
+
+def display_detailed_project(project: Dict, sections: List[Dict], tasks: Iterable[Dict]):
     """Given a project, it's sections and tasks,
     group tasks by section and display them
     """
 
-    # display project summary
-    display_project(project, summary=True)
+    # group tasks by section in one pass
+    tasks_by_section: Dict[int, List[Dict]] = {}
+    for task in tasks:
+        tasks_by_section.setdefault(task["section_id"], []).append(task)
 
-    # display tasks grouped by sections
-    for section in sections:
-        tasks_by_section: List[Dict] = list(
-            filter(lambda task: task["section_id"] == section["id"], tasks)
-        )
+    with BlockWriter() as writer:
+        # display project summary
+        display_project(project, summary=True, writer=writer)
 
-        if len(tasks_by_section):
-            section_name: str = section["name"]
-            total_sections: int = len(tasks_by_section)
+        # display tasks grouped by sections
+        for section in sections:
+            section_tasks: List[Dict] = tasks_by_section.get(section["id"])
+            if not section_tasks:
+                continue
 
-            print(
-                f"\t> {PURPLE}Section:{END}: {section_name} ({YELLOW}{total_sections} tasks{END})"
-            )
-            for task in tasks_by_section:
-                display_task(task, long_format=False)
-            else:
-                print("")
+            section_name: str = section["name"]
+            total_tasks: int = len(section_tasks)
+            blocks: List[str] = [
+                f"\t> {PURPLE}Section:{END}: {section_name} ({YELLOW}{total_tasks} tasks{END})\n"
+            ]
+            blocks.extend(render_task(task, long_format=False) for task in section_tasks)
+            blocks.append("\n")
+            writer.write("".join(blocks))
 
 
 def get_auth_key():
@@ -106,47 +166,47 @@ def get_auth_key():
         exit(1)
 
 
+def section_key(name: str) -> str:
+    """Comparable section name: "In Progress", "inprogress" and "inprogess" match"""
+    key: str = "".join(name.lower().split())
+    return "inprogress" if key == "inprogess" else key
+
+
 def filter_sections_by_name(sections: List[Dict], name: str) -> Dict:
     """Filter section by name and return only one or not"""
 
-    callback = lambda section: section["name"].lower().strip() == name.lower().strip()
+    callback = lambda section: section_key(section["name"]) == section_key(name)
     filtered: List[Dict] = list(filter(callback, sections))
     return filtered[0] if len(filtered) else None
 
 
+# --older-than units, in seconds
+AGE_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
 
-def match_names(name1: str, name2: str) -> bool:
-    """Given two name, typically a project or task name. check if they are the same.
-    First step: lowercase all letter and strip any leading whitespace then check equality.
-    Second step: splits names by whitespace into two sets, and check if there is an intersection.
-    Third step: chech matching using regular express wich has a low quality.
-
-    Parameter:
-        name1: First name to match
-        name2: Second name to match
-    Return:
-        True if names matchs, otherwise False
-    """
-    name1 = name1.strip().lower()
-    name2 = name2.strip().lower()
 
-    if name1 == name2:
-        return True
-
-    words1: Set = set(name1.split(" "))
-    words2: Set = set(name2.split(" "))
+def parse_age(age: str) -> float:
+    """14d, 12h, 30m, 2w -> seconds"""
+    age = age.strip().lower()
+    try:
+        return float(age[:-1]) * AGE_UNITS[age[-1]]
+    except (KeyError, ValueError, IndexError):
+        print(f"{RED}Invalid age: {age} (expected e.g. 14d, 12h, 30m){END}")
+        exit(1)
 
-    if len(words1.intersection(words2)):
-        return True
 
-    if re.match(name1, name2):
-        return True
+def age_of(at) -> float:
+    """Seconds elapsed since a datetime, e.g. task.updated, 0 when unknown (None)"""
+    if at is None:
+        return 0.0
+    from datetime import datetime, timezone
 
-    return False
+    return (datetime.now(timezone.utc) - at).total_seconds()
 
 
 def wrap_text(text: str, width=50, tabs=2):
     if text:
+        import textwrap
+
         text: List[str] = textwrap.wrap(text, width=width)
         leading_tabs: str = tabs * "\t"
         text = ["".join([leading_tabs, line]) for line in text]
@@ -164,18 +224,9 @@ def select_one_project(projects: List[Dict]) -> Dict:
     if len(projects) == 1:
         return projects[0]
 
-    # Display available projects
-    for index, project in enumerate(projects):
-        print(f'\t[{index}] {project["name"]}')
-    print(f"{YELLOW}Multiple projects are found, select one.{END}")
+    from .prompt import choose
 
-    while True:
-        try:
-            choice = int(input("[?] Project id: "))
-            if choice >= 0 and choice < len(projects):
-                return projects[choice]
-        except:
-            print(f"{RED}Select valid project id{END}")
+    return projects[choose("project", [p["name"] for p in projects])]
 
 
 def select_one_section(sections: List[Dict]) -> Dict:
@@ -186,18 +237,10 @@ def select_one_section(sections: List[Dict]) -> Dict:
     if len(sections) == 1:
         return sections[0]
 
-    # display available sections
-    for index, section in enumerate(sections):
-        print(f'\t[{index}] {section["name"]}')
-    print(f"{YELLOW}Multiple sections are fond, select one.{END}")
+    from .prompt import choose
 
-    while True:
-        try:
-            choice = int(input("[?] Section id: "))
-            if choice >= 0 and choice < len(sections):
-                return sections[choice]
-        except:
-            print(f"{RED}Select valid section id{END}")
+    # every section of the project, not matches of a name: no best one
+    return sections[choose("section", [s["name"] for s in sections], ranked=False)]
 
 
 def select_one_task(tasks: List[Dict]) -> Dict:
@@ -209,26 +252,34 @@ def select_one_task(tasks: List[Dict]) -> Dict:
     if len(tasks) == 1:
         return tasks[0]
 
-    # Display available task
-    for index, task in enumerate(tasks):
-        print(f'[{index}] {task["name"]}')
-    print(f"{YELLOW}Multiple tasks are found, select one.{END}")
+    from .prompt import choose
+
+    return tasks[choose("task", [t["name"] for t in tasks])]
+
+
+def filter_tasks_by_section(tasks: Iterable["Task"], section: str, raw: bool = False) -> Iterator["Task"]:
+    """Filter tasks by section, lazily
+
+    Params:
+    tasks: models, or responses of the API as dicts when raw
+    section(str) section name, "all" for every task
+    raw(bool) tasks are dicts
+    """
 
-    while True:
-        try:
-            choice = int(input("[?] Task id: "))
-            if choice >= 0 and choice < len(tasks):
-                return tasks[choice]
-        except:
-            print(f"{RED}Select valid task id{END}")
+    section = section_key(section)
+    if section == "all":
+        return iter(tasks)
 
+    # few distinct section names, each one is normalized once
+    keys: Dict[str, str] = {}
 
-def filter_tasks_by_section(tasks: List[Dict], section: str) -> List[Dict]:
-    """Filter tasks by section"""
+    def callback(task) -> bool:
+        name: str = task["section_name"] if raw else task.section_name
+        if name not in keys:
+            keys[name] = section_key(name)
+        return keys[name] == section
 
-    callback = lambda t: t["section_name"].lower().strip() == section.lower().strip()
-    filtered: List[Dict] = list(filter(callback, tasks))
-    return filtered
+    return filter(callback, tasks)
 
 def check_errors(msg: str, response: Dict):
     """Check if the reponse contains an errors.
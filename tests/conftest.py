@@ -0,0 +1,87 @@
+import importlib.util
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_benchmark(name: str):
+    """Module of benchmarks/<name>.py, the benchmarks are not a package"""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, "benchmarks", f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def new_task(id: int = 1, name: str = None, updated_at: str = "2020-01-01", **fields):
+    from src.models import Task
+
+    task = {
+        "id": id,
+        "name": f"task {id}" if name is None else name,
+        "notes": "",
+        "section_id": 10,
+        "section_name": "Open",
+        "project_id": 1,
+        "updated_at": updated_at,
+    }
+    return Task({**task, **fields})
+
+
+def new_project(id: int = 1, name: str = None, **fields):
+    from src.models import Project
+
+    return Project({"id": id, "name": f"project {id}" if name is None else name, "status": 1, **fields})
+
+
+@pytest.fixture
+def make_task():
+    """Factory of tasks: make_task(3, "fix login", section_id=11), other fields have defaults"""
+    return new_task
+
+
+@pytest.fixture
+def make_project():
+    """Factory of projects, as make_task"""
+    return new_project
+
+
+@pytest.fixture(scope="session")
+def benchmark():
+    """load_benchmark, for tests of the benchmarks or using their helpers"""
+    return load_benchmark
+
+
+def pytest_generate_tests(metafunc):
+    # one test per scenario of benchmarks/importtime.py, known before fixtures run
+    if "scenario" in metafunc.fixturenames:
+        scenarios = load_benchmark("importtime").SCENARIOS
+        metafunc.parametrize("scenario", scenarios, ids=[name for name, argv in scenarios])
+
+
+@pytest.fixture
+def stub(tmp_path, monkeypatch):
+    """Stub API (benchmarks/stub.py) the clients of the test talk to, with
+    their cache and data kept in tmp_path"""
+    stub = load_benchmark("stub")
+    server = stub.Stub(stub.Board(tasks=30, projects=3)).start()
+
+    monkeypatch.setenv("MEISTERTASK_API_URL", server.url)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    monkeypatch.setenv("MEISTERTASK_NO_DAEMON", "1")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    """Tracing of the test only, --stats and --trace leave it on"""
+    from src import tracing
+
+    monkeypatch.setattr(tracing, "TRACER", None)
+    yield
+    tracing.TRACER = None
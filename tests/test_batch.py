@@ -0,0 +1,43 @@
+import pytest
+
+from src.batch import read_only, run_batch
+from src.parser import Parser
+from src.prompt import NoAnswer, answering, choose
+
+TOKEN = "token"
+
+
+def batch(stub, tmp_path, lines, pick_best: bool = False) -> int:
+    from src.meistertask import Meistertask
+
+    path = tmp_path / "batch"
+    path.write_text("\n".join(lines) + "\n")
+    meistertask = Meistertask(TOKEN, memory=True, remember=True)
+    return run_batch(TOKEN, meistertask, str(path), pick_best=pick_best)
+
+
+def test_read_only_commands():
+    assert read_only(Parser(["project", "list"]).parse_args())
+    assert read_only(Parser(["p", "view", "board"]).parse_args())
+    assert read_only(Parser(["t", "ls", "--all", "board"]).parse_args())
+    assert not read_only(Parser(["task", "create", "fix login", "board"]).parse_args())
+    assert not read_only(Parser(["--refresh", "project", "list"]).parse_args())
+
+
+def test_pick_best_only_picks_among_name_matches():
+    with answering("fail", pick_best=True):
+        assert choose("task", ["fix login", "fix logout"]) == 0
+        with pytest.raises(NoAnswer):
+            choose("section", ["Open", "Done"], ranked=False)
+
+
+def test_readme_example(stub, tmp_path):
+    lines = ['task create "fix login" board --section open', 'task move "fix login" done board']
+    assert batch(stub, tmp_path, lines) == 0
+    [task] = [t for t in stub.board.tasks.values() if t["name"] == "fix login"]
+    assert stub.board.sections[task["section_id"]]["name"] == "Done"
+
+
+def test_section_is_never_picked(stub, tmp_path):
+    assert batch(stub, tmp_path, ['task create "fix login" board'], pick_best=True) == 1
+    assert stub.counter[("POST", "/sections/{id}/tasks")] == 0
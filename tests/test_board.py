@@ -0,0 +1,70 @@
+from src.board import Column
+
+PAGE_SIZE = 3
+
+
+def page_of(listing, column):
+    """Next page the board would load, as (tasks, page)"""
+    page = column.fetched // PAGE_SIZE + 1
+    return listing[(page - 1) * PAGE_SIZE : page * PAGE_SIZE], page
+
+
+def load_all(listing, column):
+    while not column.complete:
+        tasks, page = page_of(listing, column)
+        column.add(tasks, page, PAGE_SIZE, 0)
+
+
+def ids(column):
+    return [t["id"] for t in column.tasks]
+
+
+def test_pages_are_appended_until_a_short_one(make_task):
+    column = Column({"id": 1, "name": "Open"})
+    listing = [make_task(id) for id in range(1, 8)]
+    column.add(listing[:3], 1, PAGE_SIZE, 0)
+    assert (column.fetched, column.complete, column.title()) == (3, False, "Open (3+)")
+
+    load_all(listing, column)
+    assert ids(column) == list(range(1, 8))
+    assert column.title() == "Open (7)"
+
+
+def test_take_shifts_the_next_page_back(make_task):
+    column = Column({"id": 1, "name": "Open"})
+    listing = [make_task(id) for id in range(1, 8)]
+    column.add(listing[:3], 1, PAGE_SIZE, 0)
+    column.row = 2
+
+    # task 1 moved out: it leaves the listing of the API too
+    assert column.take(0)["id"] == 1
+    listing.pop(0)
+    assert (column.fetched, column.removed, column.row) == (2, 1, 1)
+
+    # task 4 is now the first task of page 2: the next page starts earlier
+    load_all(listing, column)
+    assert ids(column) == [2, 3, 4, 5, 6, 7]
+
+
+def test_take_while_a_page_loads(make_task):
+    column = Column({"id": 1, "name": "Open"})
+    listing = [make_task(id) for id in range(1, 11)]
+    column.add(listing[:3], 1, PAGE_SIZE, 0)
+
+    page, number = page_of(listing, column)
+    # task 2 moved out while page 2 was on its way, the listing shifted
+    column.take(1)
+    listing.pop(1)
+    column.add(page, number, PAGE_SIZE, 1)
+    assert column.fetched == 5
+
+    load_all(listing, column)
+    assert ids(column) == [1, 3, 4, 5, 6, 7, 8, 9, 10]
+
+
+def test_task_put_before_its_page_is_shown_once(make_task):
+    column = Column({"id": 2, "name": "Done"})
+    column.put(make_task(5))
+    column.add([make_task(4), make_task(5)], 1, PAGE_SIZE, 0)
+    assert ids(column) == [5, 4]
+    assert column.complete
@@ -0,0 +1,37 @@
+import pytest
+
+from src.completion import expected_kind
+
+
+@pytest.mark.parametrize(
+    "words, kind",
+    [
+        ([], "command"),
+        (["--queue"], "command"),
+        (["t"], "task option"),
+        (["project"], "project option"),
+        (["p", "v"], "project"),
+        (["task", "create"], None),
+        (["task", "create", "fix login"], "project"),
+        (["task", "mv", "fix login"], "section"),
+        (["task", "mv", "fix login", "done"], "project"),
+        (["task", "mv", "fix login", "done", "board"], None),
+        (["task", "list", "-f"], "format"),
+        (["task", "list", "--section"], "section"),
+        (["task", "list", "--fields", "id,name"], "project"),
+        (["board"], "project"),
+        (["completion"], "shell"),
+        (["sync"], None),
+    ],
+)
+def test_expected_kind(words, kind):
+    assert expected_kind(words) == kind
+
+
+def test_short_options_by_command():
+    # -d is the description of create, --done of task list
+    assert expected_kind(["task", "create", "-d"]) is None
+    assert expected_kind(["task", "list", "-d"]) == "project"
+    # -n is the limit of search, --dry-run of task move
+    assert expected_kind(["search", "-n"]) is None
+    assert expected_kind(["task", "move", "-n", "fix login"]) == "section"
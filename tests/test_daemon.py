@@ -0,0 +1,52 @@
+import threading
+
+import pytest
+
+from src import daemon
+from src.parser import Parser
+
+TOKEN = "token"
+
+
+@pytest.fixture
+def running(stub, monkeypatch):
+    """Daemon serving in a thread, stopped after the test"""
+    monkeypatch.delenv("MEISTERTASK_NO_DAEMON")
+    thread = threading.Thread(target=daemon.daemon, args=(TOKEN,), daemon=True)
+    thread.start()
+    for _ in range(100):
+        if daemon._exchange(daemon.socket_path(TOKEN), {}) is not None:
+            break
+        thread.join(0.05)
+    yield
+    daemon.daemon(TOKEN, stop=True)
+    thread.join(5)
+
+
+def forward(argv):
+    """Exit code of a command forwarded to the daemon, None when handed back"""
+    result = {}
+    thread = threading.Thread(
+        target=lambda: result.setdefault("exit_code", daemon.forward(TOKEN, Parser(argv).parse_args())),
+        daemon=True,
+    )
+    thread.start()
+    thread.join(10)
+    assert not thread.is_alive(), f"{argv} never came back from the daemon"
+    return result["exit_code"]
+
+
+def test_command_runs_in_the_daemon(running, capsys):
+    assert forward(["project", "list", "--format", "ndjson"]) == 0
+    assert '"name": "board"' in capsys.readouterr().out
+
+
+def test_prompting_command_is_handed_back(running):
+    # task create asks for a section: the daemon cannot, the cli must
+    assert forward(["task", "create", "fix login", "board"]) is None
+    # and the daemon still serves the next command
+    assert forward(["project", "list"]) == 0
+
+
+def test_no_daemon(stub):
+    assert daemon.forward(TOKEN, Parser(["project", "list"]).parse_args()) is None
@@ -0,0 +1,58 @@
+import gzip
+import json
+import os
+
+from src.export import MANIFEST, Manifest, export_account
+
+
+def touch(directory, name: str):
+    open(os.path.join(directory, name), "w").close()
+
+
+def test_interrupted_export_resumes(tmp_path, make_project):
+    manifest = Manifest(str(tmp_path))
+    touch(tmp_path, "1.ndjson.gz")
+    manifest.mark(make_project(1), "1.ndjson.gz", 2, 10)
+    manifest.mark(make_project(2), "2.ndjson.gz", 2, 10)
+
+    resumed = Manifest(str(tmp_path))
+    assert resumed.done(1)
+    # listed, but its file is gone
+    assert not resumed.done(2)
+    assert not resumed.done(3)
+
+
+def test_finished_or_restarted_export_starts_over(tmp_path, make_project):
+    manifest = Manifest(str(tmp_path))
+    touch(tmp_path, "1.ndjson.gz")
+    manifest.mark(make_project(1), "1.ndjson.gz", 2, 10)
+    assert not Manifest(str(tmp_path), restart=True).done(1)
+
+    manifest.finish()
+    assert not Manifest(str(tmp_path)).done(1)
+
+
+def test_export_account_skips_exported_projects(stub, tmp_path):
+    from src.meistertask import Meistertask
+
+    directory = str(tmp_path / "export")
+    meistertask = Meistertask("token", cache=False)
+    exported, skipped, failed = export_account(meistertask, directory)
+    assert (exported, skipped, failed) == (3, 0, [])
+
+    with gzip.open(os.path.join(directory, "projects.ndjson.gz"), "rt") as f:
+        ids = [json.loads(line)["id"] for line in f]
+    with gzip.open(os.path.join(directory, f"{ids[0]}.ndjson.gz"), "rt") as f:
+        kinds = [json.loads(line)["kind"] for line in f]
+    assert kinds.count("task") == 30
+
+    # interrupted after the first project
+    path = os.path.join(directory, MANIFEST)
+    with open(path) as f:
+        data = json.load(f)
+    data["finished_at"] = None
+    data["projects"] = {str(ids[0]): data["projects"][str(ids[0])]}
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+    assert export_account(meistertask, directory) == (2, 1, [])
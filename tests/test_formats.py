@@ -0,0 +1,104 @@
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src import prompt, tracing
+from src.formats import RecordWriter, TracedWriter, new_writer, parse_fields
+from src.models import Task
+from src.parser import Parser
+
+TASK = {
+    "id": 1,
+    "name": "fix login",
+    "notes": "",
+    "section_id": 10,
+    "section_name": "Open",
+    "project_id": 3,
+    "status": 1,
+    "created_at": "2020-01-01T00:00:00.000Z",
+    "updated_at": "2020-01-01T00:00:00.000Z",
+}
+
+
+def written(capsys, format: str, records, fields=None, single=False) -> str:
+    with new_writer(format, "task", parse_fields(fields), single) as writer:
+        for record in records:
+            writer.write(record)
+    return capsys.readouterr().out
+
+
+def test_record_writer_is_abstract():
+    with pytest.raises(TypeError):
+        RecordWriter("task")
+
+
+def test_json_array_and_single_object(capsys):
+    assert json.loads(written(capsys, "json", [TASK, TASK])) == [TASK, TASK]
+    assert json.loads(written(capsys, "json", [])) == []
+    assert json.loads(written(capsys, "json", [Task(TASK)], single=True)) == TASK
+
+
+def test_ndjson_keeps_the_fields_asked_for(capsys):
+    lines = written(capsys, "ndjson", [TASK, Task(TASK)], fields="id,section_name").splitlines()
+    assert [json.loads(line) for line in lines] == [{"id": 1, "section_name": "Open"}] * 2
+
+
+def test_csv_header_and_rows(capsys):
+    assert written(capsys, "csv", [TASK], fields="id,name") == "id,name\n1,fix login\n"
+    assert written(capsys, "tsv", [TASK], fields="id,name") == "id\tname\n1\tfix login\n"
+
+
+def test_text_rejects_fields(capsys):
+    with pytest.raises(ValueError):
+        new_writer("text", "task", ["id"], single=False)
+    with pytest.raises(SystemExit):
+        Parser(["task", "list", "--all", "board", "--fields", "id"]).parse_args()
+    assert "--fields needs --format" in capsys.readouterr().err
+
+
+def test_traced_writer_is_a_record_writer(monkeypatch, capsys):
+    monkeypatch.setattr(tracing, "TRACER", tracing.Tracer())
+    writer = TracedWriter(new_writer("ndjson", "task", ["id"], single=False), "ndjson")
+    assert (writer.kind, writer.fields, writer.stream) == ("task", ["id"], sys.stdout)
+    with writer:
+        writer.write(TASK)
+    assert capsys.readouterr().out == '{"id": 1}\n'
+
+
+def test_closed_output_exits_quietly(stub):
+    # the reader is gone before the first record, like `| head -0`
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src", "task", "list", "--all", "board", "--format", "ndjson"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env={**os.environ, "MEISTERTASK": "token"},
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    process.stdout.close()
+    assert process.wait(timeout=30) == 1
+    assert process.stderr.read() == b""
+
+
+def test_prompts_go_to_the_prompt_stream(monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.StringIO("7\n1\n"))
+    errors = io.StringIO()
+
+    with prompt.prompting_to(errors):
+        assert prompt.choose("project", ["a", "b"]) == 1
+
+    assert capsys.readouterr().out == ""
+    assert "[1] b" in errors.getvalue()
+    assert "Project id" in errors.getvalue()
+    assert "Select valid project id" in errors.getvalue()
+
+
+def test_prompts_fail_without_anyone_to_answer():
+    with prompt.answering("fail"):
+        with pytest.raises(prompt.NoAnswer):
+            prompt.confirm("Delete?")
+    with prompt.answering("fail", assume_yes=True):
+        assert prompt.confirm("Delete?")
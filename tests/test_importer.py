@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from src.api import aio
+from src.importer import import_tasks, read_rows
+
+
+class FakeTasks:
+    def __init__(self):
+        self.created = []
+
+    def task_create(self, section_id: int, name: str, description: str = ""):
+        self.created.append((section_id, name, description))
+
+
+class FakeMeistertask:
+    """Facade creating tasks in memory, through the real fan-out"""
+
+    def __init__(self):
+        self.tasks = FakeTasks()
+
+    def section_fetch_all(self, project_id: int):
+        return [{"id": 1, "name": "Open"}, {"id": 2, "name": "Done"}]
+
+    def fan_out(self, fanout, raise_errors: bool = False):
+        return aio.run(fanout, aio.AsyncClients(None, self.tasks, None, 4))
+
+
+def test_read_csv(tmp_path):
+    path = tmp_path / "tasks.csv"
+    path.write_text("name,description\nfix login,asap\nwrite docs,\n")
+    rows = list(read_rows(str(path)))
+    assert [(n, r["name"]) for n, r in rows] == [(1, "fix login"), (2, "write docs")]
+
+
+def test_read_jsonl_reports_malformed_lines(tmp_path):
+    path = tmp_path / "tasks.jsonl"
+    path.write_text('{"name": "a"}\n{"name": \n\n[1, 2]\n{"name": "b"}\n')
+    rows = list(read_rows(str(path)))
+
+    assert [n for n, _ in rows] == [1, 2, 4, 5]
+    assert rows[0][1] == {"name": "a"}
+    assert isinstance(rows[1][1], ValueError)
+    assert isinstance(rows[2][1], ValueError)
+    assert rows[3][1] == {"name": "b"}
+
+
+def test_read_json_array(tmp_path):
+    path = tmp_path / "tasks.json"
+    path.write_text(json.dumps([{"name": "a"}, {"name": "b", "section": "done"}]))
+    assert [r["name"] for _, r in read_rows(str(path))] == ["a", "b"]
+
+
+def test_read_json_object_is_refused(tmp_path):
+    path = tmp_path / "tasks.json"
+    path.write_text('{"name": "a"}')
+    with pytest.raises(SystemExit):
+        list(read_rows(str(path)))
+
+
+def test_import_records_bad_rows_and_resumes(tmp_path):
+    path = tmp_path / "tasks.jsonl"
+    path.write_text('{"name": "a"}\nnot json\n{"name": "b", "section": "done"}\n{"section": "done"}\n')
+    meistertask = FakeMeistertask()
+
+    created, skipped, failed = import_tasks(meistertask, str(path), 42)
+    assert (created, skipped) == (2, 0)
+    assert [number for number, _ in failed] == [2, 4]
+    assert sorted(meistertask.tasks.created) == [(1, "a", ""), (2, "b", "")]
+
+    # rows already imported are skipped on the next run
+    created, skipped, failed = import_tasks(meistertask, str(path), 42)
+    assert (created, skipped, len(failed)) == (0, 2, 2)
+    assert len(meistertask.tasks.created) == 2
@@ -0,0 +1,29 @@
+"""Import-time budget of the entry point, see benchmarks/importtime.py"""
+
+import pytest
+
+# milliseconds of imports allowed before a command runs
+BUDGET_MS = 30.0
+
+
+@pytest.fixture(scope="module")
+def importtime(benchmark):
+    return benchmark("importtime")
+
+
+@pytest.fixture(scope="module")
+def baseline(importtime):
+    return importtime.importtime("pass")
+
+
+def test_import_budget(importtime, baseline, scenario):
+    name, argv = scenario
+    modules = importtime.importtime(importtime.scenario_code(argv))
+    extra = {module: t for module, t in modules.items() if module not in baseline}
+
+    forbidden = sorted(m for m in extra if m.split(".")[0] in importtime.FORBIDDEN)
+    assert not forbidden, f"{name} imports {', '.join(forbidden)}"
+
+    total_ms = sum(extra.values()) / 1000
+    slowest = sorted(extra, key=extra.get, reverse=True)[:5]
+    assert total_ms <= BUDGET_MS, f"{name}: {total_ms:.1f} ms of imports, slowest: {slowest}"
@@ -0,0 +1,131 @@
+from src.journal import Journal, attempt_entry, coalesce, create_entry, update_entry
+
+TOKEN = "token"
+
+
+def test_coalesce_merges_the_updates_of_a_task(make_task):
+    first = update_entry(make_task(), {"name": "renamed"}, "rename")
+    create = create_entry(10, 100, "new task")
+    second = update_entry(make_task(updated_at="2020-01-02"), {"section_id": 7}, "move")
+    other = update_entry(make_task(2), {"section_id": 7}, "move")
+
+    changes = coalesce([first, create, second, other])
+    assert [c["op"] for c in changes] == ["update", "create", "update"]
+    merged = changes[0]
+    assert merged["fields"] == {"name": "renamed", "section_id": 7}
+    # the base of the first change: a task changed after it is a conflict
+    assert merged["base"] == "2020-01-01"
+    assert merged["ids"] == [first["id"], second["id"]]
+    assert merged["label"] == "rename; move"
+
+
+def test_coalesce_marks_attempted_creates():
+    create = create_entry(10, 100, "new task")
+    attempt = attempt_entry(create)
+    [change] = coalesce([create, attempt])
+    assert change["attempted"]
+    assert change["ids"] == [create["id"], attempt["id"]]
+
+
+def test_torn_last_line_is_skipped(tmp_path, capsys):
+    journal = Journal(TOKEN, str(tmp_path / "journal"))
+    entry = create_entry(10, 100, "new task")
+    journal.append(entry)
+    with open(journal.path, "a") as f:
+        f.write('{"id": "cut')
+
+    assert journal.read() == [entry]
+    assert capsys.readouterr().err == ""
+
+
+def test_damaged_line_is_reported_and_kept(tmp_path, capsys):
+    journal = Journal(TOKEN, str(tmp_path / "journal"))
+    first, second = create_entry(10, 100, "first"), create_entry(10, 100, "second")
+    journal.append(first)
+    with open(journal.path, "a") as f:
+        f.write("garbage\n")
+    journal.append(second)
+
+    assert journal.read() == [first, second]
+    assert "Skipped line 2" in capsys.readouterr().err
+
+    journal.remove({first["id"]})
+    with open(journal.path) as f:
+        assert f.read().splitlines()[0] == "garbage"
+
+
+def test_replayed_create_is_not_sent_twice(stub):
+    from src.meistertask import Meistertask
+
+    board = stub.board
+    section = next(iter(board.sections.values()))
+    meistertask = Meistertask(TOKEN, cache=False)
+
+    # a flush sent the create, then stopped before removing it from the journal
+    create = create_entry(section["project_id"], section["id"], "sent once")
+    meistertask.journal.append(create, attempt_entry(create))
+    board.add_task(section["id"], "sent once", "")
+
+    meistertask.flush()
+    assert stub.counter[("POST", "/sections/{id}/tasks")] == 0
+    assert len(meistertask.journal) == 0
+
+    # a create never attempted is sent, even if the name exists
+    meistertask.journal.append(create_entry(section["project_id"], section["id"], "sent once"))
+    meistertask.flush()
+    assert stub.counter[("POST", "/sections/{id}/tasks")] == 1
+    assert len(meistertask.journal) == 0
+
+
+def command(argv, monkeypatch, answers=()):
+    from src.__main__ import run
+    from src.parser import Parser
+
+    answers = iter(answers)
+    monkeypatch.setattr("builtins.input", lambda *prompt: next(answers))
+    run(Parser(argv).parse_args(), TOKEN)
+
+
+def board_tasks(stub):
+    return [t for t in stub.board.tasks.values() if t["project_id"] == 1]
+
+
+def take_down(stub):
+    """The API is unreachable from now on"""
+    stub.shutdown()
+    stub.server_close()
+
+
+def test_move_by_id_is_queued_offline(stub, monkeypatch):
+    first, second = board_tasks(stub)[:2]
+    # projects and sections are cached, the second task was never fetched
+    command(["task", "move", str(first["id"]), "done", "board"], monkeypatch)
+    take_down(stub)
+
+    command(["task", "move", str(second["id"]), "in progress", "board"], monkeypatch)
+    [entry] = Journal(TOKEN).read()
+    section = next(s for s in stub.board.sections.values() if s["name"] == "In Progress" and s["project_id"] == 1)
+    assert (entry["task_id"], entry["project_id"]) == (second["id"], 1)
+    assert entry["fields"] == {"section_id": section["id"]}
+    assert entry["base"] is None
+
+
+def test_update_by_id_is_queued_offline(stub, monkeypatch):
+    task = board_tasks(stub)[0]
+    take_down(stub)
+
+    command(["task", "update", str(task["id"])], monkeypatch, ["renamed", ""])
+    [entry] = Journal(TOKEN).read()
+    assert (entry["task_id"], entry["fields"], entry["base"]) == (task["id"], {"name": "renamed"}, None)
+
+
+def test_names_resolve_offline_after_a_change(stub, monkeypatch):
+    first, second = board_tasks(stub)[:2]
+    listed_at = second["updated_at"]
+    # the listing of the project is cached, then the move makes it stale
+    command(["task", "move", first["name"], "done", "board"], monkeypatch)
+    take_down(stub)
+
+    command(["task", "move", second["name"], "done", "board"], monkeypatch)
+    [entry] = Journal(TOKEN).read()
+    assert (entry["task_id"], entry["base"]) == (second["id"], listed_at)
@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.mirror import Mirror
+from src.models import Section
+
+
+class FakeTasks:
+    def __init__(self, tasks, fail_after: int = None):
+        self.tasks = tasks
+        self.read = 0
+        self.fail_after = fail_after
+
+    def task_iter_all(self, project_id: int, sort: str = None):
+        for t in self.tasks:
+            if t["project_id"] == project_id:
+                if self.read == self.fail_after:
+                    raise ConnectionError("listing cut")
+                self.read += 1
+                yield t
+
+
+SECTIONS = [
+    Section({"id": 10, "name": "Open", "sequence": 0}),
+    Section({"id": 11, "name": "In Progress", "sequence": 1}),
+]
+
+
+def facade(tasks, fail_after: int = None):
+    return SimpleNamespace(
+        api_section=SimpleNamespace(section_fetch_all=lambda project_id: SECTIONS),
+        api_task=FakeTasks(tasks, fail_after),
+    )
+
+
+def listed(make_task, *ids):
+    """Tasks of a listing, task n updated on day n"""
+    return [make_task(id, updated_at=f"2020-01-0{id}") for id in ids]
+
+
+def mirrored(mirror, project_id: int = 1):
+    return sorted(t["name"] for t in mirror.tasks(project_id))
+
+
+def test_incremental_sync_stops_at_mirrored_tasks(tmp_path, make_task):
+    mirror = Mirror("token", str(tmp_path / "mirror.db"))
+    assert mirror.sync_project(facade(listed(make_task, 2, 1)), 1) == 2
+
+    meistertask = facade(listed(make_task, 3, 2, 1))
+    mirror.sync_project(meistertask, 1)
+    assert mirrored(mirror) == ["task 1", "task 2", "task 3"]
+    # task 1 is older than the newest mirrored task: the listing stops there
+    assert meistertask.api_task.read == 3
+
+
+def test_unsorted_listing_is_read_to_the_end(tmp_path, make_task):
+    mirror = Mirror("token", str(tmp_path / "mirror.db"))
+    mirror.sync_project(facade(listed(make_task, 2, 1)), 1)
+
+    # task 5 comes after an older task: the sort was not applied
+    unsorted = listed(make_task, 4, 5, 1, 3)
+    mirror.sync_project(facade(unsorted), 1)
+    assert mirrored(mirror) == ["task 1", "task 2", "task 3", "task 4", "task 5"]
+
+
+def test_moved_task_follows_its_project(tmp_path, make_task):
+    mirror = Mirror("token", str(tmp_path / "mirror.db"))
+    mirror.sync_project(facade(listed(make_task, 1)), 1)
+    mirror.sync_project(facade([make_task(1, updated_at="2020-01-02", project_id=2)]), 2)
+
+    assert mirrored(mirror, 1) == []
+    assert mirrored(mirror, 2) == ["task 1"]
+
+
+def test_full_sync_drops_deleted_tasks(tmp_path, make_task):
+    mirror = Mirror("token", str(tmp_path / "mirror.db"))
+    mirror.sync_project(facade(listed(make_task, 2, 1)), 1)
+
+    mirror.sync_project(facade(listed(make_task, 2)), 1)
+    assert mirrored(mirror) == ["task 1", "task 2"]
+
+    mirror.sync_project(facade(listed(make_task, 2)), 1, full=True)
+    assert mirrored(mirror) == ["task 2"]
+    assert [t["name"] for _, t, _ in mirror.index.search("task")] == ["task 2"]
+
+
+def test_failed_full_sync_keeps_the_mirror(tmp_path, make_task):
+    mirror = Mirror("token", str(tmp_path / "mirror.db"))
+    mirror.sync_project(facade(listed(make_task, 2, 1)), 1)
+
+    with pytest.raises(ConnectionError):
+        listing = listed(make_task, 3, 2)
+        mirror.sync_project(facade(listing, fail_after=1), 1, full=True)
+    # task 1 was not listed yet: it is not deleted
+    assert mirrored(mirror) == ["task 1", "task 2"]
+    assert len(mirror.index.search("task")) == 2
+
+
+def test_local_tasks_of_a_section(tmp_path, make_task):
+    mirror = Mirror("token", str(tmp_path / "mirror.db"))
+    doing = make_task(2, updated_at="2020-01-02", section_id=11, section_name="In Progress")
+    mirror.sync_project(facade([doing, make_task(1, updated_at="2020-01-01")]), 1)
+
+    assert [t["id"] for t in mirror.tasks(1, "inprogess")] == [2]
+    assert [t["id"] for t in mirror.tasks(1, "open")] == [1]
+    assert sorted(t["id"] for t in mirror.tasks(1, "all")) == [1, 2]
+    assert list(mirror.tasks(1, "done")) == []
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from src.__main__ import run
+from src.models import Task
+from src.parser import Parser
+from src.utils import age_of, check_errors
+
+
+def api_task(**fields):
+    task = {"id": 1, "name": "fix login", "section_name": "Open", "token": "abc", "due": None}
+    task.update(fields)
+    return task
+
+
+def test_unknown_fields_are_dropped():
+    task = Task(api_task())
+    assert "token" not in task and task.get("token") is None
+    assert list(task.to_dict()) == list(Task.FIELDS)
+    with pytest.raises(KeyError):
+        task["token"]
+    with pytest.raises(KeyError):
+        task["token"] = "abc"
+
+
+def test_json_output_has_every_field(stub, capsys):
+    task = next(iter(stub.board.tasks.values()))
+    stub.board.update(task, {"token": "abc"})
+
+    argv = ["--no-cache", "task", "list", "--all", "board", "--format"]
+    run(Parser(argv + ["json"]).parse_args(), "token")
+    [listed] = [t for t in json.loads(capsys.readouterr().out) if t["id"] == task["id"]]
+    assert listed["token"] == "abc"
+    # the other formats output the fields of the model
+    run(Parser(argv + ["ndjson"]).parse_args(), "token")
+    assert all("token" not in json.loads(line) for line in capsys.readouterr().out.splitlines())
+
+
+def test_errors_of_a_response_are_seen(capsys):
+    response = Task.from_response({"errors": [{"message": "name is missing"}]})
+    with pytest.raises(SystemExit):
+        check_errors("failed to add task", response)
+    assert "name is missing" in capsys.readouterr().out
+
+
+def test_equal_by_value_not_hashable():
+    assert Task(api_task()) == Task(api_task())
+    assert Task(api_task()) != Task(api_task(name="fix logout"))
+    with pytest.raises(TypeError):
+        hash(Task(api_task()))
+
+
+def test_null_timestamp():
+    task = Task(api_task(updated_at=None))
+    assert task.updated is None
+    assert age_of(task.updated) == 0.0
@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.__main__ import run
+from src.parser import Parser
+
+TOKEN = "token"
+
+
+def tasks_of(stub, project_name: str):
+    board = stub.board
+    project_id = next(p["id"] for p in board.projects.values() if p["name"] == project_name)
+    return [t for t in board.tasks.values() if t["project_id"] == project_id]
+
+
+def section_of(stub, task_id: int) -> str:
+    return stub.board.sections[stub.board.tasks[task_id]["section_id"]]["name"]
+
+
+def move(argv):
+    run(Parser(["--no-cache", "task", "move"] + argv).parse_args(), TOKEN)
+
+
+def test_move_by_id_does_not_list_the_project(stub):
+    first, second = [t["id"] for t in tasks_of(stub, "board")[:2]]
+    move([str(first), f"#{second}", "done", "board"])
+
+    assert section_of(stub, first) == section_of(stub, second) == "Done"
+    assert stub.counter[("GET", "/projects/{id}/tasks")] == 0
+    assert stub.counter[("GET", "/tasks/{id}")] == 2
+
+
+def test_move_project_slash_name(stub):
+    task = tasks_of(stub, "board")[0]
+    move([f"board/{task['name']}", "done", "board"])
+    assert section_of(stub, task["id"]) == "Done"
+
+
+def test_move_task_of_another_project(stub):
+    task = tasks_of(stub, "project 001")[0]
+    with pytest.raises(SystemExit):
+        move([str(task["id"]), "done", "board"])
+    assert stub.counter[("PUT", "/tasks/{id}")] == 0
+
+
+def test_move_from_section(stub):
+    tasks = tasks_of(stub, "board")
+    sections = {t["id"]: section_of(stub, t["id"]) for t in tasks}
+    move(["done", "board", "--from-section", "open"])
+
+    for task in tasks:
+        expected = "Done" if sections[task["id"]] == "Open" else sections[task["id"]]
+        assert section_of(stub, task["id"]) == expected
+
+
+def test_move_older_than(stub):
+    open_tasks = [t for t in tasks_of(stub, "board") if section_of(stub, t["id"]) == "Open"]
+    # the stub dates its tasks in 2020: one of them was just updated
+    recent = open_tasks[0]
+    recent["updated_at"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    move(["done", "board", "--from-section", "open", "--older-than", "14d"])
+
+    assert section_of(stub, recent["id"]) == "Open"
+    assert all(section_of(stub, t["id"]) == "Done" for t in open_tasks[1:])
+
+
+def test_dry_run_moves_nothing(stub, capsys):
+    # tasks already in the target section are left out
+    to_move = [t for t in tasks_of(stub, "board") if section_of(stub, t["id"]) != "Done"]
+    move(["done", "board", "--older-than", "1d", "--dry-run"])
+
+    out = capsys.readouterr().out
+    assert f"{len(to_move)} tasks would be moved to Done" in out
+    assert f"({to_move[0]['id']}) {to_move[0]['name']}: {to_move[0]['section_name']} -> Done" in out
+    assert stub.counter[("PUT", "/tasks/{id}")] == 0
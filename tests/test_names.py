@@ -0,0 +1,90 @@
+from src.names import NameIndex, reference_id, simplify
+
+NAMES = [
+    "Fix login page redirect",
+    "fix login",
+    "Redesign the landing page",
+    "Café menu",
+    "update docs: API -- v2",
+    "write   release notes",
+]
+
+
+def index():
+    return NameIndex({"id": n, "name": name} for n, name in enumerate(NAMES))
+
+
+def names(items):
+    return [item["name"] for item in items]
+
+
+def test_names_are_simplified():
+    assert index().names == [simplify(name) for name in NAMES]
+    assert index().names[4] == "update docs api v2"
+    assert index().names[5] == "write release notes"
+
+
+def test_exact_match_scores_one():
+    assert index().rank("FIX  login") == [(1.0, {"id": 1, "name": "fix login"})]
+
+
+def test_scores_stay_within_one():
+    for query in ("café", "caf", "fix", "redes landing", "release"):
+        ranked = index().rank(query)
+        assert ranked, query
+        assert all(0 < score <= 1.0 for score, _ in ranked), query
+
+
+def test_words_in_any_order_prefixes_and_typos():
+    assert names(index().search("redirect login"))[0] == "Fix login page redirect"
+    assert names(index().search("redes"))[0] == "Redesign the landing page"
+    assert names(index().search("relase notes"))[0] == "write   release notes"
+
+
+def test_resolve_picks_a_clear_leader_only():
+    assert names(index().resolve("landing redesign")) == ["Redesign the landing page"]
+    # both names hold "fix login", the exact match is the only one kept
+    assert names(index().resolve("fix login")) == ["fix login"]
+    assert len(index().resolve("page")) == 2
+    assert index().resolve("nothing like it") == []
+
+
+def test_reference_id():
+    assert reference_id("1234") == reference_id(" #1234 ") == 1234
+    assert reference_id("fix 1234") is None
+
+
+def ranked(names, query):
+    index = NameIndex({"id": n, "name": name} for n, name in enumerate(names))
+    return [(score, item["name"]) for score, item in index.rank(query)]
+
+
+def test_ties_go_to_the_shorter_name_then_to_the_first_one():
+    # "login" starts each name: with the prefix bonus, all three reach 1
+    assert ranked(["login page x", "login form x", "login page"], "login") == [
+        (1.0, "login page"),
+        (1.0, "login page x"),
+        (1.0, "login form x"),
+    ]
+    assert [name for _, name in ranked(["cafe menu", "café menu"], "caf")] == ["cafe menu", "café menu"]
+    assert [name for _, name in ranked(["café menu", "cafe menu"], "caf")] == ["café menu", "cafe menu"]
+
+
+def test_one_edit_away_is_a_typo():
+    names = ["deploy the server", "fix the deploy", "deploy docs"]
+    # swapped, replaced, added and removed characters
+    for query in ("dpeloy", "depxoy", "deployy", "deply"):
+        assert len(ranked(names, query)) == 3, query
+    assert ranked(names, "sevrer deploy")[0][1] == "deploy the server"
+    # two edits away is another word
+    assert ranked(names, "dxplxy") == []
+    # words shorter than 3 characters have no typos
+    assert ranked(names, "tx") == []
+    assert len(ranked(names, "xhe")) == 2
+
+
+def test_typos_score_less_than_words():
+    names = ["deploy docs"]
+    [(word, _)] = ranked(names, "deploy")
+    [(typo, _)] = ranked(names, "dpeloy")
+    assert typo < word <= 1.0
@@ -0,0 +1,82 @@
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from src.api.retry import RateLimiter, RetryPolicy, parse_retry_after, url_template
+
+
+def response(status: int, retry_after: str = None) -> requests.Response:
+    r = requests.Response()
+    r.status_code = status
+    if retry_after is not None:
+        r.headers["Retry-After"] = retry_after
+    return r
+
+
+def refused() -> requests.exceptions.ConnectionError:
+    """Error of requests when no connection could be opened"""
+    from urllib3.exceptions import MaxRetryError
+
+    reason = NewConnectionError(None, "Connection refused")
+    return requests.exceptions.ConnectionError(MaxRetryError(None, "/", reason))
+
+
+def test_url_template():
+    assert url_template("https://host/api/tasks/12?a=b") == "/api/tasks/{id}"
+    assert url_template("https://host/api/projects/3/tasks") == "/api/projects/{id}/tasks"
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+
+def test_retry_statuses():
+    policy = RetryPolicy(retries=3)
+    assert policy.retry_response("GET", response(500), 0)
+    assert policy.retry_response("PUT", response(429), 2)
+    assert not policy.retry_response("GET", response(429), 3)
+    assert not policy.retry_response("GET", response(404), 0)
+
+
+def test_post_retried_only_when_not_processed():
+    policy = RetryPolicy()
+    assert policy.retry_response("POST", response(429), 0)
+    assert policy.retry_response("POST", response(503), 0)
+    assert not policy.retry_response("POST", response(500), 0)
+
+
+def test_post_retried_when_never_sent():
+    policy = RetryPolicy(connect_retries=2)
+    assert policy.retry_error("POST", refused(), 0)
+    assert policy.retry_error("POST", requests.exceptions.ConnectTimeout(), 1)
+    assert not policy.retry_error("POST", refused(), 2)
+    # a reset connection may have delivered the request
+    assert not policy.retry_error("POST", requests.exceptions.ConnectionError("reset"), 0)
+    assert policy.retry_error("GET", requests.exceptions.ConnectionError("reset"), 0)
+
+
+def test_retry_after_is_honoured_and_capped():
+    policy = RetryPolicy(max_backoff=30.0)
+    assert policy.delay(0, response(429, "3")) == 3.0
+    assert policy.delay(0, response(429, "86400")) == 30.0
+
+
+def test_backoff_is_bounded():
+    policy = RetryPolicy(backoff=0.5, max_backoff=4.0)
+    for attempt in range(10):
+        assert 0 <= policy.delay(attempt) <= min(4.0, 0.5 * 2 ** attempt)
+
+
+def test_rate_limiter_halves_then_grows_back_to_its_ceiling():
+    limiter = RateLimiter(rate=20.0, min_rate=1.0)
+    limiter.throttled()
+    assert limiter.rate == 10.0
+    # throttled again within a second: the same slow down
+    limiter.throttled()
+    assert limiter.rate == 10.0
+
+    for _ in range(100):
+        limiter.succeeded()
+    assert limiter.rate == 20.0
@@ -0,0 +1,81 @@
+import sqlite3
+import threading
+
+import pytest
+
+from src.search import SearchIndex, parse_query
+
+TASKS_TABLE = "CREATE TABLE tasks (id INTEGER PRIMARY KEY, project_id INTEGER, data TEXT)"
+
+
+@pytest.fixture
+def index():
+    connection = sqlite3.connect(":memory:")
+    # search results are read from the tasks of the mirror
+    connection.executescript(
+        TASKS_TABLE + "; CREATE TABLE projects (id INTEGER PRIMARY KEY, name TEXT);"
+        " INSERT INTO projects VALUES (1, 'board');"
+    )
+    return SearchIndex(connection, threading.Lock())
+
+
+def add(index, *tasks):
+    import json
+
+    with index.connection:
+        index.connection.executemany(
+            "INSERT OR REPLACE INTO tasks VALUES (?, 1, ?)",
+            [(t.id, json.dumps(t.to_dict())) for t in tasks],
+        )
+    index.update(list(tasks))
+
+
+def names(results):
+    return [t["name"] for _, t, _ in results]
+
+
+def test_parse_query():
+    assert parse_query('login "reset password" api*') == [
+        ("term", ["login"]),
+        ("phrase", ["reset", "password"]),
+        ("prefix", ["api"]),
+    ]
+
+
+def test_every_clause_must_match(index, make_task):
+    add(index, make_task(1, "fix login page"), make_task(2, "login api"))
+    add(index, make_task(3, "write docs"))
+    assert sorted(names(index.search("login"))) == ["fix login page", "login api"]
+    assert names(index.search("login api")) == ["login api"]
+    assert names(index.search("nothing")) == []
+
+
+def test_prefix_and_phrase(index, make_task):
+    add(index, make_task(1, "reset the password"))
+    add(index, make_task(2, "password reset", notes="reset password flow"))
+    assert names(index.search('"reset password"')) == ["password reset"]
+    assert sorted(names(index.search("pass*"))) == ["password reset", "reset the password"]
+
+
+def test_name_weighs_more_than_notes(index, make_task):
+    add(index, make_task(1, "deploy", notes="mention of login"), make_task(2, "login", notes="deploy"))
+    assert names(index.search("login")) == ["login", "deploy"]
+
+
+def test_update_replaces_postings(index, make_task):
+    add(index, make_task(1, "old name"))
+    add(index, make_task(1, "new name", updated_at="2020-01-02"))
+    assert names(index.search("old")) == []
+    assert names(index.search("new")) == ["new name"]
+
+
+def test_same_task_twice_in_a_batch(tmp_path, make_task):
+    from src.mirror import Mirror
+
+    mirror = Mirror("token", str(tmp_path / "mirror.db"))
+    older, newer = make_task(1, "draft"), make_task(1, "final", updated_at="2020-01-02")
+    mirror.upsert_tasks([newer, older])
+
+    assert names(mirror.index.search("final")) == ["final"]
+    assert mirror.index.search("draft") == []
+    assert [t["name"] for t in mirror.tasks(1)] == ["final"]
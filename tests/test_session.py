@@ -0,0 +1,40 @@
+from src.__main__ import traced
+from src.api.base import Session
+from src.parser import Parser
+
+
+def test_requests_reuse_one_connection(stub):
+    session = Session()
+    for _ in range(2):
+        assert session.get(f"{stub.url}/projects").status_code == 200
+    assert (session.requests_sent, session.connections_opened, session.connections_reused) == (2, 1, 1)
+
+
+def test_stats_report_connections(stub, tracer, capsys):
+    traced(Parser(["--stats", "--no-cache", "task", "list", "--all", "board"]).parse_args(), "token")
+    # projects, then the tasks of the project, over the same connection
+    assert "connections: 1 opened, reused by 1 of 2 requests" in capsys.readouterr().err
+
+
+def test_retries_are_reported(benchmark):
+    from src.api.retry import RateLimiter, RetryPolicy
+
+    stub = benchmark("stub")
+    # half of the requests fail, half of those with a 429
+    server = stub.Stub(stub.Board(tasks=5, projects=1), error_rate=0.5, seed=1).start()
+    try:
+        session = Session(
+            retry=RetryPolicy(retries=20, backoff=0.001, max_backoff=0.01), limiter=RateLimiter(1000, burst=1000)
+        )
+        for _ in range(20):
+            assert session.get(f"{server.url}/projects").status_code == 200
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    stats = session.stats.summary()["GET /api/projects"]
+    assert stats["calls"] == 20 and stats["failures"] == 0
+    assert stats["retries"] == server.requests - 20
+    assert 0 < stats["throttled"] < stats["retries"]
+    [connections, retried] = session.report()
+    assert retried.startswith(f"retried GET /api/projects: {stats['retries']} retries of 20 requests")
@@ -0,0 +1,102 @@
+import json
+import threading
+
+import pytest
+
+from src.api.stream import iter_batches, prefetched
+
+# strings with escapes and multibyte characters, numbers and literals:
+# every chunk size cuts some of them
+DOCUMENT = json.dumps(
+    [
+        {"id": 1, "name": 'say "hi"\\n\t', "notes": "caf\u00e9 \u2603 \U0001d11e"},
+        "\u00e9\u00e9",
+        -3.5e3,
+        12345,
+        0,
+        True,
+        False,
+        None,
+        [],
+        {"nested": [1, {"deeper": "\\u0041"}]},
+    ],
+    ensure_ascii=False,
+)
+
+
+def chunked(data: bytes, size: int):
+    return [data[start : start + size] for start in range(0, len(data), size)]
+
+
+def decoded(text: str, size: int):
+    batches = list(iter_batches(chunked(text.encode("utf-8"), size)))
+    return [item for batch in batches for item in batch]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 16, 1024])
+def test_items_cut_by_chunks(size):
+    assert decoded(DOCUMENT, size) == json.loads(DOCUMENT)
+
+
+def test_numbers_and_literals_at_the_end_of_a_chunk():
+    # "-3.5" is a number, but the chunk after it holds the rest
+    assert decoded('[-3.5e3 , 10, true,null]', 4) == [-3500.0, 10, True, None]
+    assert list(iter_batches([b"[12", b"34]"])) == [[], [1234]]
+
+
+def test_empty_array():
+    assert list(iter_batches([b"[]"])) == [[]]
+    assert decoded(" [ \n ] ", 1) == []
+
+
+@pytest.mark.parametrize("text", ['{"id": 1}', "", "[1, 2", '[{"id": 1}', "[tru", '["abc'])
+def test_malformed_json(text):
+    with pytest.raises(ValueError):
+        decoded(text, 2)
+
+
+def test_errors_of_the_producer_reach_the_consumer():
+    def items():
+        yield 1
+        raise ConnectionError("connection reset")
+
+    consumed = []
+    with pytest.raises(ConnectionError):
+        for item in prefetched(items(), 2):
+            consumed.append(item)
+    assert consumed == [1]
+
+
+def test_closing_stops_the_producer():
+    closed = threading.Event()
+
+    def items():
+        try:
+            for n in range(1000):
+                yield n
+        finally:
+            closed.set()
+
+    reader = prefetched(items(), 2)
+    assert next(reader) == 0
+    reader.close()
+    assert closed.wait(timeout=5)
+
+
+def test_early_close_leaves_the_cache_untouched(stub, tmp_path):
+    from src.api.base import PAGE_SIZE
+    from src.api.cache import Cache
+    from src.api.task import APITask
+
+    api = APITask("token", cache=Cache("token", directory=str(tmp_path / "api")))
+    project_id = next(p["id"] for p in stub.board.projects.values() if p["name"] == "board")
+    key = api.cache.key(f"{api.base_url}/projects/{project_id}/tasks", {"page": 1, "items": PAGE_SIZE})
+
+    listing = api.task_iter_all(project_id)
+    next(listing)
+    listing.close()
+    assert api.cache.get("tasks", key) is None
+
+    # read to the end, the page is cached
+    assert len(list(api.task_iter_all(project_id))) == 30
+    assert len(api.cache.get("tasks", key).decode()) == 30
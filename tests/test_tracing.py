@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from src import tracing
+from src.__main__ import traced
+from src.parser import Parser
+
+EVENT_KEYS = {"name", "cat", "ph", "ts", "dur", "pid", "tid", "args"}
+
+
+def test_trace_file_shape(stub, tracer, tmp_path, capsys):
+    path = tmp_path / "trace.json"
+    traced(Parser(["--trace", str(path), "--no-cache", "task", "list", "--all", "board"]).parse_args(), "token")
+    assert f"Trace written to {path}" in capsys.readouterr().err
+
+    trace = json.loads(path.read_text())
+    assert set(trace) == {"traceEvents", "displayTimeUnit"}
+    assert trace["displayTimeUnit"] == "ms"
+    events = trace["traceEvents"]
+    assert all(set(event) == EVENT_KEYS and event["ph"] == "X" for event in events)
+    assert {"command", "http", "decode", "render"} <= {event["cat"] for event in events}
+
+    # microseconds since the tracer started, the command holds every other event
+    [command] = [event for event in events if event["cat"] == "command"]
+    assert command["name"] == "task list"
+    for event in events:
+        assert event["ts"] >= command["ts"] and event["dur"] >= 0
+        assert event["ts"] + event["dur"] <= command["ts"] + command["dur"] + 1
+    http = [event for event in events if event["cat"] == "http"]
+    assert [event["name"] for event in http] == ["GET /api/projects", "GET /api/projects/{id}/tasks"]
+    assert all(event["args"]["status"] == 200 for event in http)
+
+
+def test_failed_span_is_recorded(tracer):
+    enabled = tracing.enable()
+    with pytest.raises(KeyError):
+        with tracing.span("read", "cache", key="k"):
+            raise KeyError("k")
+
+    [event] = enabled.events
+    assert event["args"] == {"key": "k", "error": "KeyError"}
+    assert enabled.totals[("cache", "read")]["errors"] == 1
+
+
+def test_spans_cost_nothing_when_off(tracer):
+    assert tracing.span("read", "cache") is tracing.NULL_SPAN
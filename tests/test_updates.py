@@ -0,0 +1,41 @@
+from src.__main__ import run
+from src.parser import Parser
+
+TOKEN = "token"
+
+
+def command(argv, monkeypatch, answers=()):
+    answers = iter(answers)
+    monkeypatch.setattr("builtins.input", lambda *prompt: next(answers))
+    run(Parser(argv).parse_args(), TOKEN)
+
+
+def test_project_update_keeps_fields_changed_meanwhile(stub, monkeypatch):
+    board = stub.board
+    [project] = [p for p in board.projects.values() if p["name"] == "board"]
+    board.update(project, {"notes": "version A"})
+    # cached by the view, then changed by a colleague
+    command(["project", "view", "board"], monkeypatch)
+    board.update(project, {"notes": "version B"})
+
+    # a new name, Enter to keep the description
+    command(["project", "update", "board"], monkeypatch, ["board 2", ""])
+    assert (project["name"], project["notes"]) == ("board 2", "version B")
+
+
+def test_task_update_keeps_fields_changed_meanwhile(stub, monkeypatch):
+    from src.meistertask import Meistertask
+
+    task = next(iter(stub.board.tasks.values()))
+    # cached, then renamed by a colleague
+    Meistertask(TOKEN).task_resolve(str(task["id"]))
+    stub.board.update(task, {"name": "renamed meanwhile"})
+
+    command(["task", "update", str(task["id"])], monkeypatch, ["", "new notes"])
+    assert (task["name"], task["notes"]) == ("renamed meanwhile", "new notes")
+
+
+def test_nothing_to_update(stub, monkeypatch, capsys):
+    command(["project", "update", "board"], monkeypatch, ["", ""])
+    assert "Nothing to update" in capsys.readouterr().out
+    assert stub.counter[("PUT", "/projects/{id}")] == 0
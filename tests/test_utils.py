@@ -0,0 +1,41 @@
+from src.utils import BlockWriter
+
+
+class Stream:
+    """Records each write, a terminal or a pipe"""
+
+    def __init__(self, tty: bool):
+        self.tty = tty
+        self.writes = []
+
+    def isatty(self) -> bool:
+        return self.tty
+
+    def write(self, text: str):
+        self.writes.append(text)
+
+
+def test_terminal_gets_each_block_at_once():
+    stream = Stream(tty=True)
+    with BlockWriter(stream, chunk=3) as writer:
+        writer.write("a")
+        assert stream.writes == ["a"]
+        writer.write("b")
+    assert stream.writes == ["a", "b"]
+
+
+def test_pipe_gets_blocks_a_chunk_at_a_time():
+    stream = Stream(tty=False)
+    with BlockWriter(stream, chunk=3) as writer:
+        for block in "abcdefg":
+            writer.write(block)
+        assert stream.writes == ["abc", "def"]
+    # the rest when the writer closes
+    assert stream.writes == ["abc", "def", "g"]
+
+
+def test_nothing_written_for_no_block():
+    stream = Stream(tty=False)
+    with BlockWriter(stream):
+        pass
+    assert stream.writes == []